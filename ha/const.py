@@ -254,6 +254,11 @@ class ACTION_STATUS(Enum):
     PENDING = "pending"
     COMPLETE = "complete"
 
+# Backend of the ha kv store, consul_config>backend in ha.conf.
+class KV_STORE_BACKENDS(Enum):
+    CONSUL = "consul"
+    MEMORY = "memory"
+
 class INSTALLATION_TYPE(Enum):
     HW = "hw"
     VM = "vm"
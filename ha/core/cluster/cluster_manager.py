@@ -34,6 +34,7 @@ from ha.core.config.config_manager import ConfigManager
 from ha.core.controllers.element_controller_factory import ElementControllerFactory
 from ha.core.system_health.const import CLUSTER_ELEMENTS
 from ha.core.controllers.system_health_controller import SystemHealthController
+from ha.core.system_health.model.health_status import StatusStream
 from ha.core.error import ClusterManagerError
 from ha.const import _DELIM
 from ha.core.error import HAInvalidPermission
@@ -361,3 +362,63 @@ class CortxClusterManager:
         except Exception as e:
             Log.error(f"Failed returning system health . Error: {e}")
             raise ClusterManagerError("Failed returning system health, internal error")
+
+    def query_system_health(self, status: str = None, element: str = None, updated_since: int = None) -> json:
+        """
+        Return the elements matching all the given filters, e.g. the failed nodes,
+        without reading the whole health tree.
+        Args:
+            status ([str]): Current health status, e.g. failed.
+            element ([str]): Element, e.g. node.
+            updated_since ([int]): Status updated at or after this timestamp.
+        Returns:
+            ([dict]): Returns dictionary. {"status": "Succeeded"/"Failed", "output": [], "error": ""}
+                output: [{"resource", "id", "status", "last_updated_time"}]
+        """
+        try:
+            system_health_controller = SystemHealthController(self._confstore)
+            return system_health_controller.query_status(status=status, component=element, updated_since=updated_since)
+        except Exception as e:
+            Log.error(f"Failed querying system health. Error: {e}")
+            raise ClusterManagerError("Failed querying system health, internal error")
+
+    def get_system_health_changes(self, since: int = 0, timeout: float = None) -> json:
+        """
+        Return the elements whose health status changed after the index since,
+        waiting (long-poll) till a status changes or timeout seconds are over.
+        Pass the returned index as since of the next call to get the next changes.
+        Args:
+            since ([int]): Index returned by the previous call, 0 for all the elements.
+            timeout ([float]): Seconds to wait for a change, no wait if None or 0.
+        Returns:
+            ([dict]): Returns dictionary. {"status": "Succeeded"/"Failed", "output": {"index", "changes"}, "error": ""}
+                changes: [{"resource", "id", "status", "last_updated_time"}], empty if timeout is over.
+        """
+        try:
+            system_health_controller = SystemHealthController(self._confstore)
+            return system_health_controller.get_changes(since=since, timeout=timeout)
+        except Exception as e:
+            Log.error(f"Failed returning system health changes. Error: {e}")
+            raise ClusterManagerError("Failed returning system health changes, internal error")
+
+    def get_system_health_stream(self, element: CLUSTER_ELEMENTS = CLUSTER_ELEMENTS.CLUSTER.value, depth: int = 1, **kwargs) -> StatusStream:
+        """
+        Streaming variant of get_system_health for large outputs, e.g. depth 0 on a
+        large cluster. Output json is rendered while it is read, "status" follows
+        "output" as it is known only at the end.
+        Args are same as get_system_health.
+        Returns:
+            ([StatusStream]): Read only text file over the output json, iterating it
+                yields the json chunks. ClusterManagerError is raised while reading
+                if the health status can not be read.
+        """
+        system_health_controller = SystemHealthController(self._confstore)
+        chunks = system_health_controller.iter_status(component = element, depth = depth, version = self._version, **kwargs)
+
+        def _chunks():
+            try:
+                yield from chunks
+            except Exception as e:
+                Log.error(f"Failed streaming system health. Error: {e}")
+                raise ClusterManagerError("Failed returning system health, internal error")
+        return StatusStream(_chunks())
@@ -26,7 +26,9 @@ from cortx.utils.log import Log
 from cortx.utils.conf_store.conf_store import Conf
 
 from ha import const
-from ha.util.consul_kv_store import ConsulKvStore
+from ha.util.consul_kv_store import ConsulKvStore, CONSISTENCY_MODES
+from ha.util.consul_kv_cache import CachedConsulKvStore
+from ha.util.memory_kv_store import MemoryKvStore
 from ha.const import _DELIM
 from ha.core.error import HAInvalidNode
 
@@ -69,12 +71,52 @@ class ConfigManager:
         Used by config manager methods to check and initalize confstore if needed.
         """
         if ConfigManager._cluster_confstore is None:
-            consul_endpoint = Conf.get(const.HA_GLOBAL_INDEX, f'consul_config{_DELIM}endpoint')
-            consul_host = consul_endpoint.split(":")[1].strip("//")
-            consul_port = consul_endpoint.split(":")[-1]
-            ConfigManager._cluster_confstore = ConsulKvStore(prefix=const.CLUSTER_CONFSTORE_PREFIX, host=consul_host, port=consul_port)
+            consistency = Conf.get(const.HA_GLOBAL_INDEX, f'consul_config{_DELIM}consistency', CONSISTENCY_MODES.DEFAULT.value)
+            # In-process store for tests and benchmarks, selected by consul_config>backend: memory.
+            backend = Conf.get(const.HA_GLOBAL_INDEX, f'consul_config{_DELIM}backend', const.KV_STORE_BACKENDS.CONSUL.value)
+            if backend == const.KV_STORE_BACKENDS.MEMORY.value:
+                latency = float(Conf.get(const.HA_GLOBAL_INDEX, f'consul_config{_DELIM}latency', 0))
+                ConfigManager._cluster_confstore = MemoryKvStore(prefix=const.CLUSTER_CONFSTORE_PREFIX,
+                                                                 latency=latency, consistency=consistency)
+            else:
+                ConfigManager._cluster_confstore = ConfigManager._get_consul_store(consistency)
+            # Store call metrics are logged periodically if consul_config>metrics_dump_interval is set.
+            dump_interval = Conf.get(const.HA_GLOBAL_INDEX, f'consul_config{_DELIM}metrics_dump_interval')
+            if dump_interval:
+                ConfigManager._cluster_confstore.metrics.start_dump(int(dump_interval), Log.info)
         return ConfigManager._cluster_confstore
 
+    @staticmethod
+    def _get_consul_store(consistency: str) -> ConsulKvStore:
+        """
+        Create consul store as per consul_config.
+        """
+        consul_endpoint = Conf.get(const.HA_GLOBAL_INDEX, f'consul_config{_DELIM}endpoint')
+        consul_host = consul_endpoint.split(":")[1].strip("//")
+        consul_port = consul_endpoint.split(":")[-1]
+        pool_size = int(Conf.get(const.HA_GLOBAL_INDEX, f'consul_config{_DELIM}pool_size', 10))
+        timeout = Conf.get(const.HA_GLOBAL_INDEX, f'consul_config{_DELIM}timeout')
+        timeout = float(timeout) if timeout is not None else None
+        # Cache is opt-in, enabled by listing the prefixes to be cached in consul_config>cache>prefixes.
+        # Reads of cached prefixes can be stale, list only prefixes not updated by read-modify-write
+        # (subscriptions and monitor rules under events and action are).
+        # Health is cached only if listed, preferably narrow subtrees (e.g. cortx/ha/system/cluster/node_map),
+        # as every health write under a watched prefix makes each daemon read the prefix again.
+        cache_prefixes = Conf.get(const.HA_GLOBAL_INDEX, f'consul_config{_DELIM}cache{_DELIM}prefixes')
+        if cache_prefixes:
+            max_staleness = Conf.get(const.HA_GLOBAL_INDEX, f'consul_config{_DELIM}cache{_DELIM}max_staleness', 30)
+            # Cache is snapshotted for warm restart if consul_config>cache>snapshot_path is set.
+            snapshot_path = Conf.get(const.HA_GLOBAL_INDEX, f'consul_config{_DELIM}cache{_DELIM}snapshot_path')
+            snapshot_interval = Conf.get(const.HA_GLOBAL_INDEX, f'consul_config{_DELIM}cache{_DELIM}snapshot_interval', 60)
+            return CachedConsulKvStore(prefix=const.CLUSTER_CONFSTORE_PREFIX, host=consul_host,
+                                       port=consul_port, pool_size=pool_size, timeout=timeout,
+                                       consistency=consistency, watch_prefixes=cache_prefixes,
+                                       max_staleness=int(max_staleness), snapshot_path=snapshot_path,
+                                       snapshot_interval=int(snapshot_interval))
+        return ConsulKvStore(prefix=const.CLUSTER_CONFSTORE_PREFIX, host=consul_host,
+                             port=consul_port, pool_size=pool_size, timeout=timeout,
+                             consistency=consistency)
+
     @staticmethod
     def load_controller_schema():
         """
@@ -157,6 +199,6 @@ class ConfigManager:
             node_id (str): Node ID from cluster nodes.
         """
         confstore = ConfigManager.get_confstore()
-        key_val = confstore.get(f"{const.PVTFQDN_TO_NODEID_KEY}/{node_name}")
+        key_val = confstore.get(f"{const.PVTFQDN_TO_NODEID_KEY}/{node_name}", recurse=False)
         _, node_id = key_val.popitem()
         return node_id
@@ -18,7 +18,8 @@
 import json
 
 from ha.core.system_health.system_health import SystemHealth
-from ha.core.system_health.const import CLUSTER_ELEMENTS
+from ha.core.system_health.const import CLUSTER_ELEMENTS, HEALTH_STATUSES, HEALTH_CHANGES_MAX_TIMEOUT
+from ha.core.system_health.system_health_metadata import SystemHealthComponents
 from ha import const
 from ha.core.cluster.const import SYSTEM_HEALTH_OUTPUT_V2, GET_SYS_HEALTH_ARGS
 
@@ -47,6 +48,67 @@ class SystemHealthController(SystemHealth):
                 output: Dictionary with element health status
                 error: Error information if the request "Failed"
         """
+        error = self._validate_request(component, version, **kwargs)
+        if error is not None:
+            return error
+        return super().get_status(component, depth, version, **kwargs)
+
+    def iter_status(self, component: CLUSTER_ELEMENTS = CLUSTER_ELEMENTS.CLUSTER.value, depth: int = 1, version: str = SYSTEM_HEALTH_OUTPUT_V2, **kwargs):
+        """
+        Streaming variant of get_status, yields the output json in chunks.
+        Arguments are same as get_status.
+        """
+        error = self._validate_request(component, version, **kwargs)
+        if error is not None:
+            yield error
+            return
+        yield from super().iter_status(component, depth, version, **kwargs)
+
+    def query_status(self, status: str = None, component: str = None, updated_since: int = None) -> json:
+        """
+        Return the components matching all the given filters.
+        Args:
+            status ([str]): Current health status, e.g. failed.
+            component ([str]): Component, e.g. node.
+            updated_since ([int]): Status updated at or after this timestamp.
+        Returns:
+            ([str]): Json {"status": "Succeeded"/"Failed", "output": [{"resource", "id", "status",
+                "last_updated_time"}], "error": ""}
+        """
+        if status is not None and status not in [health_status.value for health_status in HEALTH_STATUSES]:
+            return json.dumps({"status": const.STATUSES.FAILED.value, "output": "", "error": "Invalid status"})
+        if component is not None and component not in SystemHealthComponents.get_health_components():
+            return json.dumps({"status": const.STATUSES.FAILED.value, "output": "", "error": "Invalid element"})
+        if updated_since is not None:
+            try:
+                updated_since = int(updated_since)
+            except (TypeError, ValueError):
+                return json.dumps({"status": const.STATUSES.FAILED.value, "output": "", "error": "Invalid updated_since"})
+        return super().query_status(status=status, component=component, updated_since=updated_since)
+
+    def get_changes(self, since: int = 0, timeout: float = None) -> json:
+        """
+        Return the components whose status changed after the index since, waiting
+        till a status changes or timeout seconds are over.
+        Args:
+            since ([int]): Index returned by the previous call, 0 for all the components.
+            timeout ([float]): Seconds to wait for a change, at most HEALTH_CHANGES_MAX_TIMEOUT.
+        Returns:
+            ([str]): Json {"status": "Succeeded"/"Failed", "output": {"index", "changes"}, "error": ""}
+        """
+        try:
+            since = int(since)
+            timeout = float(timeout) if timeout is not None else None
+        except (TypeError, ValueError):
+            return json.dumps({"status": const.STATUSES.FAILED.value, "output": "", "error": "Invalid since or timeout"})
+        if since < 0 or (timeout is not None and not 0 <= timeout <= HEALTH_CHANGES_MAX_TIMEOUT):
+            return json.dumps({"status": const.STATUSES.FAILED.value, "output": "", "error": "Invalid since or timeout"})
+        return super().get_changes(since=since, timeout=timeout)
+
+    def _validate_request(self, component: str, version: str, **kwargs) -> str:
+        """
+        Get the failed output json if the status request is invalid, None if valid.
+        """
         # Check if unsupported element status requested.
         unsupported_element = True
         for supported_element in CLUSTER_ELEMENTS:
@@ -63,5 +125,4 @@ class SystemHealthController(SystemHealth):
         # Currently only version "2.0" output json is supported
         if version != SYSTEM_HEALTH_OUTPUT_V2:
             return json.dumps({"status": const.STATUSES.FAILED.value, "output": "", "error": "Invalid output json version requested"})
-
-        return super().get_status(component, depth, version, **kwargs)
\ No newline at end of file
+        return None
@@ -26,6 +26,7 @@
 import os
 import time
 import sys
+import threading
 import traceback
 
 from cortx.utils.log import Log
@@ -34,6 +35,8 @@ from cortx.utils.conf_store.conf_store import Conf
 from ha import const
 from ha.core.config.config_manager import ConfigManager
 from ha.core.system_health.system_health import SystemHealth
+from ha.core.system_health.health_event_coalescer import HealthEventCoalescer
+from ha.core.event_analyzer.subscriber import Subscriber
 from ha.core.event_analyzer.watcher.watcher import Watcher
 from ha.core.event_analyzer.filter.filter import ClusterResourceFilter
 from ha.core.event_analyzer.parser.parser import ClusterResourceParser
@@ -60,15 +63,21 @@ class EventAnalyzerService:
         # Initialize system health
         confstore = ConfigManager.get_confstore()
         system_health = SystemHealth(confstore)
+        if system_health.history.is_enabled():
+            system_health.history.start_compaction()
+        window = get_coalescing_window()
+        if window > 0:
+            Log.info(f"Coalescing health events with window {window} seconds.")
+            system_health = HealthEventCoalescer(system_health, window)
         # Initalize watcher
         self._watcher_list: dict = self._initalize_watcher(system_health)
 
-    def _initalize_watcher(self, system_health: SystemHealth) -> dict:
+    def _initalize_watcher(self, system_health: Subscriber) -> dict:
         """
         Initalize watcher.
 
         Args:
-            system_health (SystemHealth): Instance of systemhealth.
+            system_health (Subscriber): Instance of systemhealth or its event coalescer.
 
         Returns:
             dict: mapping of wather_type -> watcher_instance
@@ -102,6 +111,12 @@ class EventAnalyzerService:
         while True:
             time.sleep(600)
 
+def get_coalescing_window() -> float:
+    """
+    Get health event coalescing window in seconds, 0 if disabled.
+    """
+    return float(Conf.get(const.HA_GLOBAL_INDEX, f"SYSTEM_HEALTH{_DELIM}coalescing_window", 0))
+
 # This will be instantiated from the fault_tolerance
 class EventAnalyzer:
     """
@@ -109,10 +124,14 @@ class EventAnalyzer:
     an alert to create health event object required for system
     health processing
     """
+    # Coalescer shared by the instances, events of a resource are grouped across messages.
+    _coalescer: HealthEventCoalescer = None
+    _coalescer_lock = threading.Lock()
+
     def __init__(self, msg=None):
         '''init method'''
         self._confstore = ConfigManager.get_confstore()
-        system_health = SystemHealth(self._confstore)
+        system_health = self._get_subscriber()
         self._cluster_resource_filter = ClusterResourceFilter()
         self._cluster_resource_parser = ClusterResourceParser()
         if self._cluster_resource_filter.filter_event(msg):
@@ -123,6 +142,19 @@ class EventAnalyzer:
                 Log.error(f"Failed to process event. Error: {e}")
                 raise SubscriberException(f"Failed to process event {str(health_event)}. Error: {e}")
 
+    def _get_subscriber(self) -> Subscriber:
+        """
+        Get system health, or the shared coalescer if coalescing window is configured.
+        """
+        window = get_coalescing_window()
+        if window <= 0:
+            return SystemHealth(self._confstore)
+        # Watchers create analyzers on their own threads, only one coalescer is started.
+        with EventAnalyzer._coalescer_lock:
+            if EventAnalyzer._coalescer is None:
+                EventAnalyzer._coalescer = HealthEventCoalescer(SystemHealth(self._confstore), window)
+        return EventAnalyzer._coalescer
+
 def main(argv):
     """
     Entry point for event analyzer daemon
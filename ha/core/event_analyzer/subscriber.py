@@ -35,3 +35,21 @@ class Subscriber(metaclass=abc.ABCMeta):
             event (Event): Event object.
         """
         pass
+
+    def process_events(self, events: list) -> None:
+        """
+        Process a batch of events in order. Every event is processed even if an
+        earlier one failed, first failure is raised after. Subscribers that can
+        share work across the events of a batch override it.
+
+        Args:
+            events (list): [Event]
+        """
+        error = None
+        for event in events:
+            try:
+                self.process_event(event)
+            except Exception as e:
+                error = error or e
+        if error is not None:
+            raise error
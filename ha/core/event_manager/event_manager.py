@@ -24,6 +24,7 @@ from typing import List
 from ha.core.event_manager.subscribe_event import SubscribeEvent
 from cortx.utils.log import Log
 from ha.util.message_bus import MessageBus
+from ha.util.consul_kv_store import ConsulKvStore, TXN_OPERATIONS
 from ha.core.config.config_manager import ConfigManager
 from ha.core.event_manager import const
 from ha.core.event_manager.error import InvalidComponent
@@ -43,6 +44,9 @@ class EventManager:
     who has subscribed for the specific HA event through message bus
     """
     __instance = None
+    # States of an event stored in one transaction, one subscription operation
+    # along with event and rule operations of every state.
+    SUBSCRIBE_TXN_MAX_STATES = (ConsulKvStore.TXN_MAX_OPERATIONS - 1) // 2
 
     @staticmethod
     def get_instance(default_log_enable=True):
@@ -109,7 +113,7 @@ class EventManager:
         MessageBus.register(message_type)
         # Add message type key/value to confstore
         message_type_key = EVENT_MANAGER_KEYS.MESSAGE_TYPE_KEY.value.replace("<component_id>", component)
-        if not self._confstore.key_exists(message_type_key):
+        if not self._confstore.key_exists(message_type_key, recurse=False):
             self._confstore.set(message_type_key, message_type)
         Log.debug(f"Created {message_type} with {message_type_key}")
         return message_type
@@ -125,24 +129,24 @@ class EventManager:
         MessageBus.deregister(message_type)
         # Remove message type key from confstore
         message_type_key = EVENT_MANAGER_KEYS.MESSAGE_TYPE_KEY.value.replace("<component_id>", component)
-        if self._confstore.key_exists(message_type_key):
+        if self._confstore.key_exists(message_type_key, recurse=False):
             self._confstore.delete(message_type_key)
         Log.info(f"Unsubscribed component {component} from message_type {message_type}")
 
-    def _store_component_key(self, key: str, resource_type: str, val: list) -> None:
+    def _store_component_key(self, key: str, resource_type: str, val: list) -> list:
         '''
-           Perform actual confstore store operation for component keys
+           Prepare confstore operations for component keys
            Ex:
            key: /cortx/ha/v1/events/subscribe/sspl
            confstore value: ['enclosure:sensor:voltage/failed', ...]
-        '''
-        if self._confstore.key_exists(key):
-            event_json_list = self._confstore.get(key)
 
+           Returns:
+               list: confstore transaction operations.
+        '''
+        event_json_list = self._confstore.get_many([key])
+        if key in event_json_list:
             # Get the event list from confstore first
-            _, event_list = event_json_list.popitem()
-
-            event_list = json.loads(event_list)
+            event_list = json.loads(event_json_list[key])
             for event in val:
                 new_val = resource_type + '/' + event
                 if new_val in event_list:
@@ -159,7 +163,7 @@ class EventManager:
             event_string = json.dumps(set_event_list)
             Log.debug(f'Subscription is already done with key \
                        {key}. Updating the subscription using event list')
-            self._confstore.update(key, event_string)
+            return [{"operation": TXN_OPERATIONS.UPDATE, "key": key, "val": event_string}]
         else:
             new_event = []
             for event in val:
@@ -169,23 +173,27 @@ class EventManager:
             event_list = json.dumps(new_event)
             Log.debug(f'Final newly added list of subscription is: {event_list}, \
                        Key is: {key}')
-            self._confstore.set(f'{key}', event_list)
+            return [{"operation": TXN_OPERATIONS.SET, "key": key, "val": event_list}]
 
-    def _store_event_key(self, resource_type: str, states: list = None, comp: str = None) -> None:
+    def _store_event_key(self, resource_type: str, states: list = None, comp: str = None) -> list:
         '''
-           Perform actual confstore store operation for event keys
+           Prepare confstore operations for event keys
            key: /cortx/ha/v1/events/enclosure:hw:disk/online
            value: ['sspl', ...]
+
+           Returns:
+               list: confstore transaction operations.
         '''
+        txn_ops = []
         if states:
-            for state in states:
-                new_key = EVENT_MANAGER_KEYS.EVENT_KEY.value.replace("<resource>", resource_type).replace("<state>", state)
-                if self._confstore.key_exists(new_key):
-                    comp_json_list = self._confstore.get(new_key)
-
+            event_keys = [EVENT_MANAGER_KEYS.EVENT_KEY.value.replace("<resource>", resource_type).replace("<state>", state)
+                          for state in states]
+            # Read all the event keys in one round-trip
+            comp_json_lists = self._confstore.get_many(event_keys)
+            for new_key in event_keys:
+                if new_key in comp_json_lists:
                     # Get the list of components from confstore
-                    _, comp_list = comp_json_list.popitem()
-                    comp_list = json.loads(comp_list)
+                    comp_list = json.loads(comp_json_lists[new_key])
                     if comp not in comp_list:
                         # If not already added, append to the old list
                         comp_list.append(comp)
@@ -194,7 +202,7 @@ class EventManager:
                     new_comp_list = json.dumps(comp_list)
                     Log.debug(f'Final newly added list of subscription is: {new_comp_list}, \
                                 Key is: {new_key}')
-                    self._confstore.update(new_key, new_comp_list)
+                    txn_ops.append({"operation": TXN_OPERATIONS.UPDATE, "key": new_key, "val": new_comp_list})
                 else:
                     new_comp_list = []
                     new_comp_list.append(comp)
@@ -202,7 +210,8 @@ class EventManager:
                     comp_list = json.dumps(new_comp_list)
                     Log.debug(f'Final newly added list of subscription is: {new_comp_list}, \
                                 Key is: {new_key}')
-                    self._confstore.set(f'{new_key}', comp_list)
+                    txn_ops.append({"operation": TXN_OPERATIONS.SET, "key": new_key, "val": comp_list})
+        return txn_ops
 
     def _delete_component_key(self, component: str, resource_type: str, states: list = None) -> None:
         '''
@@ -217,35 +226,33 @@ class EventManager:
             key: cortx/ha/v1/events/subscribe/hare:
             value: ["node:os:memory_usage/failed"]
         '''
+        key = EVENT_MANAGER_KEYS.SUBSCRIPTION_KEY.value.replace("<component_id>", component)
+        comp_json_list = self._confstore.get_many([key])
+        if key not in comp_json_list:
+            # If component key is not there, means event with that key will not be there,
+            # hence safely raise exception here so that _delete_event_key will not be called
+            raise InvalidComponent(f"Can not unsubscribe the component: {component} as it was not registered earlier")
+        # Get the event list from confstore
+        event_list = json.loads(comp_json_list[key])
         for state in states:
             delete_required_state = resource_type + '/' + state
-            key = EVENT_MANAGER_KEYS.SUBSCRIPTION_KEY.value.replace("<component_id>", component)
-            if self._confstore.key_exists(key):
-                comp_json_list = self._confstore.get(key)
-                # Get the event list from confstore
-                _, event_list = comp_json_list.popitem()
-                event_list = json.loads(event_list)
-                # Remove the event from the list(coming from confstore)
-                if delete_required_state in event_list:
-                    Log.debug(f'Deleting the subscription for {component}. For: {delete_required_state}')
-                    event_list.remove(delete_required_state)
-                if event_list:
-                    # After deletion, if list is not empty, update the confstore key
-                    new_event_list = json.dumps(event_list)
-                    Log.debug(f'Updating the subscription for {component}. new list: {new_event_list}')
-                    self._confstore.update(key, new_event_list)
-                else:
-                    Log.debug(f'Deleting subscription for {component} completely as there are \
-                                no other subscriptions')
-                    # else, delete the whole component
-                    self._confstore.delete(key)
-                    # As there is no subscription for this component,
-                    # delete the topic key
-                    self._delete_message_type(component)
-            else:
-                # If component key is not there, means event with that key will not be there,
-                # hence safely raise exception here so that _delete_event_key will not be called
-                raise InvalidComponent(f"Can not unsubscribe the component: {component} as it was not registered earlier")
+            # Remove the event from the list(coming from confstore)
+            if delete_required_state in event_list:
+                Log.debug(f'Deleting the subscription for {component}. For: {delete_required_state}')
+                event_list.remove(delete_required_state)
+        if event_list:
+            # After deletion, if list is not empty, update the confstore key
+            new_event_list = json.dumps(event_list)
+            Log.debug(f'Updating the subscription for {component}. new list: {new_event_list}')
+            self._confstore.update(key, new_event_list)
+        else:
+            Log.debug(f'Deleting subscription for {component} completely as there are \
+                        no other subscriptions')
+            # else, delete the whole component
+            self._confstore.delete(key)
+            # As there is no subscription for this component,
+            # delete the topic key
+            self._delete_message_type(component)
 
     def _delete_event_key(self, component: str, resource_type: str, states: list = None):
         '''
@@ -255,13 +262,14 @@ class EventManager:
           Request to delete: 'hare', 'node:os:memory_usage' 'failed'
           Stored key after deletion will be: cortx/ha/v1/events/node:os:memory_usage/failed:["motr"]
         '''
-        for state in states:
-            key = EVENT_MANAGER_KEYS.EVENT_KEY.value.replace("<resource>", resource_type).replace("<state>", state)
-            if self._confstore.key_exists(key):
-                comp_json_list = self._confstore.get(key)
+        txn_ops = []
+        keys = [EVENT_MANAGER_KEYS.EVENT_KEY.value.replace("<resource>", resource_type).replace("<state>", state)
+                for state in states]
+        comp_json_lists = self._confstore.get_many(keys)
+        for state, key in zip(states, keys):
+            if key in comp_json_lists:
                 # Get the component list
-                _, comp_list = comp_json_list.popitem()
-                comp_list = json.loads(comp_list)
+                comp_list = json.loads(comp_json_lists[key])
                 # Remove component from the list
                 if component in comp_list:
                     Log.debug(f'Deleting the key for {resource_type}/{state}. For: {component}')
@@ -270,14 +278,17 @@ class EventManager:
                     # If still list is not empty, update the confstore key
                     new_comp_list = json.dumps(comp_list)
                     Log.debug(f'Updating the key for {resource_type}/{state}. new comp list:{new_comp_list}')
-                    self._confstore.update(key, new_comp_list)
+                    txn_ops.append({"operation": TXN_OPERATIONS.UPDATE, "key": key, "val": new_comp_list})
                 # Else delete the event from the confstore
                 else:
                     Log.debug(f'Deleting the key for {resource_type}/{state} completely \
                                 as there are no more subscriptions')
-                    self._confstore.delete(key)
+                    txn_ops.append({"operation": TXN_OPERATIONS.DELETE, "key": key})
             else:
                 Log.error(f'Key: {key} does not present')
+        if txn_ops:
+            # Keys of the events are independent, they need not be removed atomically.
+            self._confstore.txn(txn_ops, split=True)
 
     def _get_producer(self, component: str) -> object:
         """
@@ -288,7 +299,7 @@ class EventManager:
         """
         producer_id = const.EVENT_MGR_PRODUCER_ID.replace("<component_id>", component)
         message_type_key = EVENT_MANAGER_KEYS.MESSAGE_TYPE_KEY.value.replace("<component_id>", component)
-        message_type_key_val = self._confstore.get(message_type_key)
+        message_type_key_val = self._confstore.get(message_type_key, recurse=False)
         _, message_type = message_type_key_val.popitem()
         return MessageBus.get_producer(producer_id, message_type)
 
@@ -313,12 +324,17 @@ class EventManager:
             EventManager._validate_component(component)
             EventManager._validate_events(events)
             message_type = self._create_message_type(component)
+            subscription_key = EVENT_MANAGER_KEYS.SUBSCRIPTION_KEY.value.replace("<component_id>", component)
             for event in events:
-                subscription_key = EVENT_MANAGER_KEYS.SUBSCRIPTION_KEY.value.replace("<component_id>", component)
-                self._store_component_key(subscription_key, event.resource_type, event.states)
-                self._store_event_key(event.resource_type, event.states, comp=component)
-                for state in event.states:
-                    self._monitor_rule.add_rule(event.resource_type, state, self._default_action)
+                # Subscription, event and rule keys of the states of an event are stored in one
+                # transaction, states beyond SUBSCRIBE_TXN_MAX_STATES in the following ones.
+                states = list(OrderedDict.fromkeys(event.states))
+                for start in range(0, max(len(states), 1), EventManager.SUBSCRIBE_TXN_MAX_STATES):
+                    txn_states = states[start:start + EventManager.SUBSCRIBE_TXN_MAX_STATES]
+                    txn_ops = self._store_component_key(subscription_key, event.resource_type, txn_states)
+                    txn_ops.extend(self._store_event_key(event.resource_type, txn_states, comp=component))
+                    txn_ops.extend(self._monitor_rule.prepare_add_rules(event.resource_type, txn_states, self._default_action))
+                    self._confstore.txn(txn_ops)
             Log.info(f"Successfully Subscribed component {component} with message_type {message_type}")
             return message_type
         except Exception as e:
@@ -351,7 +367,7 @@ class EventManager:
                 for state in event.states:
                     key = EVENT_MANAGER_KEYS.EVENT_KEY.value.replace(
                         "<resource>", event.resource_type).replace("<state>", state)
-                    if not self._confstore.key_exists(key):
+                    if not self._confstore.key_exists(key, recurse=False):
                         self._monitor_rule.remove_rule(event.resource_type, state, self._default_action)
             Log.info(f"Successfully UnSubscribed component {component}")
         except InvalidComponent:
@@ -375,7 +391,7 @@ class EventManager:
         value = []
         Log.debug(f"Fetching subscribed events for {key}")
 
-        kv = self._confstore.get(key)
+        kv = self._confstore.get(key, recurse=False)
         if kv:
             for k, v in kv.items():
                 if k.endswith(key):
@@ -395,7 +411,7 @@ class EventManager:
             # Run through list of components subscribed for this event and send event to each of them
             component_list_key = EVENT_MANAGER_KEYS.EVENT_KEY.value.replace(
                 "<resource>", event.resource_type).replace("<state>", event.event_type)
-            component_list_key_val = self._confstore.get(component_list_key)
+            component_list_key_val = self._confstore.get(component_list_key, recurse=False)
             if component_list_key_val:
                 _, value = component_list_key_val.popitem()
                 component_list = json.loads(value)
@@ -420,7 +436,7 @@ class EventManager:
         value = None
         Log.debug(f"Fetching message type for {key}")
 
-        kv = self._confstore.get(key)
+        kv = self._confstore.get(key, recurse=False)
         if kv:
             for k, v in kv.items():
                 if k.endswith(key):
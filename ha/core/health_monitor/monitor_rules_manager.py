@@ -23,6 +23,7 @@ from ha.core.system_health.model.health_event import HealthEvent
 from ha.core.config.config_manager import ConfigManager
 from ha.core.system_health.const import HEALTH_STATUSES
 from ha.core.health_monitor.error import InvalidAction
+from ha.util.consul_kv_store import TXN_OPERATIONS
 
 class MonitorRulesManager:
 
@@ -53,10 +54,7 @@ class MonitorRulesManager:
         Returns:
             val(str): Returns KV
         """
-        val = None
-        if self._confstore.key_exists(key):
-            val = self._confstore.get(key)
-        return val
+        return self._confstore.get(key, recurse=False)
 
     def _get_k_v(self, kv: dict):
         """
@@ -104,6 +102,36 @@ class MonitorRulesManager:
         Log.info(f"Evaluated action {val} for key {key}")
         return val
 
+    def prepare_add_rules(self, resource: str, events: list, action: HEALTH_MON_ACTIONS) -> list:
+        """
+        Prepare confstore transaction operations to add "action" to the rules
+        of resource/event for all the events. All rules are read in one round-trip.
+
+        Args:
+            resource(str): resource name
+            events(list): event types
+            action(str): action to be added
+
+        Returns:
+            list: confstore transaction operations
+        """
+        self._validate_action(action)
+        txn_ops = []
+        keys = [self._prepare_key(resource, event) for event in events]
+        rules = self._confstore.get_many(keys)
+        for key in keys:
+            Log.info(f"Adding rule for key: {key} ,value: {action}")
+            if key in rules:
+                val = json.loads(rules[key])
+                if action not in val:
+                    val.append(action)
+                    txn_ops.append({"operation": TXN_OPERATIONS.UPDATE, "key": key, "val": json.dumps(val)})
+                else:
+                    Log.warn(f"key value already exists for {key} , {action}")
+            else:
+                txn_ops.append({"operation": TXN_OPERATIONS.SET, "key": key, "val": json.dumps([action])})
+        return txn_ops
+
     def add_rule(self, resource: str, event: HEALTH_STATUSES , action: HEALTH_MON_ACTIONS):
         """
         Add rule to confstore for resource/event.
@@ -114,24 +142,9 @@ class MonitorRulesManager:
             event(str): event type
             action(str): action to be added
         """
-        self._validate_action(action)
-        key = self._prepare_key(resource, event)
-        val = []
-        Log.info(f"Adding rule for key: {key} ,value: {action}")
-        kv = self._get_val(key)
-        if kv:
-            _, val = self._get_k_v(kv)
-            if action not in val:
-                val.append(action)
-                val = json.dumps(val)
-                self._confstore.update(key, val)
-            else:
-                Log.warn(f"key value already exists for {key} , {action}")
-                return
-        else:
-            val.append(action)
-            val = json.dumps(val)
-            self._confstore.set(key, val)
+        txn_ops = self.prepare_add_rules(resource, [event], action)
+        if txn_ops:
+            self._confstore.txn(txn_ops)
 
     def remove_rule(self, resource: str, event: HEALTH_STATUSES , action: HEALTH_MON_ACTIONS):
         """
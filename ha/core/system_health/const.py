@@ -44,6 +44,21 @@ class HEALTH_EVENTS(Enum):
     THRESHOLD_BREACHED_HIGH = "threshold_breached:high"
     UNKNOWN = "unknown"
 
+# Attempts to update an entity health modified concurrently by other HA instances
+HEALTH_UPDATE_MAX_ATTEMPTS = 3
+
+# Longest wait in seconds of a system health changes long-poll, consul blocking queries allow up to 600
+HEALTH_CHANGES_MAX_TIMEOUT = 300
+
+# Key stored next to the health key of an element with the statuses of its children
+CHILD_STATUS_KEY = "child_status"
+
+# Parents whose children status counts are kept in memory by an evaluator, least recently used are dropped
+CHILD_STATUS_COUNTS_MAX_ENTRIES = 1024
+
+# Default seconds of health event history kept, 0 disables the history
+HEALTH_HISTORY_RETENTION = 604800
+
 # Health event severities
 class EVENT_SEVERITIES(Enum):
     ALERT = "alert"
@@ -14,6 +14,7 @@
 # For any questions about this software or licensing,
 # please email opensource@seagate.com or cortx-questions@seagate.com.
 
+import threading
 from importlib import import_module
 from cortx.utils.log import Log
 from ha.core.system_health.health_evaluators.element_health_evaluator import ElementHealthEvaluator
@@ -24,20 +25,24 @@ class HealthEvaluatorFactory:
     Cluster Element factory to keep track of elements.
     """
     _element_instances : dict = {}
+    _lock = threading.Lock()
 
     @staticmethod
     def init_evaluators() -> None:
         """
-        Build all elements.
+        Build all elements. Elements already built are kept, with their
+        in-memory state, for every later SystemHealth.
         """
-        Log.info("Initialize all the health evaluator elements")
         elements = HEALTH_EVALUATOR_CLASSES.ELEMENT_MAP
-        for element in elements.keys():
-            class_path_list: list = elements[element].split('.')[:-1]
-            module = import_module(f"{'.'.join(class_path_list)}")
-            element_instance = getattr(module, elements[element].split('.')[-1])()
-            HealthEvaluatorFactory._element_instances[element] = element_instance
-            Log.info(f"HealthEvaluator {elements[element]} is initalized...")
+        with HealthEvaluatorFactory._lock:
+            for element in elements.keys():
+                if element in HealthEvaluatorFactory._element_instances:
+                    continue
+                class_path_list: list = elements[element].split('.')[:-1]
+                module = import_module(f"{'.'.join(class_path_list)}")
+                element_instance = getattr(module, elements[element].split('.')[-1])()
+                HealthEvaluatorFactory._element_instances[element] = element_instance
+                Log.info(f"HealthEvaluator {elements[element]} is initalized...")
 
     @staticmethod
     def get_element_evaluator(element: str) -> ElementHealthEvaluator:
@@ -56,34 +56,38 @@ class ClusterHealthEvaluator(ElementHealthEvaluator):
         Returns:
             str: cluster status.
         """
-        children = self.get_children(CLUSTER_ELEMENTS.CLUSTER.value, cluster_id, comp_type=CLUSTER_ELEMENTS.CLUSTER.value)
-        Log.debug(f"Children for cluster {cluster_id} are {children}")
-        status_map = self.get_status_map(children, cluster_id=cluster_id)
-        Log.info(f"Apply cluster rule of {cluster_id} {kwargs} on {status_map}")
-        status = self._check_cluster_rules(status_map)
+        children = self.get_child_status_counts(CLUSTER_ELEMENTS.CLUSTER.value, cluster_id)
+        Log.info(f"Apply cluster rule of {cluster_id} {kwargs} on {children}")
+        status = self._check_cluster_rules(children)
         Log.info(f"Status for {CLUSTER_ELEMENTS.CLUSTER.value}:{CLUSTER_ELEMENTS.CLUSTER.value}:{cluster_id} is {status}")
         return status
 
+    def check_rules(self, children: dict) -> str:
+        """
+        Apply cluster rules on the status counts of its children.
+        """
+        return self._check_cluster_rules(children)
+
     def _check_cluster_rules(self, children) -> str:
         """
         Check cluster rule and return status.
 
         Args:
-            children (dict): status mapping for its children
+            children (dict): status counts of its children {child component: {status: count}}
 
         Returns:
             str: Status of cluster
         """
         cluster_status: str = None
-        site_ids = children[CLUSTER_ELEMENTS.SITE.value][CLUSTER_ELEMENTS.SITE.value]
-        quorum_size = int(len(site_ids.keys())/2) + 1
-        if self.count_status(site_ids, HEALTH_STATUSES.ONLINE.value) == len(site_ids.keys()):
+        site_counts = children[CLUSTER_ELEMENTS.SITE.value]
+        quorum_size = int(sum(site_counts.values())/2) + 1
+        if self.count_status(site_counts, HEALTH_STATUSES.ONLINE.value) == sum(site_counts.values()):
             cluster_status = HEALTH_EVENTS.FAULT_RESOLVED.value
-        elif self.count_status(site_ids, HEALTH_STATUSES.ONLINE.value) >= quorum_size:
+        elif self.count_status(site_counts, HEALTH_STATUSES.ONLINE.value) >= quorum_size:
             cluster_status = HEALTH_EVENTS.THRESHOLD_BREACHED_LOW.value
-        elif self.count_status(site_ids, HEALTH_STATUSES.DEGRADED.value) >= quorum_size:
+        elif self.count_status(site_counts, HEALTH_STATUSES.DEGRADED.value) >= quorum_size:
             cluster_status = HEALTH_EVENTS.THRESHOLD_BREACHED_LOW.value
-        elif self.count_status(site_ids, HEALTH_STATUSES.FAILED.value) >= quorum_size:
+        elif self.count_status(site_counts, HEALTH_STATUSES.FAILED.value) >= quorum_size:
             cluster_status = HEALTH_EVENTS.FAILED.value
         else:
             cluster_status = HEALTH_EVENTS.THRESHOLD_BREACHED_LOW.value
@@ -16,17 +16,22 @@
 
 import abc
 import json
-import re
 import time
+import threading
 import uuid
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from cortx.utils.log import Log
 from ha.core.system_health.system_health_hierarchy import HealthHierarchy
 from ha.core.config.config_manager import ConfigManager
 from ha.core.system_health.model.health_event import HealthEvent
+from ha.core.system_health.model.entity_health import EntityHealth
 from ha.core.system_health.system_health_metadata import SystemHealthComponents
 from ha.core.error import HaSystemHealthException
 from ha.core.system_health.system_health_manager import SystemHealthManager
 from ha.core.system_health.system_health_exception import HealthNotFoundException
+from ha.core.system_health.const import CHILD_STATUS_KEY, CHILD_STATUS_COUNTS_MAX_ENTRIES
+from ha.util.consul_kv_store import ConsulKvCasError
 
 # TODO: (Task Refactore) Refactore and move system health update element code to element
 
@@ -36,10 +41,19 @@ class ElementHealthEvaluator(metaclass=abc.ABCMeta):
     """
 
     HEALTH_MANAGER = None
+    # Maximum children health reads in flight.
+    MAX_CONCURRENT_READS = 10
 
     def __init__(self):
         self._confstore = ConfigManager.get_confstore()
         self.healthmanager = SystemHealthManager(self._confstore)
+        # Threads are started on the first children read, sync store calls run in them
+        # concurrently with their own consul clients over the shared connection pool.
+        self._read_executor = ThreadPoolExecutor(max_workers=ElementHealthEvaluator.MAX_CONCURRENT_READS,
+                                                 thread_name_prefix=f"{type(self).__name__}-read")
+        # {child status key: (modify index, {child component: Counter of child statuses})} in LRU order
+        self._child_status_counts: OrderedDict = OrderedDict()
+        self._child_status_counts_lock = threading.Lock()
 
     @staticmethod
     def prepare_key(component: str, **kwargs) -> str:
@@ -47,23 +61,7 @@ class ElementHealthEvaluator(metaclass=abc.ABCMeta):
         Prepare Key. This is an internal method for preparing component status key.
         This will be used when updating/querying a component status.
         """
-        # Get the key template.
-        key = SystemHealthComponents.get_key(component)
-        if "comp_id" in kwargs:
-            key = key.replace(f"${component}_id", kwargs["comp_id"])
-        # Check what all substitutions with actual values passed in kwargs to be done.
-        subs = re.findall("\$\w+", key)
-        # Check if the related argument present in kwargs, if yes substitute the same.
-        for sub in subs:
-            argument = re.split("\$", sub)
-            if argument[1] in kwargs:
-                key = re.sub("\$\w+", kwargs[argument[1]], key, 1)
-            else:
-                # Argument not present, break and return the key till this missing argument.
-                key = re.split("\$", key)
-                key = key[0]
-                break
-        return key
+        return SystemHealthComponents.get_key_template(component).format(**kwargs)
 
     def get_children(self, element: str, element_id: str, **kwargs) -> dict:
         """
@@ -82,46 +80,155 @@ class ElementHealthEvaluator(metaclass=abc.ABCMeta):
             return {}
         key = ElementHealthEvaluator.prepare_key(element, comp_id=element_id, **kwargs)
         key = key.replace("/health", "").replace("/", "", 1)
-        data = self.healthmanager.get_key(key, just_value=False)
-        for element in data.keys():
-            key_list = element.split("/")
-            if children[0] in key_list:
-                child_index = key_list.index(children[0])
-                element_id = key_list[child_index + 1]
-                if element_id not in children_ids:
-                    children_ids.append(key_list[child_index + 1])
+        # List only child folders ".../<child>/<child_id>/" instead of reading all health values.
+        child_keys = self.healthmanager.get_keys(f"{key}/{children[0]}/", separator="/")
+        for child_key in child_keys:
+            child_id = child_key.rstrip("/").split("/")[-1]
+            if child_id not in children_ids:
+                children_ids.append(child_id)
         Log.debug(f"Children for {element}:{element_id} are {children_ids}")
         #{component: {component_type: [component_ids]}}}
         return { children[0]: { children[0]: children_ids }}
 
-    def get_status_map(self, children: dict, **kwargs) -> dict:
+    def get_status_map(self, children: dict, skip_missing: bool=False, **kwargs) -> dict:
         """
-        Get status map from children
+        Get status map from children. Health of all the children is read concurrently.
 
         Args:
             children (dict): children list
+            skip_missing (bool): Leave out children without health instead of raising.
 
         Returns:
             dict: map of children with status.
         """
         status_map: dict = {}
+        child_list: list = []
         for element in children.keys():
             status_map[element] = {}
             for element_type in children[element]:
                 status_map[element][element_type] = {}
                 for element_id in children[element][element_type]:
                     Log.debug(f"Checking status for {element}:{element_type}:{element_id}....")
-                    current_health = self.get_status_raw(element, element_id,
-                                        comp_type=element_type, **kwargs)
-                    if current_health:
-                        event = json.loads(current_health).get("events")[0]
-                        Log.debug(f"Status for {element}:{element_type}:{element_id} with {kwargs} is {event}")
-                        status_map[element][element_type][element_id] = event.get("status")
-                    else:
-                        raise HealthNotFoundException(f"Missing health for component: {element}, component_id: {element_id}, component_type: {element_type}")
+                    child_list.append((element, element_type, element_id))
+        try:
+            healths = list(self._read_executor.map(self.healthmanager.get_key, [
+                ElementHealthEvaluator.prepare_key(element, comp_id=element_id, comp_type=element_type, **kwargs)
+                for element, element_type, element_id in child_list]))
+        except Exception as e:
+            Log.error(f"Failed reading status for children {child_list} with Error: {e}")
+            raise HaSystemHealthException("Failed reading status")
+        for (element, element_type, element_id), current_health in zip(child_list, healths):
+            if current_health:
+                event = EntityHealth.loads(current_health).get("events")[0]
+                Log.debug(f"Status for {element}:{element_type}:{element_id} with {kwargs} is {event}")
+                status_map[element][element_type][element_id] = event.get("status")
+            elif not skip_missing:
+                raise HealthNotFoundException(f"Missing health for component: {element}, component_id: {element_id}, component_type: {element_type}")
         Log.debug(f"status map is {status_map}")
         return status_map
 
+    @staticmethod
+    def get_child_status_key(element: str, element_id: str, **kwargs) -> str:
+        """
+        Key of the statuses of the children of element, next to its health key.
+        """
+        key = ElementHealthEvaluator.prepare_key(element, comp_id=element_id, **kwargs)
+        return key.replace("/health", f"/{CHILD_STATUS_KEY}")
+
+    def read_child_status(self, element: str, element_id: str, **kwargs) -> tuple:
+        """
+        Read statuses of the children of element. If not stored yet (e.g. health
+        stored by older version) it is built from the health of the children.
+
+        Args:
+            element (str): Parent element.
+            element_id (str): Parent element id.
+            kwargs: ids of the ancestors, e.g. cluster_id, site_id.
+
+        Returns:
+            tuple: ({child component: {child id: status}}, modify index, 0 if not stored)
+        """
+        key = ElementHealthEvaluator.get_child_status_key(element, element_id, **kwargs)
+        value, index = self.healthmanager.get_key_with_index(key)
+        if value:
+            return json.loads(value), index
+        return self._build_child_status(element, element_id, **kwargs), 0
+
+    def _build_child_status(self, element: str, element_id: str, **kwargs) -> dict:
+        """
+        Build statuses of the children of element from the health of the children.
+        """
+        children = self.get_children(element, element_id, **dict(kwargs, comp_type=element))
+        # Folder of a child is listed once its own children status is stored, before its health.
+        status_map = self.get_status_map(children, skip_missing=True, **dict(kwargs, **{f"{element}_id": element_id}))
+        child_status: dict = {}
+        for child, child_types in status_map.items():
+            for child_ids in child_types.values():
+                child_status.setdefault(child, {}).update(child_ids)
+        Log.info(f"Built children status of {element}:{element_id} from children health")
+        return child_status
+
+    def get_child_status_counts(self, element: str, element_id: str, **kwargs) -> dict:
+        """
+        Get count of the children of element per status with a single store read.
+        Counts are recounted only if the children status is modified after last read.
+
+        Returns:
+            dict: {child component: {status: count}}
+        """
+        key = ElementHealthEvaluator.get_child_status_key(element, element_id, **kwargs)
+        value, index = self.healthmanager.get_key_with_index(key)
+        with self._child_status_counts_lock:
+            cached = self._child_status_counts.get(key)
+            if value and cached is not None and cached[0] == index:
+                self._child_status_counts.move_to_end(key)
+                return cached[1]
+        if value:
+            child_status = json.loads(value)
+        else:
+            child_status = self._build_child_status(element, element_id, **kwargs)
+            try:
+                index = self.healthmanager.set_key(key, json.dumps(child_status), index=0)
+            except ConsulKvCasError:
+                # Stored by other HA instance in between, it is kept.
+                index = None
+        counts = {child: Counter(child_ids.values()) for child, child_ids in child_status.items()}
+        for child in HealthHierarchy.get_next_components(element):
+            counts.setdefault(child, Counter())
+        if index is not None:
+            self._cache_child_status_counts(key, index, counts)
+        return counts
+
+    def update_child_status_counts(self, key: str, index: int, prev_index: int, child: str,
+                                   old_status: str, new_status: str, child_status: dict):
+        """
+        Apply a child status transition written at index on the cached counts.
+        Counts are rebuilt from child_status if the cache is not at prev_index.
+        """
+        with self._child_status_counts_lock:
+            cached = self._child_status_counts.get(key)
+            if cached is not None and cached[0] == prev_index:
+                # Copied, counts returned earlier may still be read by other threads.
+                counts = {comp: Counter(comp_counts) for comp, comp_counts in cached[1].items()}
+                child_counts = counts.setdefault(child, Counter())
+                if old_status is not None:
+                    child_counts[old_status] -= 1
+                child_counts[new_status] += 1
+            else:
+                counts = {comp: Counter(child_ids.values()) for comp, child_ids in child_status.items()}
+        self._cache_child_status_counts(key, index, counts)
+
+    def _cache_child_status_counts(self, key: str, index: int, counts: dict):
+        """
+        Keep counts of the children status key at index, dropping the least
+        recently used parents above CHILD_STATUS_COUNTS_MAX_ENTRIES.
+        """
+        with self._child_status_counts_lock:
+            self._child_status_counts[key] = (index, counts)
+            self._child_status_counts.move_to_end(key)
+            while len(self._child_status_counts) > CHILD_STATUS_COUNTS_MAX_ENTRIES:
+                self._child_status_counts.popitem(last=False)
+
     def _get_new_event(self, event_type, resource_type, resource_id, subelement_event) -> HealthEvent:
         """
         Update health event
@@ -144,32 +251,33 @@ class ElementHealthEvaluator(metaclass=abc.ABCMeta):
         Log.info(f"New event is created: {resource_type}:{resource_id}, status: {resource_id}")
         return new_event
 
-    def count_status(self, element_status_map: dict, status: str) -> int:
+    def count_status(self, element_status_counts: dict, status: str) -> int:
         """
         Get count of element having match status.
 
         Args:
-            element_status_map (dict): status map
+            element_status_counts (dict): {status: count}
             status (str): element status
 
         Returns:
             int: count.
         """
-        return list(element_status_map.values()).count(status)
+        return element_status_counts.get(status, 0)
 
-    def get_status_raw(self, component: str, component_id: str=None, **kwargs):
+    def get_status_raw(self, component: str, component_id: str=None, consistency: str=None, **kwargs):
         """
         get status method. This is a generic method which can return status of any component(s).
+        consistency is the store read consistency mode, store default if None.
         """
         status = None
         try:
             # Prepare key and read the health value.
             if component_id != None:
                 key = ElementHealthEvaluator.prepare_key(component, comp_id=component_id, **kwargs)
-                status = self.healthmanager.get_key(key)
+                status = self.healthmanager.get_key(key, consistency=consistency)
             else:
                 key = ElementHealthEvaluator.prepare_key(component, **kwargs)
-                status = self.healthmanager.get_key(key, just_value=False)
+                status = self.healthmanager.get_key(key, just_value=False, consistency=consistency)
                 # Remove any keys which are not for the health status.
                 ignore_keys = []
                 for key in status:
@@ -182,6 +290,19 @@ class ElementHealthEvaluator(metaclass=abc.ABCMeta):
             Log.error(f"Failed reading status for component: {component} with Error: {e}")
             raise HaSystemHealthException("Failed reading status")
 
+    def check_rules(self, children: dict) -> str:
+        """
+        Apply the rules of the element on the status counts of its children
+        without reading the store, e.g. for a tree built in memory.
+
+        Args:
+            children (dict): status counts of its children {child component: {status: count}}
+
+        Returns:
+            str: Health event type of the element.
+        """
+        raise HaSystemHealthException(f"Rules are not available for {type(self).__name__}")
+
     @abc.abstractmethod
     def evaluate_status(self, health_event: HealthEvent) -> HealthEvent:
         """
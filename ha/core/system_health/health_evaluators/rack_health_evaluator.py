@@ -57,35 +57,38 @@ class RackHealthEvaluator(ElementHealthEvaluator):
         Returns:
             str: Rack status.
         """
-        children = self.get_children(CLUSTER_ELEMENTS.RACK.value, rack_id,
+        children = self.get_child_status_counts(CLUSTER_ELEMENTS.RACK.value, rack_id,
                     cluster_id=kwargs["cluster_id"],
-                    site_id=kwargs["site_id"],
-                    comp_type=CLUSTER_ELEMENTS.RACK.value)
-        Log.debug(f"Children for rack {rack_id} are {children}")
-        status_map = self.get_status_map(children, rack_id=rack_id, cluster_id=kwargs["cluster_id"], site_id=kwargs["site_id"])
-        Log.info(f"Apply rack rule of {rack_id} {kwargs} on {status_map}")
-        status = self._check_rack_rules(status_map)
+                    site_id=kwargs["site_id"])
+        Log.info(f"Apply rack rule of {rack_id} {kwargs} on {children}")
+        status = self._check_rack_rules(children)
         Log.info(f"Status for {CLUSTER_ELEMENTS.RACK.value}:{CLUSTER_ELEMENTS.RACK.value}:{rack_id} is {status}")
         return status
 
+    def check_rules(self, children: dict) -> str:
+        """
+        Apply rack rules on the status counts of its children.
+        """
+        return self._check_rack_rules(children)
+
     def _check_rack_rules(self, children) -> str:
         """
         Check rack rule and return status.
 
         Args:
-            children (dict): status mapping for its children
+            children (dict): status counts of its children {child component: {status: count}}
 
         Returns:
             str: Status of rack
         """
         # Considering rack have only node as element and element_type
-        node_ids = children[CLUSTER_ELEMENTS.NODE.value][CLUSTER_ELEMENTS.NODE.value]
-        quorum_size = int(len(node_ids.keys())/2) + 1
-        if self.count_status(node_ids, HEALTH_STATUSES.ONLINE.value) == len(node_ids.keys()):
+        node_counts = children[CLUSTER_ELEMENTS.NODE.value]
+        quorum_size = int(sum(node_counts.values())/2) + 1
+        if self.count_status(node_counts, HEALTH_STATUSES.ONLINE.value) == sum(node_counts.values()):
             rack_status = HEALTH_EVENTS.FAULT_RESOLVED.value
-        elif self.count_status(node_ids, HEALTH_STATUSES.ONLINE.value) >= quorum_size:
+        elif self.count_status(node_counts, HEALTH_STATUSES.ONLINE.value) >= quorum_size:
             rack_status = HEALTH_EVENTS.THRESHOLD_BREACHED_LOW.value
-        elif self.count_status(node_ids, HEALTH_STATUSES.FAILED.value) >= quorum_size:
+        elif self.count_status(node_counts, HEALTH_STATUSES.FAILED.value) >= quorum_size:
             rack_status = HEALTH_EVENTS.FAILED.value
         else:
             rack_status = HEALTH_EVENTS.THRESHOLD_BREACHED_LOW.value
@@ -56,36 +56,39 @@ class SiteHealthEvaluator(ElementHealthEvaluator):
         Returns:
             str: site status.
         """
-        children = self.get_children(CLUSTER_ELEMENTS.SITE.value, site_id,
-                    cluster_id=kwargs["cluster_id"],
-                    comp_type=CLUSTER_ELEMENTS.SITE.value)
-        Log.debug(f"Children for site {site_id} are {children}")
-        status_map = self.get_status_map(children, site_id=site_id, cluster_id=kwargs["cluster_id"])
-        Log.info(f"Apply site rule of {site_id} {kwargs} on {status_map}")
-        status = self._check_site_rules(status_map)
+        children = self.get_child_status_counts(CLUSTER_ELEMENTS.SITE.value, site_id,
+                    cluster_id=kwargs["cluster_id"])
+        Log.info(f"Apply site rule of {site_id} {kwargs} on {children}")
+        status = self._check_site_rules(children)
         Log.info(f"Status for {CLUSTER_ELEMENTS.SITE.value}:{CLUSTER_ELEMENTS.SITE.value}:{site_id} is {status}")
         return status
 
+    def check_rules(self, children: dict) -> str:
+        """
+        Apply site rules on the status counts of its children.
+        """
+        return self._check_site_rules(children)
+
     def _check_site_rules(self, children) -> str:
         """
         Check site rule and return status.
 
         Args:
-            children (dict): status mapping for its children
+            children (dict): status counts of its children {child component: {status: count}}
 
         Returns:
             str: Status of site
         """
         site_status: str = None
-        rack_ids = children[CLUSTER_ELEMENTS.RACK.value][CLUSTER_ELEMENTS.RACK.value]
-        quorum_size = int(len(rack_ids.keys())/2) + 1
-        if self.count_status(rack_ids, HEALTH_STATUSES.ONLINE.value) == len(rack_ids.keys()):
+        rack_counts = children[CLUSTER_ELEMENTS.RACK.value]
+        quorum_size = int(sum(rack_counts.values())/2) + 1
+        if self.count_status(rack_counts, HEALTH_STATUSES.ONLINE.value) == sum(rack_counts.values()):
             site_status = HEALTH_EVENTS.FAULT_RESOLVED.value
-        elif self.count_status(rack_ids, HEALTH_STATUSES.ONLINE.value) >= quorum_size:
+        elif self.count_status(rack_counts, HEALTH_STATUSES.ONLINE.value) >= quorum_size:
             site_status = HEALTH_EVENTS.THRESHOLD_BREACHED_LOW.value
-        elif self.count_status(rack_ids, HEALTH_STATUSES.DEGRADED.value) >= quorum_size:
+        elif self.count_status(rack_counts, HEALTH_STATUSES.DEGRADED.value) >= quorum_size:
             site_status = HEALTH_EVENTS.THRESHOLD_BREACHED_LOW.value
-        elif self.count_status(rack_ids, HEALTH_STATUSES.FAILED.value) >= quorum_size:
+        elif self.count_status(rack_counts, HEALTH_STATUSES.FAILED.value) >= quorum_size:
             site_status = HEALTH_EVENTS.FAILED.value
         else:
             site_status = HEALTH_EVENTS.THRESHOLD_BREACHED_LOW.value
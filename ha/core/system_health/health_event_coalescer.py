@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2021 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+import time
+import threading
+from collections import OrderedDict
+
+from cortx.utils.log import Log
+from ha.core.event_analyzer.subscriber import Subscriber
+from ha.core.system_health.model.health_event import HealthEvent
+
+class HealthEventCoalescer(Subscriber):
+    """
+    Coalescing stage in front of SystemHealth.process_events. Events of a resource
+    (resource_type, resource_id) received within the window are grouped and only
+    the latest one is processed when the window of its first event ends.
+    Events of a new generation (specific_info generation_id, e.g. restarted pod)
+    are not merged with the previous generation, both are processed in order,
+    so the failed->online handling of SystemHealth is kept.
+    Events are acknowledged when queued, failures while processing are logged.
+    """
+
+    def __init__(self, subscriber: Subscriber, window: float):
+        """
+        Args:
+            subscriber (Subscriber): Processes the coalesced events, e.g. SystemHealth.
+            window (float): Coalescing window in seconds.
+        """
+        self._subscriber = subscriber
+        self._window = window
+        self._condition = threading.Condition()
+        # {(resource_type, resource_id): {"deadline": float, "events": [HealthEvent]}} in deadline order
+        self._pending: OrderedDict = OrderedDict()
+        self._received = 0
+        self._processed = 0
+        self._stop = False
+        self._flusher = threading.Thread(target=self._run, daemon=True, name="health-event-coalescer")
+        self._flusher.start()
+
+    @staticmethod
+    def _get_generation(event: HealthEvent):
+        """
+        Get generation id of the event, None if not available.
+        """
+        specific_info = event.specific_info
+        return specific_info.get("generation_id") if isinstance(specific_info, dict) else None
+
+    def process_event(self, event: HealthEvent) -> None:
+        """
+        Queue the event, it supersedes the queued event of the same resource
+        and generation.
+        """
+        key = (event.resource_type, event.resource_id)
+        with self._condition:
+            self._received += 1
+            pending = self._pending.get(key)
+            if pending is None:
+                self._pending[key] = {"deadline": time.monotonic() + self._window, "events": [event]}
+                self._condition.notify()
+            elif self._get_generation(pending["events"][-1]) == self._get_generation(event):
+                Log.debug(f"Coalesced event {pending['events'][-1].event_id} into {event.event_id} for {key}")
+                pending["events"][-1] = event
+            else:
+                pending["events"].append(event)
+
+    def _run(self):
+        """
+        Process the events whose window is over.
+        """
+        while True:
+            with self._condition:
+                while not self._stop and \
+                    (not self._pending or next(iter(self._pending.values()))["deadline"] > time.monotonic()):
+                    timeout = None if not self._pending else \
+                        next(iter(self._pending.values()))["deadline"] - time.monotonic()
+                    self._condition.wait(timeout)
+                if self._stop:
+                    return
+                # All the resources whose window is over are processed as one batch.
+                events = []
+                now = time.monotonic()
+                while self._pending and next(iter(self._pending.values()))["deadline"] <= now:
+                    _, pending = self._pending.popitem(last=False)
+                    events.extend(pending["events"])
+            self._process(events)
+
+    def _process(self, events: list):
+        """
+        Pass events to the subscriber in order as one batch, so parent components
+        common to the events are evaluated once.
+        """
+        try:
+            self._subscriber.process_events(events)
+        except Exception as e:
+            Log.error(f"Failed to process coalesced events {[event.event_id for event in events]}. Error: {e}")
+        with self._condition:
+            self._processed += len(events)
+
+    def flush(self):
+        """
+        Process all the queued events now.
+        """
+        with self._condition:
+            events = [event for item in self._pending.values() for event in item["events"]]
+            self._pending.clear()
+        if events:
+            self._process(events)
+
+    def stop(self):
+        """
+        Process the queued events and stop.
+        """
+        with self._condition:
+            self._stop = True
+            self._condition.notify()
+        self._flusher.join()
+        self.flush()
+
+    def get_stats(self) -> dict:
+        """
+        Get number of events received and processed after coalescing.
+        """
+        with self._condition:
+            return {"received": self._received, "processed": self._processed, "queued": len(self._pending)}
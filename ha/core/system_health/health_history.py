@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2021 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+import json
+import time
+import threading
+import uuid
+
+from cortx.utils.conf_store.conf_store import Conf
+from cortx.utils.log import Log
+from ha import const
+from ha.const import _DELIM
+from ha.core.system_health.const import HEALTH_HISTORY_RETENTION
+from ha.core.system_health.model.entity_health import EntityEvent, EntityHealth
+from ha.util.consul_kv_store import ConsulKvStore, ConsulKvStoreError, TXN_OPERATIONS
+
+class HealthHistory:
+    """
+    Append-only event history of the components, kept apart from the health key
+    so that status reads and writes carry only the latest event.
+
+    Every event is a new key in the time bucket of its created timestamp:
+        /cortx/ha/history/<component path>/events/<bucket>/<created timestamp>-<ns>-<id>: event
+    Entries of the closed buckets are compacted into the bucket key:
+        /cortx/ha/history/<component path>/events/<bucket>: {"<created timestamp>-<ns>-<id>": event}
+    Entry ids sort in the order the events were written (ns is the write time in nanoseconds).
+    Buckets older than the retention are deleted. Events use the compact event
+    encoding of EntityHealth.
+    """
+
+    HEALTH_PREFIX = "/cortx/ha/system/"
+    HISTORY_PREFIX = "/cortx/ha/history/"
+
+    def __init__(self, store: ConsulKvStore, bucket_interval: int=None, retention: int=None):
+        """
+        Args:
+            store (ConsulKvStore): HA kv store.
+            bucket_interval (int): Seconds of history per bucket, from config if None.
+            retention (int): Seconds of history kept, 0 disables history, from config (default 7 days) if None.
+        """
+        self._store = store
+        if bucket_interval is None:
+            bucket_interval = Conf.get(const.HA_GLOBAL_INDEX, f"SYSTEM_HEALTH{_DELIM}history{_DELIM}bucket_interval", 3600)
+        if retention is None:
+            retention = Conf.get(const.HA_GLOBAL_INDEX, f"SYSTEM_HEALTH{_DELIM}history{_DELIM}retention", HEALTH_HISTORY_RETENTION)
+        self._bucket_interval = int(bucket_interval)
+        self._retention = int(retention)
+        self._compaction_stop = None
+
+    def is_enabled(self) -> bool:
+        return self._retention > 0
+
+    def get_history_key(self, health_key: str) -> str:
+        """
+        Get history folder of the component of the health key.
+        """
+        return f"{self.HISTORY_PREFIX}{health_key[len(self.HEALTH_PREFIX):].rsplit('/', 1)[0]}/events"
+
+    def get_bucket(self, timestamp: int) -> int:
+        return timestamp - timestamp % self._bucket_interval
+
+    def get_entry(self, health_key: str, event: EntityEvent) -> tuple:
+        """
+        Get (key, value) of the history entry of the event. Key is new, so the
+        entry is written with cas index 0 along with the health.
+        """
+        bucket = self.get_bucket(int(event.created_timestamp))
+        entry_id = f"{event.created_timestamp}-{time.time_ns()}-{uuid.uuid4().hex[:4]}"
+        return f"{self.get_history_key(health_key)}/{bucket}/{entry_id}", \
+            json.dumps(EntityHealth.encode_event(event), separators=(",", ":"))
+
+    def _relative_key(self, consul_key: str) -> str:
+        """
+        Get the key without the store prefix.
+        """
+        return "/" + consul_key[consul_key.find(self.HISTORY_PREFIX.strip("/")):]
+
+    def _parse_key(self, consul_key: str) -> tuple:
+        """
+        Get (key, history folder, bucket, entry id) of a history key, entry id
+        is None for the bucket key. None if not a history key.
+        """
+        key = self._relative_key(consul_key)
+        folder, last = key.rsplit("/", 1)
+        if "-" in last:
+            folder, bucket = folder.rsplit("/", 1)
+            return key, folder, int(bucket), last
+        if last.isdigit():
+            return key, folder, int(last), None
+        return None
+
+    def _read(self, history_key: str) -> dict:
+        """
+        Read the history under the history_key folder.
+
+        Return:
+            dict: {history folder: {bucket: {"entries": {entry_id: (key, event)}, "compacted": (key, {entry_id: event})}}}
+        """
+        history: dict = {}
+        for consul_key, value in (self._store.get(f"{history_key}/") or {}).items():
+            parsed = None if value is None else self._parse_key(consul_key)
+            if parsed is None:
+                continue
+            key, folder, bucket, entry_id = parsed
+            content = history.setdefault(folder, {}).setdefault(bucket, {"entries": {}, "compacted": None})
+            if entry_id is None:
+                content["compacted"] = (key, json.loads(value))
+            else:
+                content["entries"][entry_id] = (key, json.loads(value))
+        return history
+
+    def get_events(self, health_key: str, since: int=None) -> list:
+        """
+        Get history of the component of the health key, latest first.
+
+        Args:
+            health_key (str): Health key of the component.
+            since (int): Only events created at or after this timestamp.
+
+        Return:
+            list: [{"event_timestamp", "created_timestamp", "status", "specific_info"}]
+        """
+        history_key = self.get_history_key(health_key)
+        events: dict = {}
+        for bucket, content in self._read(history_key).get(history_key, {}).items():
+            if since is not None and bucket + self._bucket_interval <= since:
+                continue
+            if content["compacted"] is not None:
+                events.update(content["compacted"][1])
+            events.update({entry_id: event for entry_id, (_, event) in content["entries"].items()})
+        return [EntityHealth.decode_event(events[entry_id]) for entry_id in sorted(events, reverse=True)
+                if since is None or int(events[entry_id][1]) >= since]
+
+    def compact(self, now: int=None) -> dict:
+        """
+        Merge entries of the closed buckets into the bucket key and delete buckets
+        older than the retention. Buckets are found by listing the history keys
+        only, values are read just for the closed buckets with entries. Bucket key
+        is written with cas, so compaction by other HA instances at the same time
+        does not lose entries.
+
+        Return:
+            dict: {"compacted": buckets, "deleted": buckets, "conflicts": buckets}
+        """
+        now = int(time.time()) if now is None else now
+        result = {"compacted": 0, "deleted": 0, "conflicts": 0}
+        # {bucket key: number of entries}
+        buckets: dict = {}
+        for consul_key in self._store.get_keys(self.HISTORY_PREFIX):
+            parsed = self._parse_key(consul_key)
+            if parsed is None:
+                continue
+            _, folder, bucket, entry_id = parsed
+            bucket_key = f"{folder}/{bucket}"
+            buckets[bucket_key] = buckets.get(bucket_key, 0) + (0 if entry_id is None else 1)
+        for bucket_key, entry_count in buckets.items():
+            bucket = int(bucket_key.rsplit("/", 1)[1])
+            if bucket + self._bucket_interval <= now - self._retention:
+                # Bucket key and its entries, not the buckets starting with the same digits.
+                self._store.txn([{"operation": TXN_OPERATIONS.DELETE, "key": bucket_key},
+                                 {"operation": TXN_OPERATIONS.DELETE, "key": f"{bucket_key}/", "recurse": True}])
+                result["deleted"] += 1
+            elif bucket + self._bucket_interval <= now and entry_count:
+                try:
+                    self._compact_bucket(bucket_key)
+                    result["compacted"] += 1
+                except ConsulKvStoreError as e:
+                    Log.warn(f"History bucket {bucket_key} modified concurrently, skipped. Error: {e}")
+                    result["conflicts"] += 1
+        return result
+
+    def _compact_bucket(self, bucket_key: str):
+        """
+        Merge entries of the bucket into the bucket key and delete them.
+        """
+        folder, bucket = bucket_key.rsplit("/", 1)
+        entries = self._read(bucket_key).get(folder, {}).get(int(bucket), {"entries": {}})["entries"]
+        if not entries:
+            return
+        value, index = self._store.get_with_index(bucket_key)
+        compacted = json.loads(value) if value else {}
+        compacted.update({entry_id: event for entry_id, (_, event) in entries.items()})
+        operations = [{"operation": TXN_OPERATIONS.CAS, "key": bucket_key,
+                       "val": json.dumps(compacted, separators=(",", ":")), "index": index}]
+        # Entries deleted in a later chunk are kept in the bucket key too, readers merge by entry id.
+        operations.extend({"operation": TXN_OPERATIONS.DELETE, "key": key} for key, _ in entries.values())
+        self._store.txn(operations, split=True)
+
+    def start_compaction(self, interval: int=None):
+        """
+        Compact the history every interval seconds from a daemon thread.
+        Interval is read from config if None.
+        """
+        if self._compaction_stop is not None:
+            return
+        if interval is None:
+            interval = int(Conf.get(const.HA_GLOBAL_INDEX, f"SYSTEM_HEALTH{_DELIM}history{_DELIM}compaction_interval", 600))
+        self._compaction_stop = threading.Event()
+        stop = self._compaction_stop
+
+        def _compact():
+            while not stop.wait(interval):
+                try:
+                    Log.info(f"Compacted system health history: {self.compact()}")
+                except Exception as e:
+                    Log.error(f"Failed compacting system health history. Error: {e}")
+        threading.Thread(target=_compact, daemon=True, name="health-history-compaction").start()
+
+    def stop_compaction(self):
+        """
+        Stop periodic compaction.
+        """
+        if self._compaction_stop is not None:
+            self._compaction_stop.set()
+            self._compaction_stop = None
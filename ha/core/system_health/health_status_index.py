@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2021 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+Secondary index of the component health keys by status, maintained along
+with every health update.
+
+Rebuild: python3 -m ha.core.system_health.health_status_index
+"""
+
+import json
+import sys
+
+from cortx.utils.log import Log
+from ha.core.config.config_manager import ConfigManager
+from ha.core.system_health.model.entity_health import EntityHealth
+from ha.core.system_health.system_health_metadata import SystemHealthComponents
+from ha.util.consul_kv_store import ConsulKvStore, TXN_OPERATIONS
+
+class HealthStatusIndex:
+    """
+    Components by status, so e.g. the failed nodes are listed without reading
+    the health tree. Every component has one index key, under its current status:
+        /cortx/ha/index/status/<status>/<component>/<component path>: <last updated timestamp>
+    Component path is the health key path without the health prefix and the
+    trailing "health", e.g. cluster/c1/site/1/rack/1/node/n1.
+    """
+
+    HEALTH_PREFIX = "/cortx/ha/system/"
+    INDEX_PREFIX = "/cortx/ha/index/status/"
+
+    def __init__(self, store: ConsulKvStore):
+        """
+        Args:
+            store (ConsulKvStore): HA kv store.
+        """
+        self._store = store
+
+    def get_index_key(self, health_key: str, component: str, status: str) -> str:
+        """
+        Get index key of the component of the health key under status.
+        """
+        return f"{self.INDEX_PREFIX}{status}/{component}/{health_key[len(self.HEALTH_PREFIX):].rsplit('/', 1)[0]}"
+
+    def get_changes(self, health_key: str, component: str, old_status: str, new_status: str, timestamp: str) -> tuple:
+        """
+        Get the index changes for a status update of the component, to be
+        written in the same transaction as the health.
+
+        Args:
+            health_key (str): Health key of the component.
+            component (str): Component, e.g. node.
+            old_status (str): Current status, None if health is not stored yet.
+            new_status (str): Status written.
+            timestamp (str): Created timestamp of the event written.
+
+        Return:
+            tuple: ([(index key, value)] to be written, [index key] to be deleted)
+        """
+        updates = [(self.get_index_key(health_key, component, new_status), timestamp)]
+        deletes = []
+        if old_status is not None and old_status != new_status:
+            deletes.append(self.get_index_key(health_key, component, old_status))
+        return updates, deletes
+
+    def _relative_key(self, consul_key: str) -> str:
+        """
+        Get the key without the store prefix.
+        """
+        return "/" + consul_key[consul_key.find(self.INDEX_PREFIX.strip("/")):]
+
+    def query(self, status: str=None, component: str=None, updated_since: int=None) -> list:
+        """
+        List the components matching all the given filters. Only the index keys
+        under the status and component are read, if given. For a component
+        without status the status folders are listed keys only and the
+        component folder of each status is read.
+
+        Args:
+            status (str): Current status, e.g. failed.
+            component (str): Component, e.g. node.
+            updated_since (int): Status updated at or after this timestamp.
+
+        Return:
+            list: [{"resource", "id", "status", "last_updated_time"}] in key order.
+        """
+        if status is not None:
+            prefixes = [f"{self.INDEX_PREFIX}{status}/" + (f"{component}/" if component is not None else "")]
+        elif component is not None:
+            prefixes = [f"{self._relative_key(status_folder)}{component}/"
+                        for status_folder in self._store.get_keys(self.INDEX_PREFIX, separator="/")]
+        else:
+            prefixes = [self.INDEX_PREFIX]
+        output: list = []
+        for prefix in prefixes:
+            for consul_key, timestamp in (self._store.get(prefix) or {}).items():
+                if timestamp is None:
+                    continue
+                entry = self._get_entry(consul_key, timestamp)
+                if component is not None and entry["resource"] != component:
+                    continue
+                if updated_since is not None and int(timestamp) < updated_since:
+                    continue
+                output.append(entry)
+        return output
+
+    def wait_for_changes(self, since: int=0, timeout: float=None) -> tuple:
+        """
+        Get the components whose status changed after the store index since,
+        waiting till a status changes or timeout seconds are over.
+
+        Args:
+            since (int): Store index returned by the previous call, 0 for all the components.
+            timeout (float): Seconds to wait for a change, no wait if None or 0.
+
+        Return:
+            tuple: (store index for the next call, [{"resource", "id", "status", "last_updated_time"}])
+        """
+        index, changes = self._store.wait_for_changes(self.INDEX_PREFIX, index=since, wait=timeout)
+        return index, [self._get_entry(consul_key, timestamp) for consul_key, timestamp in sorted(changes.items())
+                       if timestamp is not None]
+
+    def _get_entry(self, consul_key: str, timestamp: str) -> dict:
+        """
+        Get the component of the index key.
+        """
+        status, component, path = self._relative_key(consul_key)[len(self.INDEX_PREFIX):].split("/", 2)
+        return {"resource": component, "id": path.rsplit("/", 1)[-1], "status": status, "last_updated_time": timestamp}
+
+    def rebuild(self) -> dict:
+        """
+        Rebuild the index from the health tree, e.g. for the health stored
+        before the index was maintained. Index keys of the components not in the
+        health tree or under another status are removed. A component updated
+        while rebuilding can be left under its previous status, rebuild when
+        system health is not updating or run it again.
+
+        Return:
+            dict: {"scanned", "indexed", "removed"}
+        """
+        result = {"scanned": 0, "indexed": 0, "removed": 0}
+        templates = [(template.split("/"), component)
+                     for component, template in SystemHealthComponents.get_health_components().items()]
+        expected: dict = {}
+        for consul_key, value in (self._store.get(self.HEALTH_PREFIX) or {}).items():
+            result["scanned"] += 1
+            key = "/" + consul_key[consul_key.find(self.HEALTH_PREFIX.strip("/")):]
+            if value is None or not key.endswith("/health"):
+                continue
+            component = self._match_component(key.split("/"), templates)
+            if component is None:
+                continue
+            try:
+                latest_event = EntityHealth.loads(value)["events"][0]
+            except (ValueError, KeyError, IndexError):
+                continue
+            expected[self.get_index_key(key, component, latest_event["status"])] = latest_event["created_timestamp"]
+        existing = {self._relative_key(consul_key): timestamp
+                    for consul_key, timestamp in (self._store.get(self.INDEX_PREFIX) or {}).items()}
+        operations = [{"operation": TXN_OPERATIONS.UPDATE, "key": key, "val": timestamp}
+                      for key, timestamp in expected.items() if existing.get(key) != timestamp]
+        operations.extend({"operation": TXN_OPERATIONS.DELETE, "key": key} for key in existing if key not in expected)
+        if operations:
+            # Index keys are independent, so they are written in transactions of TXN_MAX_OPERATIONS.
+            self._store.txn(operations, split=True)
+        result["indexed"] = len(expected)
+        result["removed"] = len([key for key in existing if key not in expected])
+        Log.info(f"Rebuilt system health status index: {result}")
+        return result
+
+    @staticmethod
+    def _match_component(parts: list, templates: list) -> str:
+        """
+        Get component of the split health key, None if no template matches.
+        """
+        for template, component in templates:
+            if len(template) == len(parts) and \
+                all(segment.startswith("$") or segment == part for segment, part in zip(template, parts)):
+                return component
+        return None
+
+def main(argv: list):
+    ConfigManager.init("health_status_index")
+    result = HealthStatusIndex(ConfigManager.get_confstore()).rebuild()
+    sys.stdout.write(f"{json.dumps(result)}\n")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
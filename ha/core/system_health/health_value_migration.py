@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2021 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+One-shot migration of the entity health values in the store from the legacy
+json format to the compact encoding. Readers accept both formats, so the
+migration can run while system health is updating the values.
+
+Usage: python3 -m ha.core.system_health.health_value_migration [--dry-run]
+"""
+
+import json
+import sys
+
+from cortx.utils.log import Log
+from ha.core.config.config_manager import ConfigManager
+from ha.core.system_health.model.entity_health import EntityHealth
+from ha.util.consul_kv_store import ConsulKvStore, ConsulKvCasError
+
+# Store prefix of the system health keys.
+SYSTEM_HEALTH_PREFIX = "cortx/ha/system/"
+
+def migrate_health_values(store: ConsulKvStore, dry_run: bool=False) -> dict:
+    """
+    Rewrite the legacy json health values in the compact encoding. Every value
+    is written with cas, a value updated meanwhile is already in the compact
+    encoding and is counted as a conflict.
+
+    Args:
+        store (ConsulKvStore): HA kv store.
+        dry_run (bool): Only count the values to migrate.
+
+    Return:
+        dict: {"scanned", "legacy", "migrated", "conflicts"}
+    """
+    prefix = "/".join(x for x in store.get_prefix().split("/") if x != "")
+    result = {"scanned": 0, "legacy": 0, "migrated": 0, "conflicts": 0}
+    legacy_keys: list = []
+    for full_key, value in (store.get(SYSTEM_HEALTH_PREFIX) or {}).items():
+        result["scanned"] += 1
+        if value is None or not EntityHealth.is_legacy(value):
+            continue
+        try:
+            health = json.loads(value)
+        except ValueError:
+            # Not json, e.g. node map.
+            continue
+        # Only entity health values, not the child status maps.
+        if isinstance(health, dict) and "events" in health:
+            legacy_keys.append(full_key[len(prefix):].lstrip("/"))
+    result["legacy"] = len(legacy_keys)
+    if dry_run:
+        return result
+    for key in legacy_keys:
+        value, index = store.get_with_index(key)
+        if value is None or not EntityHealth.is_legacy(value):
+            result["conflicts"] += 1
+            continue
+        try:
+            store.cas(key, EntityHealth.write(json.loads(value)), index)
+            result["migrated"] += 1
+        except ConsulKvCasError:
+            result["conflicts"] += 1
+    Log.info(f"Migrated system health values to encoding version {EntityHealth.ENCODING_VERSION}: {result}")
+    return result
+
+def main(argv: list):
+    ConfigManager.init("health_value_migration")
+    result = migrate_health_values(ConfigManager.get_confstore(), dry_run="--dry-run" in argv)
+    sys.stdout.write(f"{json.dumps(result)}\n")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -15,12 +15,18 @@
 # please email opensource@seagate.com or cortx-questions@seagate.com.
 
 import json
+import threading
+from collections import deque
 
 from cortx.utils.conf_store import Conf
 from cortx.utils.log import Log
 from ha import const
 from ha.core.error import HaEntityHealthException
 from ha.const import _DELIM
+from ha.core.system_health.const import HEALTH_HISTORY_RETENTION
+
+# Health values parsed by the current thread.
+_parse_local = threading.local()
 
 class EntityEvent:
     """
@@ -29,6 +35,7 @@ class EntityEvent:
     """
 
     VERSION = const.DATASTORE_VERSION
+    __slots__ = ("event_timestamp", "created_timestamp", "status", "specific_info")
 
     def __init__(self, event_timestamp: str, created_timestamp: str, status: str, specific_info: dict=None):
         """
@@ -45,7 +52,8 @@ class EntityEvent:
         Return dictionary attribute.
         """
 
-        return vars(self)
+        return {"event_timestamp": self.event_timestamp, "created_timestamp": self.created_timestamp,
+                "status": self.status, "specific_info": self.specific_info}
 
 class EntityAction:
     """
@@ -53,6 +61,7 @@ class EntityAction:
     """
 
     VERSION = const.DATASTORE_VERSION
+    __slots__ = ("modified_timestamp", "status")
 
     def __init__(self, modified_timestamp: str, status: str):
         """
@@ -66,7 +75,7 @@ class EntityAction:
         Return dictionary attribute.
         """
 
-        return vars(self)
+        return {"modified_timestamp": self.modified_timestamp, "status": self.status}
 
 class EntityHealth:
     """
@@ -75,28 +84,48 @@ class EntityHealth:
     """
 
     VERSION = const.DATASTORE_VERSION
+    # Number of health values parsed, used to measure the cost of event processing.
+    PARSE_COUNT = 0
+    # Number of events kept in the health value, read once from the configuration.
+    NUM_EVENTS = None
+    # Version of the compact encoding written to the store. Compact value is the json array
+    # [ENCODING_VERSION, [[event_timestamp, created_timestamp, status, specific_info], ...],
+    #  [modified_timestamp, status] or null, attributes], legacy value is the json object.
+    ENCODING_VERSION = 2
+    __slots__ = ("events", "action", "attributes")
 
     def __init__(self):
         """
         Init method.
         """
 
-        self.events: list = []
+        # Ring buffer of the history, the latest event is the first element.
+        self.events: deque = deque(maxlen=EntityHealth.get_num_events())
         self.action: EntityAction = {}
         self.attributes: dict = {}
 
+    @staticmethod
+    def get_num_events() -> int:
+        """
+        Get number of events kept in the entity health. With the health history
+        enabled only the latest event is kept, older ones are in the history.
+        """
+        if EntityHealth.NUM_EVENTS is None:
+            retention = int(Conf.get(const.HA_GLOBAL_INDEX, f"SYSTEM_HEALTH{_DELIM}history{_DELIM}retention",
+                                     HEALTH_HISTORY_RETENTION))
+            if retention > 0:
+                EntityHealth.NUM_EVENTS = 1
+            else:
+                EntityHealth.NUM_EVENTS = int(Conf.get(const.HA_GLOBAL_INDEX, f"SYSTEM_HEALTH{_DELIM}num_entity_health_events"))
+        return EntityHealth.NUM_EVENTS
+
     def add_event(self, event: EntityEvent):
         """
         Adds a new event to the entity health.
         """
 
-        # Insert the new event as a first element in th events array
-        self.events.insert(0, event)
-        # Keep the history of events as per the configuration
-        num_events = Conf.get(const.HA_GLOBAL_INDEX, f"SYSTEM_HEALTH{_DELIM}num_entity_health_events")
-        if len(self.events) > num_events:
-            # Delete the last event entry
-            del self.events[len(self.events) - 1]
+        # Insert the new event as a first element, the oldest event is dropped when the history is full.
+        self.events.appendleft(event)
 
     def set_action(self, action: EntityAction):
         """
@@ -111,14 +140,14 @@ class EntityHealth:
         """
 
         for key, value in attributes.items():
-            self.attibutes[key] = value
+            self.attributes[key] = value
 
     def ret_dict(self):
         """
         Return dictionary attribute.
         """
 
-        return vars(self)
+        return {"events": list(self.events), "action": self.action, "attributes": self.attributes}
 
     def get_latest_event(self) -> EntityEvent:
         """
@@ -132,40 +161,112 @@ class EntityHealth:
     @staticmethod
     def write(entity_health) -> str:
         """
-        Converts the entity health object into a json string which then
-        could be written to the store.
+        Converts the entity health object, or its dict, into the compact
+        encoding which then could be written to the store.
+        """
+
+        if isinstance(entity_health, EntityHealth):
+            events = [EntityHealth.encode_event(event) for event in entity_health.events]
+            action = entity_health.action
+            attributes = entity_health.attributes
+        else:
+            events = [[event["event_timestamp"], event["created_timestamp"], event["status"], event["specific_info"]]
+                      for event in entity_health.get("events", [])]
+            action = entity_health.get("action")
+            attributes = entity_health.get("attributes", {})
+        if isinstance(action, EntityAction):
+            action = [action.modified_timestamp, action.status]
+        elif action:
+            action = [action["modified_timestamp"], action["status"]]
+        else:
+            action = None
+        return json.dumps([EntityHealth.ENCODING_VERSION, events, action, attributes], separators=(",", ":"))
+
+    @staticmethod
+    def encode_event(event: EntityEvent) -> list:
+        """
+        Get the compact encoding of the event.
+        """
+
+        return [event.event_timestamp, event.created_timestamp, event.status, event.specific_info]
+
+    @staticmethod
+    def decode_event(event: list) -> dict:
+        """
+        Get the legacy dict of the compact encoded event.
+        """
+
+        return {"event_timestamp": event[0], "created_timestamp": event[1], "status": event[2],
+                "specific_info": event[3]}
+
+    @staticmethod
+    def write_legacy(entity_health) -> str:
+        """
+        Converts the entity health object into the legacy json string.
         """
 
         return json.dumps(entity_health, default=lambda o: o.ret_dict(), indent=None)
 
     @staticmethod
-    def read(current_health: str):
+    def is_legacy(health_value: str) -> bool:
+        """
+        Check if the health value read from the store is in the legacy json format.
+        """
+
+        return health_value.lstrip().startswith("{")
+
+    @staticmethod
+    def get_thread_parse_count() -> int:
+        """
+        Number of health values parsed by the calling thread. Difference of two
+        readings gives the parses of the work done in between.
+        """
+        return getattr(_parse_local, "count", 0)
+
+    @staticmethod
+    def loads(health_value: str) -> dict:
+        """
+        Parse the entity health read from the store, compact or legacy json,
+        into the dict of the legacy json format. Other json values are
+        returned as parsed.
+        """
+
+        EntityHealth.PARSE_COUNT += 1
+        _parse_local.count = getattr(_parse_local, "count", 0) + 1
+        value = json.loads(health_value)
+        if not isinstance(value, list) or not value or not isinstance(value[0], int):
+            return value
+        if value[0] != EntityHealth.ENCODING_VERSION:
+            Log.error(f"Unsupported entity health encoding version: {value[0]}")
+            raise HaEntityHealthException(f"Unsupported entity health encoding version: {value[0]}")
+        _, events, action, attributes = value
+        return {"events": [EntityHealth.decode_event(event) for event in events],
+                "action": {"modified_timestamp": action[0], "status": action[1]} if action else {},
+                "attributes": attributes}
+
+    @staticmethod
+    def read(current_health):
         """
-        Converts the entity health json into an object of this class.
+        Converts the entity health json, or the dict already parsed from it,
+        into an object of this class.
         """
 
         try:
-            # TODO: Check and optimize below code.
             # Load the current health json.
-            current_health_dict = json.loads(current_health)
+            current_health_dict = current_health if isinstance(current_health, dict) else EntityHealth.loads(current_health)
 
             # Create, populate and return the object.
             entity_health = EntityHealth()
-            for key in current_health_dict.keys():
+            for key, value in current_health_dict.items():
                 if key == "events":
-                    num_events = len(current_health_dict[key])
-                    while num_events:
-                        num_events = num_events - 1
-                        entity_event = EntityEvent(current_health_dict[key][num_events]["event_timestamp"],
-                                                   current_health_dict[key][num_events]["created_timestamp"],
-                                                   current_health_dict[key][num_events]["status"],
-                                                   current_health_dict[key][num_events]["specific_info"])
-                        entity_health.add_event(entity_event)
+                    # Events are stored latest first, keep the latest ones the history can hold.
+                    entity_health.events.extend(EntityEvent(event["event_timestamp"], event["created_timestamp"],
+                                                            event["status"], event["specific_info"])
+                                                for event in value[:EntityHealth.get_num_events()])
                 elif key == "action":
-                    entity_action = EntityAction(current_health_dict[key]["modified_timestamp"], current_health_dict[key]["status"])
-                    entity_health.set_action(entity_action)
+                    entity_health.set_action(EntityAction(value["modified_timestamp"], value["status"]))
                 elif key == "attributes":
-                    entity_health.add_attributes(current_health_dict[key])
+                    entity_health.add_attributes(value)
                 else:
                     Log.error(f"Unrecognized key found in entity health in store: {key}")
                     raise HaEntityHealthException("Unrecognized key found in entity health in store")
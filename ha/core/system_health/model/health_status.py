@@ -13,6 +13,7 @@
 # about this software or licensing, please email opensource@seagate.com or
 # cortx-questions@seagate.com.
 
+import io
 import json
 
 class StatusOutput:
@@ -40,4 +41,126 @@ class ComponentStatus:
         self.sub_resources.append(resource)
 
     def to_json(self):
-        return json.dumps(self, default=lambda a: a.__dict__)
\ No newline at end of file
+        return json.dumps(self, default=lambda a: a.__dict__)
+
+class StatusStream(io.TextIOBase):
+    """
+    Read only text file over the json chunks of a streamed status output,
+    chunks are pulled from the iterator as they are read.
+    """
+
+    def __init__(self, chunks):
+        """
+        Args:
+            chunks (iterator): Iterator of str chunks, e.g. SystemHealth.iter_status.
+        """
+        self._chunks = iter(chunks)
+        self._buffer = ""
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> str:
+        """
+        Read at most size characters, all the remaining ones if size is negative or None.
+        """
+        if size is None or size < 0:
+            data = self._buffer + "".join(self._chunks)
+            self._buffer = ""
+            return data
+        parts = [self._buffer]
+        length = len(self._buffer)
+        while length < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            parts.append(chunk)
+            length += len(chunk)
+        data = "".join(parts)
+        self._buffer = data[size:]
+        return data[:size]
+
+    def __iter__(self):
+        """
+        Iterate over the chunks, not over lines.
+        """
+        if self._buffer:
+            yield self._buffer
+            self._buffer = ""
+        yield from self._chunks
+
+class HealthStatusTree:
+    """
+    Health keys of a raw status dict indexed by entity and by parent entity,
+    built in one pass over the keys. Key layout is
+    .../<parent component>/<parent id>/.../<component>/<id>/health.
+    An entity is its key path without "/health", ids are unique only under
+    the parent, e.g. rack 1 of site 1 and rack 1 of site 2.
+    """
+
+    def __init__(self, status_dict: dict, components: list):
+        """
+        Args:
+            status_dict (dict): {health key: health value}
+            components (list): Components of the health hierarchy, top first.
+        """
+        self._status_dict = status_dict if status_dict is not None else {}
+        # {entity: key}
+        self._entities: dict = {}
+        # {component: [entity]} in key order
+        self._by_component: dict = {}
+        # {(component, id): [entity]} in key order
+        self._by_id: dict = {}
+        # {parent entity: {component: [entity]}}
+        self._children: dict = {}
+        parents = {components[level]: components[level - 1] for level in range(1, len(components))}
+        for key in self._status_dict:
+            parts = key.split("/")
+            if len(parts) < 3 or parts[-1] != "health" or parts[-3] not in components:
+                continue
+            entity = "/".join(parts[:-1])
+            if entity in self._entities:
+                continue
+            component = parts[-3]
+            self._entities[entity] = key
+            self._by_component.setdefault(component, []).append(entity)
+            self._by_id.setdefault((component, parts[-2]), []).append(entity)
+            parent_component = parents.get(component)
+            for pos in range(len(parts) - 5, -1, -2):
+                if parts[pos] == parent_component:
+                    parent = "/".join(parts[:pos + 2])
+                    self._children.setdefault(parent, {}).setdefault(component, []).append(entity)
+                    break
+
+    def get_key(self, component: str, component_id: str) -> str:
+        """
+        Get health key of the first entity of the component with the id,
+        None if not present.
+        """
+        entity = self.get_entity(component, component_id)
+        return None if entity is None else entity[1]
+
+    def get_entity(self, component: str, component_id: str) -> tuple:
+        """
+        Get (entity, key) of the first entity of the component with the id,
+        None if not present.
+        """
+        entities = self._by_id.get((component, component_id))
+        return (entities[0], self._entities[entities[0]]) if entities else None
+
+    def get_entities(self, component: str, parent: str = None) -> list:
+        """
+        Get [(entity, key)] of the component, all of them if parent is None
+        else only the children of the parent entity.
+        """
+        if parent is None:
+            entities = self._by_component.get(component, [])
+        else:
+            entities = self._children.get(parent, {}).get(component, [])
+        return [(entity, self._entities[entity]) for entity in entities]
+
+    def get_value(self, key: str) -> str:
+        """
+        Get health value of the key.
+        """
+        return self._status_dict[key]
@@ -14,7 +14,7 @@
 # For any questions about this software or licensing,
 # please email opensource@seagate.com or cortx-questions@seagate.com.
 
-import re
+import copy
 import time
 import ast
 import json
@@ -28,7 +28,7 @@ from cortx.utils.conf_store.conf_store import Conf
 from ha.const import _DELIM
 from ha.core.config.config_manager import ConfigManager
 from ha.core.system_health.health_evaluators.element_health_evaluator import ElementHealthEvaluator
-from ha.core.system_health.const import EVENT_SEVERITIES, NODE_MAP_ATTRIBUTES
+from ha.core.system_health.const import EVENT_SEVERITIES, NODE_MAP_ATTRIBUTES, HEALTH_UPDATE_MAX_ATTEMPTS, HEALTH_EVALUATOR_CLASSES
 from ha.core.event_analyzer.subscriber import Subscriber
 from ha.core.system_health.system_health_metadata import SystemHealthComponents, SystemHealthHierarchy
 from ha.core.system_health.model.health_event import HealthEvent
@@ -39,9 +39,12 @@ from ha.core.error import HaSystemHealthException
 from ha.core.system_health.health_evaluator_factory import HealthEvaluatorFactory
 from ha.core.cluster.const import SYSTEM_HEALTH_OUTPUT_V2, GET_SYS_HEALTH_ARGS
 from ha.core.system_health.const import CLUSTER_ELEMENTS, HEALTH_STATUSES
-from ha.core.system_health.model.health_status import StatusOutput, ComponentStatus
+from ha.core.system_health.model.health_status import StatusOutput, ComponentStatus, HealthStatusTree
 from ha.core.system_health.system_health_hierarchy import HealthHierarchy
+from ha.core.system_health.health_history import HealthHistory
+from ha.core.system_health.health_status_index import HealthStatusIndex
 from ha.core.event_manager.resources import RESOURCE_TYPES
+from ha.util.consul_kv_store import ConsulKvCasError, CONSISTENCY_MODES
 
 class SystemHealth(Subscriber):
     """
@@ -58,6 +61,10 @@ class SystemHealth(Subscriber):
         self.statusmapper = StatusMapper()
         # TODO: Convert SystemHealthManager to singleton class
         self.healthmanager = SystemHealthManager(store)
+        self.history = HealthHistory(store)
+        self.status_index = HealthStatusIndex(store)
+        self._store_metrics = store.metrics
+        self._event_metrics = {"events": 0, "json_parses": 0, "store_calls": 0}
         HealthEvaluatorFactory.init_evaluators()
         # TODO: Temporary code remove when all status method moved to evaluators
         self.health_evaluator = HealthEvaluatorFactory.get_generic_evaluator()
@@ -76,11 +83,11 @@ class SystemHealth(Subscriber):
         """
         return ElementHealthEvaluator.prepare_key(component, **kwargs)
 
-    def get_status_raw(self, component: str, component_id: str=None, **kwargs):
+    def get_status_raw(self, component: str, component_id: str=None, consistency: str=None, **kwargs):
         """
         get status method. This is a generic method which can return status of any component(s).
         """
-        return self.health_evaluator.get_status_raw(component, component_id, **kwargs)
+        return self.health_evaluator.get_status_raw(component, component_id, consistency=consistency, **kwargs)
 
     def get_status(self, component: CLUSTER_ELEMENTS = CLUSTER_ELEMENTS.CLUSTER.value, depth: int = 1, version: str = SYSTEM_HEALTH_OUTPUT_V2, **kwargs):
         """
@@ -101,27 +108,7 @@ class SystemHealth(Subscriber):
 
         try:
             Log.debug(f"Get {component} health status version {version} with depth {depth} and filters {kwargs}")
-            component_id = None
-            if GET_SYS_HEALTH_ARGS.ID.value in kwargs and kwargs[GET_SYS_HEALTH_ARGS.ID.value] != "":
-                component_id = kwargs[GET_SYS_HEALTH_ARGS.ID.value]
-
-            # Get the requested component level in the health hierarchy
-            component_level = HealthHierarchy.get_component_level(component)
-            # Set the depth to be returned, check for partial status.
-            self._partial_status = False
-            total_depth = HealthHierarchy.get_total_depth()
-            if depth == 0:
-                depth = total_depth
-            else:
-                depth += component_level - 1 # Decrement by 1 for the component level itself.
-                if depth > HealthHierarchy.get_total_depth():
-                    depth = total_depth
-                    self._partial_status = True
-            Log.debug(f"{component} level {component_level}, depth to return {depth}, total available depth {total_depth}")
-
-            self._id_not_found = False
-            # Get raw status starting from cluster
-            self._status_dict = self.get_status_raw(CLUSTER_ELEMENTS.CLUSTER.value)
+            component_id, component_level, depth = self._prepare_status_query(component, depth, **kwargs)
             # Prepare and return the output
             output = StatusOutput(version)
             self._prepare_status(component, component_id = component_id, start_level = component_level, current_level = component_level, depth = depth, parent = output)
@@ -131,100 +118,171 @@ class SystemHealth(Subscriber):
             if self._id_not_found:
                 output_json = json.dumps({"status": const.STATUSES.FAILED.value, "output": "", "error": "Invalid id"})
             else:
-                output_json = json.dumps({"status": status, "output": json.loads(output.to_json()), "error": ""})
+                output_json = json.dumps({"status": status, "output": output, "error": ""}, default=lambda a: a.__dict__)
             Log.debug(f"Output json {output_json}")
             return output_json
         except Exception as e:
             Log.error(f"Failed reading status. Error: {e}")
             raise HaSystemHealthException("Failed reading status")
 
-    def _prepare_status(self, component, component_id: str = None, start_level: int = 1, current_level: int = 1, depth: int = 1, parent: object = None):
+    def iter_status(self, component: CLUSTER_ELEMENTS = CLUSTER_ELEMENTS.CLUSTER.value, depth: int = 1, version: str = SYSTEM_HEALTH_OUTPUT_V2, **kwargs):
+        """
+        Streaming variant of get_status. Yields the output json in chunks while
+        walking the status tree, so the output is never held in memory as a whole.
+        Status is known only after the walk, so it follows the output:
+            {"output": {"version": ..., "health": [...]}, "status": ..., "error": ""}
+        Joined chunks decode to the same dict as get_status.
+        """
+        try:
+            Log.debug(f"Stream {component} health status version {version} with depth {depth} and filters {kwargs}")
+            component_id, component_level, depth = self._prepare_status_query(component, depth, **kwargs)
+            if component_id is not None and self._status_tree.get_key(component, component_id) is None:
+                yield json.dumps({"status": const.STATUSES.FAILED.value, "output": "", "error": "Invalid id"})
+                return
+            yield f'{{"output": {{"version": {json.dumps(version)}, "health": ['
+            yield from self._iter_status(component, component_id = component_id, start_level = component_level, current_level = component_level, depth = depth)
+            status = const.STATUSES.PARTIAL.value if self._partial_status else const.STATUSES.SUCCEEDED.value
+            yield f']}}, "status": {json.dumps(status)}, "error": ""}}'
+        except Exception as e:
+            Log.error(f"Failed streaming status. Error: {e}")
+            raise HaSystemHealthException("Failed reading status")
+
+    def query_status(self, status: str = None, component: str = None, updated_since: int = None):
+        """
+        Return the components matching all the given filters, read from the status
+        index instead of the health tree.
+        Args:
+            status ([str]): Current health status, e.g. failed.
+            component ([str]): Component, e.g. node.
+            updated_since ([int]): Status updated at or after this timestamp.
+        Returns:
+            ([str]): Json {"status": "Succeeded"/"Failed", "output": [{"resource", "id", "status",
+                "last_updated_time"}], "error": ""}
+        """
+        try:
+            Log.debug(f"Query health status {status} of {component} updated since {updated_since}")
+            output = self.status_index.query(status=status, component=component, updated_since=updated_since)
+            return json.dumps({"status": const.STATUSES.SUCCEEDED.value, "output": output, "error": ""})
+        except Exception as e:
+            Log.error(f"Failed querying status. Error: {e}")
+            raise HaSystemHealthException("Failed querying status")
+
+    def get_changes(self, since: int = 0, timeout: float = None):
+        """
+        Return the components whose status changed after the store index since,
+        waiting (long-poll) till a status changes or timeout seconds are over.
+        Args:
+            since ([int]): Index returned by the previous call, 0 for all the components.
+            timeout ([float]): Seconds to wait for a change, no wait if None or 0.
+        Returns:
+            ([str]): Json {"status": "Succeeded"/"Failed", "output": {"index": index for the next call,
+                "changes": [{"resource", "id", "status", "last_updated_time"}]}, "error": ""}
+                changes is empty if timeout is over without a change.
+        """
+        try:
+            Log.debug(f"Get health status changes since {since} with timeout {timeout}")
+            index, changes = self.status_index.wait_for_changes(since=since, timeout=timeout)
+            return json.dumps({"status": const.STATUSES.SUCCEEDED.value, "output": {"index": index, "changes": changes}, "error": ""})
+        except Exception as e:
+            Log.error(f"Failed reading status changes. Error: {e}")
+            raise HaSystemHealthException("Failed reading status changes")
+
+    def _prepare_status_query(self, component: str, depth: int, **kwargs) -> tuple:
+        """
+        Read the raw status and get (component id, component level, last level to return).
+        Resets the partial status and id not found flags.
+        """
+        component_id = None
+        if GET_SYS_HEALTH_ARGS.ID.value in kwargs and kwargs[GET_SYS_HEALTH_ARGS.ID.value] != "":
+            component_id = kwargs[GET_SYS_HEALTH_ARGS.ID.value]
+
+        # Get the requested component level in the health hierarchy
+        component_level = HealthHierarchy.get_component_level(component)
+        # Set the depth to be returned, check for partial status.
+        self._partial_status = False
+        total_depth = HealthHierarchy.get_total_depth()
+        if depth == 0:
+            depth = total_depth
+        else:
+            depth += component_level - 1 # Decrement by 1 for the component level itself.
+            if depth > HealthHierarchy.get_total_depth():
+                depth = total_depth
+                self._partial_status = True
+        Log.debug(f"{component} level {component_level}, depth to return {depth}, total available depth {total_depth}")
+
+        self._id_not_found = False
+        # Get raw status starting from cluster, slightly stale status is fine
+        # so any consul server can answer the read.
+        status_dict = self.get_status_raw(CLUSTER_ELEMENTS.CLUSTER.value, consistency=CONSISTENCY_MODES.STALE.value)
+        # Index health keys once by component, id and parent.
+        self._status_tree = HealthStatusTree(status_dict, HealthHierarchy.get_schema()["components"])
+        return component_id, component_level, depth
+
+    def _prepare_status(self, component, component_id: str = None, start_level: int = 1, current_level: int = 1, depth: int = 1, parent: object = None, parent_entity: str = None):
         Log.debug(f"Prepare status for component {component}, id {component_id}, level {current_level}, depth {depth}")
-        # At requested level in the hierarchy
-        if current_level == depth:
-            # If request was with depth = 1 and id was provided.
-            if component_id != None:
-                status_key = self._is_status_present(component, component_id = component_id)
-                if status_key is None:
-                    self._id_not_found = True
-                    return
-                component_status = self._prapare_component_status(component, component_id = component_id, key = status_key)
-                parent.add_health(component_status)
-            else:
-                # Prepare and return status for all available components at this level
-                while True:
-                    status_key = self._is_status_present(component)
-                    if status_key == None:
-                        break
-                    component_status = self._prapare_component_status(component, key = status_key)
-                    if current_level == start_level:
-                        parent.add_health(component_status)
-                    else:
-                        parent.add_resource(component_status)
-                    del self._status_dict[status_key]
+        if component_id != None:
+            entity = self._status_tree.get_entity(component, component_id)
+            if entity is None:
+                self._id_not_found = True
+                return
+            entities = [entity]
         else:
-            # Prepare and return status for all available components at this and further levels
-            if component_id != None:
-                status_key = self._is_status_present(component, component_id = component_id)
-                if status_key is None:
-                    self._id_not_found = True
-                    return
-                component_status = self._prapare_component_status(component, component_id = component_id, key = status_key)
+            # All available components at this level, only the children of parent_entity below start level.
+            entities = self._status_tree.get_entities(component, parent_entity)
+            if len(entities) == 0 and current_level != depth:
+                self._partial_status = True
+        for entity, status_key in entities:
+            component_status = self._prapare_component_status(component, key = status_key)
+            if current_level == start_level:
                 parent.add_health(component_status)
-                del self._status_dict[status_key]
+            else:
+                parent.add_resource(component_status)
+            # Prepare status of further levels till requested level in the hierarchy.
+            if current_level != depth:
                 next_components = HealthHierarchy.get_next_components(component)
                 for _, value in enumerate(next_components):
-                    self._prepare_status(value, start_level = start_level, current_level = current_level + 1, depth = depth, parent = component_status)
-            else:
-                # Prepare and return status for all available components at this and further levels
-                found_any_components = False
-                while True:
-                    status_key = self._is_status_present(component)
-                    if status_key == None:
-                        break
-                    found_any_components = True
-                    component_status = self._prapare_component_status(component, key = status_key)
-                    if current_level == start_level:
-                        parent.add_health(component_status)
-                    else:
-                        parent.add_resource(component_status)
-                    del self._status_dict[status_key]
-                    next_components = HealthHierarchy.get_next_components(component)
-                    for _, value in enumerate(next_components):
-                        self._prepare_status(value, start_level = start_level, current_level = current_level + 1, depth = depth, parent = component_status)
-                if found_any_components == False:
-                    self._partial_status = True
-
-    def _is_status_present(self, component, component_id: str = None) -> str:
-        status_key = None
-        if component_id is not None:
-            for key in self._status_dict:
-                if re.search(f"{component}/{component_id}/health", key):
-                    status_key = key
-                    break
+                    self._prepare_status(value, start_level = start_level, current_level = current_level + 1, depth = depth, parent = component_status, parent_entity = entity)
+
+    def _iter_status(self, component, component_id: str = None, start_level: int = 1, current_level: int = 1, depth: int = 1, parent_entity: str = None, opening: str = ""):
+        """
+        Yield the json of the component statuses of the level, comma separated and
+        the first one prefixed by opening, with the further levels nested in
+        "sub_resources" (null if none, like ComponentStatus). Walks the tree in the
+        same order as _prepare_status.
+        Returns True if any component status is yielded.
+        """
+        if component_id != None:
+            entities = [self._status_tree.get_entity(component, component_id)]
         else:
-            for key in self._status_dict:
-                if re.search(f"{component}/.+/health", key):
-                    split_key = re.split("/", key)
-                    if component == split_key[-3]:
-                        status_key = key
-                        break
-        Log.debug(f"Status key {status_key} present for component {component}, id {component_id}")
-        return status_key
+            entities = self._status_tree.get_entities(component, parent_entity)
+            if len(entities) == 0 and current_level != depth:
+                self._partial_status = True
+        for entity, status_key in entities:
+            status = self._prapare_component_status(component, key = status_key)
+            yield f'{opening}{{"resource": {json.dumps(status.resource)}, "id": {json.dumps(status.id)}, ' \
+                  f'"status": {json.dumps(status.status)}, "last_updated_time": {json.dumps(status.last_updated_time)}, "sub_resources": '
+            opening = ", "
+            sub_opening = "["
+            if current_level != depth:
+                for next_component in HealthHierarchy.get_next_components(component):
+                    if (yield from self._iter_status(next_component, start_level = start_level, current_level = current_level + 1, depth = depth, parent_entity = entity, opening = sub_opening)):
+                        sub_opening = ", "
+            yield "null}" if sub_opening == "[" else "]}"
+        return len(entities) > 0
 
     def _prapare_component_status(self, component: str, component_id: str = None, key: str = None) -> object:
             status = HEALTH_STATUSES.UNKNOWN.value
             created_timestamp = HEALTH_STATUSES.UNKNOWN.value
             if key is not None:
-                entity_health = self._status_dict[key]
-                entity_health = json.loads(entity_health)
-                split_key = re.split("/", key)
+                entity_health = self._status_tree.get_value(key)
+                entity_health = EntityHealth.loads(entity_health)
+                split_key = key.split("/")
                 component_id = split_key[-2]
                 status = entity_health["events"][0]["status"]
                 created_timestamp = entity_health['events'][0]['created_timestamp']
 
             component_status = ComponentStatus(component, component_id, status, created_timestamp)
-            Log.debug(f"Component {component}, id {component_id} health status is {component_status.to_json()}")
+            Log.debug(f"Component {component}, id {component_id} health status is {status}, updated at {created_timestamp}")
             return component_status
 
     def get_service_status(self, service_type=None, node_id=None):
@@ -245,7 +303,7 @@ class SystemHealth(Subscriber):
                 key = self._prepare_key(component='node', cluster_id=node_map_dict[NODE_MAP_ATTRIBUTES.CLUSTER_ID.value],
                                         site_id=node_map_dict[NODE_MAP_ATTRIBUTES.SITE_ID.value], rack_id=node_map_dict[NODE_MAP_ATTRIBUTES.RACK_ID.value],
                                         storageset_id=node_map_dict[NODE_MAP_ATTRIBUTES.STORAGESET_ID.value], node_id=node_id, **kwargs)
-                node_health_dict = json.loads(self.healthmanager.get_key(key))
+                node_health_dict = EntityHealth.loads(self.healthmanager.get_key(key))
                 node_status = {"status": node_health_dict['events'][0]['status'],
                                "created_timestamp": node_health_dict['events'][0]['created_timestamp']}
                 return node_status
@@ -267,24 +325,38 @@ class SystemHealth(Subscriber):
         """
         pass
 
-    def _is_update_required(self, current_health: str, updated_health: str, event: HealthEvent) -> bool:
+    def get_history(self, component: str, component_id: str, since: int=None, **kwargs) -> list:
+        """
+        Get event history of a component, latest first.
+
+        Args:
+            component (str): Component, e.g. node.
+            component_id (str): Component id.
+            since (int): Only events created at or after this timestamp.
+            kwargs: ids of the ancestors, e.g. cluster_id, site_id, rack_id.
+
+        Returns:
+            list: [{"event_timestamp", "created_timestamp", "status", "specific_info"}]
+        """
+        key = self._prepare_key(component, comp_id=component_id, **kwargs)
+        return self.history.get_events(key, since=since)
+
+    def _is_update_required(self, current_status: str, new_status: str, event: HealthEvent) -> bool:
         """
         Check if update is needed for system health.
 
         Args:
-            current_health (dict): current health.
+            current_status (str): current health status, None if health is not stored.
+            new_status (str): health status to be updated.
             healthevent (HealthEvent): health event object.
 
         Returns:
             bool: return true if update is needed.
         """
-        if not current_health:
+        if current_status is None:
             return True
         is_needed: bool = True
-        old_health = json.loads(current_health)
-        new_health = json.loads(updated_health)
-        old_status = old_health["events"][0]["status"]
-        new_status = new_health["events"][0]["status"]
+        old_status = current_status
 
         # Common cases
         if old_status == new_status:
@@ -298,18 +370,23 @@ class SystemHealth(Subscriber):
             is_needed = False
         return is_needed
 
-    def publish_event(self, healthevent: HealthEvent, healthvalue: str= ""):
+    def publish_event(self, healthevent: HealthEvent, healthvalue: str= "", status: str = None):
         """
-        Produce event
+        Produce event. Status is read from the health value if not given.
         """
-        healthevent.event_type = json.loads(healthvalue).get("events")[0]["status"]
+        healthevent.event_type = status if status is not None else EntityHealth.loads(healthvalue).get("events")[0]["status"]
         node_id = healthevent.node_id
         self.producer.publish(str(healthevent))
         healthevent.node_id = node_id
 
-    def _update(self, healthevent: HealthEvent, healthvalue: str, next_component: str=None):
+    def _update(self, healthevent: HealthEvent, healthvalue: str, next_component: str=None, index: int=0, status: str=None,
+                history_event: EntityEvent=None, old_status: str=None, pending_parents: dict=None) -> int:
         """
         update method. This is an internal method for updating the system health.
+        Value is written only if the key is not modified after index, returns the new index.
+        history_event (the event written) is appended to the history and the component is
+        moved from old_status to status in the status index, in the same write.
+        next_component is queued in pending_parents of the batch for evaluation.
         """
         component = SystemHealthComponents.get_component(healthevent.resource_type)
         comp_type = healthevent.resource_type.split(':')[-1]
@@ -319,22 +396,89 @@ class SystemHealth(Subscriber):
                                 rack_id=self.node_map['rack_id'], storageset_id=self.node_map['storageset_id'],
                                 node_id=self.node_id, server_id=self.node_id, storage_id=self.node_id,
                                 comp_type=comp_type, comp_id=comp_id)
-        is_key_exists = self.healthmanager.key_exists(key)
-        self.healthmanager.set_key(key, healthvalue)
-        if is_key_exists:
-            self.publish_event(healthevent, healthvalue)
-
-        # Check the next component to be updated, if none then return.
-        if next_component is None:
-            Log.info(f"SystemHealth: Updated status for {component}:{comp_type}:{comp_id}")
-            return
+        if status is None:
+            status = EntityHealth.loads(healthvalue).get("events")[0]["status"]
+        timestamp = history_event.created_timestamp if history_event is not None else str(int(time.time()))
+        extra_entries, delete_keys = self.status_index.get_changes(key, component, old_status, status, timestamp)
+        extra_entries = [(index_key, value, None) for index_key, value in extra_entries]
+        if history_event is not None and self.history.is_enabled():
+            entry_key, entry_value = self.history.get_entry(key, history_event)
+            extra_entries.append((entry_key, entry_value, 0))
+        if next_component in HEALTH_EVALUATOR_CLASSES.ELEMENT_MAP and \
+            HealthHierarchy.get_next_components(next_component) == [component]:
+            # Keep the children status of the parent in the same write.
+            new_index = self._update_with_child_status(key, healthvalue, index, component, comp_id, next_component, status,
+                                                       extra_entries, delete_keys)
         else:
-            Log.info(f"SystemHealth: Updated status for {component}:{comp_type}:{comp_id}")
-            Log.info(f"Updating element {next_component} status")
-            element = HealthEvaluatorFactory.get_element_evaluator(next_component)
-            new_event = element.evaluate_status(healthevent)
-            self.process_event(new_event)
-            return
+            new_index = self.healthmanager.set_keys([(key, healthvalue, index)] + extra_entries, delete_keys)
+        if index:
+            self.publish_event(healthevent, healthvalue, status=status)
+
+        Log.info(f"SystemHealth: Updated status for {component}:{comp_type}:{comp_id}")
+        # Status of the next component is evaluated after the events of the batch.
+        if next_component is not None and pending_parents is not None:
+            self._add_pending_parent(pending_parents, next_component, healthevent)
+        return new_index
+
+    def _add_pending_parent(self, pending_parents: dict, parent: str, healthevent: HealthEvent):
+        """
+        Queue evaluation of the parent of the updated component, once per parent.
+        The latest child event is kept, evaluation reads only its ids.
+        pending_parents is {parent health key: (hierarchy depth, parent component, child event)}.
+        """
+        key = self._prepare_key(parent, cluster_id=healthevent.cluster_id, site_id=healthevent.site_id,
+                                rack_id=healthevent.rack_id, storageset_id=healthevent.storageset_id,
+                                node_id=healthevent.node_id, server_id=healthevent.node_id,
+                                storage_id=healthevent.node_id)
+        # Deeper components have longer update hierarchy and are evaluated first.
+        depth = len(SystemHealthHierarchy.get_hierarchy(parent))
+        pending_parents[key] = (depth, parent, copy.copy(healthevent))
+
+    def _propagate(self, pending_parents: dict):
+        """
+        Evaluate the queued parents deepest first, every parent once. Evaluated
+        status is written only if changed, which queues its own parent, so
+        propagation stops at the first unchanged level. Every parent is evaluated
+        even if an earlier one failed, first failure is raised after.
+        """
+        error = None
+        while pending_parents:
+            key = max(pending_parents, key=lambda pending_key: pending_parents[pending_key][0])
+            _, parent, healthevent = pending_parents.pop(key)
+            Log.info(f"Updating element {parent} status")
+            try:
+                element = HealthEvaluatorFactory.get_element_evaluator(parent)
+                self._process_event_with_retry(element.evaluate_status(healthevent), pending_parents)
+            except HaSystemHealthException as e:
+                error = error or e
+            except Exception as e:
+                Log.error(f"Failed evaluating {parent} status with Error: {e}")
+                error = error or HaSystemHealthException(f"Failed evaluating {parent} status")
+        if error is not None:
+            raise error
+
+    def _update_with_child_status(self, key: str, healthvalue: str, index: int, component: str,
+                                  comp_id: str, parent: str, status: str, extra_entries: list=None,
+                                  delete_keys: list=None) -> int:
+        """
+        Write the health of component and its status in the children status
+        of the parent atomically, along with extra_entries [(key, value, index)]
+        and deletion of delete_keys. Returns the new index of the health key.
+        """
+        element = HealthEvaluatorFactory.get_element_evaluator(parent)
+        parent_id = self.node_map[f"{parent}_id"]
+        ancestor_ids = {f"{comp}_id": self.node_map[f"{comp}_id"]
+                        for comp in SystemHealthHierarchy.get_hierarchy(parent)[1:]}
+        child_status_key = element.get_child_status_key(parent, parent_id, **ancestor_ids)
+        child_status, child_status_index = element.read_child_status(parent, parent_id, **ancestor_ids)
+        old_status = child_status.setdefault(component, {}).get(comp_id)
+        child_status[component][comp_id] = status
+        new_index = self.healthmanager.set_keys([(key, healthvalue, index),
+                                                 (child_status_key, json.dumps(child_status), child_status_index)] +
+                                                (extra_entries or []), delete_keys)
+        element.update_child_status_counts(child_status_key, new_index, child_status_index, component,
+                                           old_status, status, child_status)
+        return new_index
 
     @staticmethod
     def create_updated_event_object(event_timestamp: str, current_timestamp: str, status: str, spec_info: dict, updated_health: EntityHealth) -> str:
@@ -355,103 +499,186 @@ class SystemHealth(Subscriber):
         updated_health = EntityHealth.write(updated_health)
         return updated_health
 
-    def _check_and_update(self, current_health: str, updated_health: str, healthevent: HealthEvent, next_component: str) -> None:
+    def _check_and_update(self, current_status: str, updated_health: str, new_status: str, healthevent: HealthEvent, next_component: str, index: int=0,
+                          history_event: EntityEvent=None, pending_parents: dict=None) -> int:
         # Update in the store.
-        if self._is_update_required(current_health, updated_health, healthevent):
-            self._update(healthevent, updated_health, next_component=next_component)
+        if self._is_update_required(current_status, new_status, healthevent):
+            return self._update(healthevent, updated_health, next_component=next_component, index=index, status=new_status,
+                                history_event=history_event, old_status=current_status, pending_parents=pending_parents)
+        return index
+
+    def get_event_metrics(self) -> dict:
+        """
+        Get health values parsed and store calls per processed event,
+        including the parent components updated for the event.
+        """
+        metrics = dict(self._event_metrics)
+        events = metrics["events"]
+        metrics["json_parses_per_event"] = round(metrics["json_parses"] / events, 2) if events else 0
+        metrics["store_calls_per_event"] = round(metrics["store_calls"] / events, 2) if events else 0
+        return metrics
 
     def process_event(self, healthevent: HealthEvent):
         """
         Process Event method. This method could be called for updating the health status.
+        Health is updated with compare and swap, if the health is modified by someone else
+        (e.g. other HA pod) in between then the event is processed again on the latest health.
         """
+        self.process_events([healthevent])
 
-        # TODO: Check the user and see if allowed to update the system health.
+    def process_events(self, healthevents: list):
+        """
+        Process a batch of events, parent components of the updated ones are
+        evaluated once after all the events, level by level. Every event is
+        processed even if an earlier one failed, first failure is raised after.
+        """
+        parse_count = EntityHealth.get_thread_parse_count()
+        store_calls = self._store_metrics.get_thread_calls()
+        error = None
+        # Parents of the batch to be evaluated, local as watcher threads share SystemHealth.
+        pending_parents = {}
         try:
-            status = self.statusmapper.map_event(healthevent.event_type)
-            component = SystemHealthComponents.get_component(healthevent.resource_type)
+            for healthevent in healthevents:
+                try:
+                    self._process_event_with_retry(healthevent, pending_parents)
+                except HaSystemHealthException as e:
+                    error = error or e
+            try:
+                self._propagate(pending_parents)
+            except HaSystemHealthException as e:
+                error = error or e
+        finally:
+            json_parses = EntityHealth.get_thread_parse_count() - parse_count
+            store_calls = self._store_metrics.get_thread_calls() - store_calls
+            self._event_metrics["events"] += len(healthevents)
+            self._event_metrics["json_parses"] += json_parses
+            self._event_metrics["store_calls"] += store_calls
+            Log.debug(f"SystemHealth: {len(healthevents)} events processed with {store_calls} store calls and {json_parses} json parses")
+        if error is not None:
+            raise error
+
+    def _process_event_with_retry(self, healthevent: HealthEvent, pending_parents: dict):
+        """
+        Process the event, retry if the health is modified concurrently.
+        Parents of the updated component are queued in pending_parents.
+        """
 
-            # Get the health update hierarchy
-            self.update_hierarchy = SystemHealthHierarchy.get_hierarchy(component)
-            if (len(self.update_hierarchy) - 1) > self.update_hierarchy.index(component):
-                next_component = self.update_hierarchy[self.update_hierarchy.index(component) + 1]
-            else:
-                next_component = None
-
-            # Get the component type and id received in the event.
-            component_type = healthevent.resource_type.split(':')[-1]
-            component_id = healthevent.resource_id
-            Log.info(f"SystemHealth: Processing {component}:{component_type}:{component_id} with status {status}")
-
-            # Update the node map
-            self.node_id = healthevent.node_id
-            self.node_map = {'cluster_id':healthevent.cluster_id, 'site_id':healthevent.site_id,
-                             'rack_id':healthevent.rack_id, 'storageset_id':healthevent.storageset_id}
-
-            # Read the currently stored health value
-            current_health = self.get_status_raw(component, component_id, comp_type=component_type,
-                                        cluster_id=healthevent.cluster_id, site_id=healthevent.site_id,
-                                        rack_id=healthevent.rack_id, storageset_id=healthevent.storageset_id,
-                                        node_id=healthevent.node_id, server_id=healthevent.node_id,
-                                        storage_id=healthevent.node_id)
-
-            current_timestamp = str(int(time.time()))
-            if current_health:
-                current_health_dict = json.loads(current_health)
-                specific_info = current_health_dict["events"][0]["specific_info"]
-                if current_health and specific_info:
-                    # If health is already stored and its a node_health, check further
-                    stored_genration_id = current_health_dict["events"][0]["specific_info"]["generation_id"]
-                    incoming_generation_id = healthevent.specific_info["generation_id"]
-                    incoming_health_status = current_health_dict["events"][0]["status"]
-                    pod_restart_val = current_health_dict["events"][0]["specific_info"]["pod_restart"]
-                    # Update the current health value itself.
-                    latest_health = EntityHealth.read(current_health)
-                    if stored_genration_id != incoming_generation_id:
-                        if incoming_health_status == status:
-                            # If the generation id matches and stored node health matches
-                            # with incoming node health, means online event received first
-                            # instead of failed event in delete scenario
+        # TODO: Check the user and see if allowed to update the system health.
+        event_snapshot = copy.copy(healthevent)
+        # Writes of the event that succeeded, a retry continues after them.
+        written_steps = set()
+        for attempt in range(1, HEALTH_UPDATE_MAX_ATTEMPTS + 1):
+            try:
+                self._process_event(healthevent, pending_parents, written_steps)
+                return
+            except ConsulKvCasError as err:
+                Log.warn(f"Health modified concurrently, attempt {attempt} of {HEALTH_UPDATE_MAX_ATTEMPTS}. Error: {err}")
+                healthevent = copy.copy(event_snapshot)
+            except Exception as err:
+                Log.error(f"Failed processing system health event with Error: {err}")
+                raise HaSystemHealthException("Failed processing system health event")
+        Log.error(f"Failed processing system health event, health modified concurrently {HEALTH_UPDATE_MAX_ATTEMPTS} times")
+        raise HaSystemHealthException("Failed processing system health event")
+
+    def _process_event(self, healthevent: HealthEvent, pending_parents: dict, written_steps: set = None):
+        """
+        Read the current health with its modify index once, and update it for the event
+        with one conditional write. Health is parsed once and carried through.
+        written_steps holds the writes of the event done by earlier attempts,
+        they are not repeated.
+        """
+        if written_steps is None:
+            written_steps = set()
+        status = self.statusmapper.map_event(healthevent.event_type)
+        component = SystemHealthComponents.get_component(healthevent.resource_type)
+
+        # Get the health update hierarchy
+        self.update_hierarchy = SystemHealthHierarchy.get_hierarchy(component)
+        if (len(self.update_hierarchy) - 1) > self.update_hierarchy.index(component):
+            next_component = self.update_hierarchy[self.update_hierarchy.index(component) + 1]
+        else:
+            next_component = None
+
+        # Get the component type and id received in the event.
+        component_type = healthevent.resource_type.split(':')[-1]
+        component_id = healthevent.resource_id
+        Log.info(f"SystemHealth: Processing {component}:{component_type}:{component_id} with status {status}")
+
+        # Update the node map
+        self.node_id = healthevent.node_id
+        self.node_map = {'cluster_id':healthevent.cluster_id, 'site_id':healthevent.site_id,
+                         'rack_id':healthevent.rack_id, 'storageset_id':healthevent.storageset_id}
+
+        # Read the currently stored health value and its modify index
+        key = self._prepare_key(component, comp_id=component_id, comp_type=component_type,
+                                cluster_id=healthevent.cluster_id, site_id=healthevent.site_id,
+                                rack_id=healthevent.rack_id, storageset_id=healthevent.storageset_id,
+                                node_id=healthevent.node_id, server_id=healthevent.node_id,
+                                storage_id=healthevent.node_id)
+        current_health, current_index = self.healthmanager.get_key_with_index(key)
+
+        current_timestamp = str(int(time.time()))
+        if current_health:
+            current_health_dict = EntityHealth.loads(current_health)
+            current_status = current_health_dict["events"][0]["status"]
+            specific_info = current_health_dict["events"][0]["specific_info"]
+            # Update the current health value itself.
+            latest_health = EntityHealth.read(current_health_dict)
+            if specific_info:
+                # If health is already stored and its a node_health, check further
+                stored_genration_id = specific_info["generation_id"]
+                incoming_generation_id = healthevent.specific_info["generation_id"]
+                pod_restart_val = specific_info["pod_restart"]
+                # The "failed" event of a restarted pod is written, only its "online" event is left.
+                failed_written = "pod_restart_failed" in written_steps
+                if failed_written or stored_genration_id != incoming_generation_id:
+                    if failed_written or current_status == status:
+                        # If the generation id matches and stored node health matches
+                        # with incoming node health, means online event received first
+                        # instead of failed event in delete scenario
+                        if not failed_written:
                             healthevent.specific_info = {"generation_id": stored_genration_id, "pod_restart": 1}
                             healthevent.event_type = "failed"
                             updated_health = SystemHealth.create_updated_event_object(healthevent.timestamp, current_timestamp, healthevent.event_type, healthevent.specific_info, latest_health)
                             # Create a "failed" event and update it in system health and publish
-                            self._check_and_update(current_health, updated_health, healthevent, next_component)
-                            current_health = updated_health
-                            # Now create an "online" event and update it in system health and publish
-                            healthevent.specific_info = {"generation_id": incoming_generation_id, "pod_restart": 1}
-                            healthevent.event_type = "online"
-                            updated_health = SystemHealth.create_updated_event_object(healthevent.timestamp, current_timestamp, healthevent.event_type, healthevent.specific_info, latest_health)
-                            self._check_and_update(current_health, updated_health, healthevent, next_component)
-                        elif pod_restart_val is not None and pod_restart_val:
-                            # Check the pod_restart value assosciated with Node, if its 1,
-                            # means this alert is already updated. No need to send the alert again.
-                            # Just need to reset the pod_restart value
-                            key = self._prepare_key(component, cluster_id=self.node_map['cluster_id'], \
-                                site_id=self.node_map['site_id'], rack_id=self.node_map['rack_id'], \
-                                node_id=self.node_id)
-                            latest_health_dict = json.loads(current_health)
-                            new_spec_info = {"generation_id": stored_genration_id, "pod_restart": 0}
-                            latest_health_dict["events"][0]["specific_info"] = new_spec_info
-                            updated_health = EntityHealth.write(latest_health_dict)
-                            self.healthmanager.set_key(key, updated_health)
-                    else:
-                        # current health is there and generation id is also already present.
-                        # That means its a normal failure scenario
-                        updated_health = SystemHealth.create_updated_event_object(healthevent.timestamp, current_timestamp, status, healthevent.specific_info, latest_health)
-                        self._check_and_update(current_health, updated_health, healthevent, next_component)
+                            current_index = self._check_and_update(current_status, updated_health, healthevent.event_type, healthevent, next_component, current_index,
+                                                                   latest_health.get_latest_event(), pending_parents)
+                            written_steps.add("pod_restart_failed")
+                            current_status = healthevent.event_type
+                        # Now create an "online" event and update it in system health and publish
+                        healthevent.specific_info = {"generation_id": incoming_generation_id, "pod_restart": 1}
+                        healthevent.event_type = "online"
+                        updated_health = SystemHealth.create_updated_event_object(healthevent.timestamp, current_timestamp, healthevent.event_type, healthevent.specific_info, latest_health)
+                        self._check_and_update(current_status, updated_health, healthevent.event_type, healthevent, next_component, current_index,
+                                               latest_health.get_latest_event(), pending_parents)
+                    elif pod_restart_val is not None and pod_restart_val:
+                        # Check the pod_restart value assosciated with Node, if its 1,
+                        # means this alert is already updated. No need to send the alert again.
+                        # Just need to reset the pod_restart value
+                        key = self._prepare_key(component, cluster_id=self.node_map['cluster_id'], \
+                            site_id=self.node_map['site_id'], rack_id=self.node_map['rack_id'], \
+                            node_id=self.node_id)
+                        new_spec_info = {"generation_id": stored_genration_id, "pod_restart": 0}
+                        current_health_dict["events"][0]["specific_info"] = new_spec_info
+                        updated_health = EntityHealth.write(current_health_dict)
+                        self.healthmanager.set_key(key, updated_health, index=current_index)
                 else:
-                    # Update hierachical components. such as site, rack
-                    latest_health = EntityHealth.read(current_health)
+                    # current health is there and generation id is also already present.
+                    # That means its a normal failure scenario
                     updated_health = SystemHealth.create_updated_event_object(healthevent.timestamp, current_timestamp, status, healthevent.specific_info, latest_health)
-                    self._check_and_update(current_health, updated_health, healthevent, next_component)
+                    self._check_and_update(current_status, updated_health, status, healthevent, next_component, current_index,
+                                           latest_health.get_latest_event(), pending_parents)
             else:
-                # Health value not present in the store currently, create now.
-                latest_health = EntityHealth()
+                # Update hierachical components. such as site, rack
                 updated_health = SystemHealth.create_updated_event_object(healthevent.timestamp, current_timestamp, status, healthevent.specific_info, latest_health)
-                self._check_and_update(current_health, updated_health, healthevent, next_component)
-        except Exception as err:
-            Log.error(f"Failed processing system health event with Error: {err}")
-            raise HaSystemHealthException("Failed processing system health event")
+                self._check_and_update(current_status, updated_health, status, healthevent, next_component, current_index,
+                                           latest_health.get_latest_event(), pending_parents)
+        else:
+            # Health value not present in the store currently, create now.
+            latest_health = EntityHealth()
+            updated_health = SystemHealth.create_updated_event_object(healthevent.timestamp, current_timestamp, status, healthevent.specific_info, latest_health)
+            self._check_and_update(None, updated_health, status, healthevent, next_component, current_index,
+                                   latest_health.get_latest_event(), pending_parents)
 
     def get_health_event_template(self, nodeid: str, event_type: str) -> dict:
         """
@@ -22,6 +22,11 @@ from cortx.utils.log import Log
 class HealthHierarchy:
 
     SCHEMA = None
+    # Indexes of the schema components, built once with the schema.
+    # {component: level}
+    LEVELS = None
+    # {component: [next component]}, lists are shared and must not be modified.
+    NEXT_COMPONENTS = None
 
     @staticmethod
     def get_schema():
@@ -33,15 +38,23 @@ class HealthHierarchy:
                 HealthHierarchy.SCHEMA = json.load(fi)
         return HealthHierarchy.SCHEMA
 
+    @staticmethod
+    def _get_index() -> tuple:
+        """
+        Get (LEVELS, NEXT_COMPONENTS) of the schema.
+        """
+        if HealthHierarchy.LEVELS is None:
+            components = HealthHierarchy.get_schema()["components"]
+            HealthHierarchy.NEXT_COMPONENTS = {value: components[count + 1: count + 2]
+                                               for count, value in enumerate(components)}
+            HealthHierarchy.LEVELS = {value: count + 1 for count, value in enumerate(components)}
+        return HealthHierarchy.LEVELS, HealthHierarchy.NEXT_COMPONENTS
+
     @staticmethod
     def get_component_level(component: str) -> int:
         component_level = 0
         try:
-            schema = HealthHierarchy.get_schema()
-            components = schema["components"]
-            for count, value in enumerate(components):
-                if value == component:
-                    component_level = count + 1
+            component_level = HealthHierarchy._get_index()[0].get(component, 0)
         except Exception as e:
             Log.error(f"Failed to fetch component level. Error: {e}")
 
@@ -54,9 +67,7 @@ class HealthHierarchy:
     def get_total_depth() -> int:
         total_depth = 0
         try:
-            schema = HealthHierarchy.get_schema()
-            components = schema["components"]
-            total_depth = len(components)
+            total_depth = len(HealthHierarchy._get_index()[0])
         except Exception as e:
             Log.error(f"Failed to fetch total depth. Error: {e}")
 
@@ -67,14 +78,8 @@ class HealthHierarchy:
 
     @staticmethod
     def get_next_components(component: str) -> list:
-        next_components = []
         try:
-            schema = HealthHierarchy.get_schema()
-            components = schema["components"]
-            for count, value in enumerate(components):
-                if value == component:
-                    if count < (len(components) -1 ):
-                        next_components.append(components[count + 1])
+            return HealthHierarchy._get_index()[1].get(component, [])
         except Exception as e:
             Log.error(f"Failed fetching next component. Error: {e}")
-        return next_components
\ No newline at end of file
+        return []
@@ -14,27 +14,191 @@
 # For any questions about this software or licensing,
 # please email opensource@seagate.com or cortx-questions@seagate.com.
 
-#from cortx.utils.log import Log
-#from cortx.utils.kv_store.kv_payload import KvPayload
-#from ha import const
-#from ha.core.system_health.model.health_event import HealthEvent
-#from ha.core.system_health.system_health import SystemHealth
+"""
+Bulk initialization of the system health of a cluster from a health view schema.
+
+Schema is nested by the components of the health hierarchy, entities without
+"status" start online (inserted):
+    {"cluster": [{"id": "c1", "site": [{"id": "1", "rack": [{"id": "1",
+        "node": [{"id": "n1"}, {"id": "n2", "status": "offline"}]}]}]}]}
+"""
+
+import json
+import time
+from collections import Counter
+
+from cortx.utils.log import Log
+from ha import const
+from ha.core.system_health.const import HEALTH_EVENTS
+from ha.core.system_health.health_evaluator_factory import HealthEvaluatorFactory
+from ha.core.system_health.health_evaluators.element_health_evaluator import ElementHealthEvaluator
+from ha.core.system_health.health_history import HealthHistory
+from ha.core.system_health.health_status_index import HealthStatusIndex
+from ha.core.system_health.model.entity_health import EntityEvent, EntityAction, EntityHealth
+from ha.core.system_health.status_mapper import StatusMapper
+from ha.core.system_health.system_health_hierarchy import HealthHierarchy
+from ha.core.system_health.system_health_manager import SystemHealthManager
+from ha.util.consul_kv_store import ConsulKvStore
 
 class SystemHealthInitiator:
     """
     System Health Initiator. This class provides an initiator for system health
-    which could be called for initiating a system health for a node.
+    which could be called for initiating a system health for a cluster or a node.
+    The whole tree is evaluated in memory, parents with the rules of their health
+    evaluators, and written with batched transactions instead of processing an
+    event per entity. Health already stored is kept and counted in the parents.
     """
 
-    def __init__(self):
+    def __init__(self, store: ConsulKvStore):
         """
         Init method.
         """
-        #self.system_health = SystemHealth()
-        pass
+        self.healthmanager = SystemHealthManager(store)
+        self.statusmapper = StatusMapper()
+        self.history = HealthHistory(store)
+        self.status_index = HealthStatusIndex(store)
+        HealthEvaluatorFactory.init_evaluators()
 
-    def process_schema(self, filename: str):
-        # TODO: Read the health view schema file. Convert the same into the KvPayLoad.
-        # Create HealthEvent object and call process_event for every entity within the health view schema file.
-        # self.system_health.process_event(healthevent)
-        pass
\ No newline at end of file
+    def process_schema(self, filename: str) -> dict:
+        """
+        Initialize the system health from the health view schema file.
+        Refer process for the result.
+        """
+        with open(filename) as schema_file:
+            schema = json.load(schema_file)
+        return self.process(schema)
+
+    def process(self, schema: dict) -> dict:
+        """
+        Initialize the system health from the health view schema. Every entity is
+        written with cas, a transaction failing on a concurrent update raises
+        ConsulKvCasError and the schema can be processed again.
+        Events are not published for the initial health.
+
+        Return:
+            dict: {"created": entities, "updated": parents, "unchanged": entities, "transactions": count}
+        """
+        components = HealthHierarchy.get_schema()["components"]
+        timestamp = str(int(time.time()))
+        result = {"created": 0, "updated": 0, "unchanged": 0, "transactions": 0}
+        # [([(key, value, index)], [delete key])] written atomically per entity, children first.
+        writes: list = []
+        for entity in schema.get(components[0], []):
+            stored = self._read_tree(components[0], str(entity["id"]))
+            self._evaluate(components, 0, entity, {}, timestamp, stored, writes, result)
+        self._write(writes, result)
+        Log.info(f"Initialized system health: {result}")
+        return result
+
+    def _read_tree(self, component: str, entity_id: str) -> dict:
+        """
+        Read the stored health of the entity and its descendants with one read.
+
+        Return:
+            dict: {health key: health value}
+        """
+        key = ElementHealthEvaluator.prepare_key(component, comp_id=entity_id)
+        stored = self.healthmanager.get_key(key.rsplit("/", 1)[0], just_value=False) or {}
+        prefix = HealthStatusIndex.HEALTH_PREFIX.strip("/")
+        return {"/" + stored_key[stored_key.find(prefix):]: value for stored_key, value in stored.items()}
+
+    def _evaluate(self, components: list, level: int, entity: dict, ids: dict, timestamp: str,
+                  stored: dict, writes: list, result: dict) -> str:
+        """
+        Evaluate the entity at level of the hierarchy and add the writes of its
+        subtree. Returns status of the entity.
+        """
+        component = components[level]
+        entity_id = str(entity["id"])
+        ids = dict(ids, **{f"{component}_id": entity_id})
+        key = ElementHealthEvaluator.prepare_key(component, comp_id=entity_id, **ids)
+        if level == len(components) - 1:
+            if key in stored:
+                result["unchanged"] += 1
+                return EntityHealth.loads(stored[key])["events"][0]["status"]
+            status = entity.get("status", self.statusmapper.map_event(HEALTH_EVENTS.INSERTION.value))
+            writes.append(self._get_health_writes(key, component, None, 0, status, timestamp))
+            result["created"] += 1
+            return status
+
+        child = components[level + 1]
+        child_status_key = ElementHealthEvaluator.get_child_status_key(component, entity_id, **ids)
+        value, child_status_index = self.healthmanager.get_key_with_index(child_status_key)
+        # Children stored earlier but not in the schema are kept.
+        child_status = json.loads(value) if value else {}
+        new_child_status = {comp: dict(child_ids) for comp, child_ids in child_status.items()}
+        for child_entity in entity.get(child, []):
+            new_child_status.setdefault(child, {})[str(child_entity["id"])] = \
+                self._evaluate(components, level + 1, child_entity, ids, timestamp, stored, writes, result)
+        counts = {comp: Counter(child_ids.values()) for comp, child_ids in new_child_status.items()}
+        counts.setdefault(child, Counter())
+        evaluator = HealthEvaluatorFactory.get_element_evaluator(component)
+        status = self.statusmapper.map_event(evaluator.check_rules(counts))
+
+        key_values: list = []
+        delete_keys: list = []
+        current_status = None
+        if key in stored:
+            current_health, health_index = self.healthmanager.get_key_with_index(key)
+            current_status = EntityHealth.loads(current_health)["events"][0]["status"] if current_health else None
+        if current_status != status:
+            if current_status is None:
+                key_values, delete_keys = self._get_health_writes(key, component, None, 0, status, timestamp)
+                result["created"] += 1
+            else:
+                key_values, delete_keys = self._get_health_writes(key, component, current_health, health_index,
+                                                                  status, timestamp)
+                result["updated"] += 1
+        else:
+            result["unchanged"] += 1
+        if new_child_status != child_status:
+            key_values.append((child_status_key, json.dumps(new_child_status), child_status_index))
+        if key_values:
+            writes.append((key_values, delete_keys))
+        return status
+
+    def _get_health_writes(self, key: str, component: str, current_health: str, index: int,
+                           status: str, timestamp: str) -> tuple:
+        """
+        Get writes of the health with a new event of status, with its status index
+        and history changes.
+
+        Return:
+            tuple: ([(key, value, index)], [delete key])
+        """
+        current_status = None
+        if current_health:
+            health_dict = EntityHealth.loads(current_health)
+            current_status = health_dict["events"][0]["status"]
+            health = EntityHealth.read(health_dict)
+        else:
+            health = EntityHealth()
+        event = EntityEvent(timestamp, timestamp, status)
+        health.add_event(event)
+        health.set_action(EntityAction(timestamp, const.ACTION_STATUS.PENDING.value))
+        key_values = [(key, EntityHealth.write(health), index)]
+        index_updates, delete_keys = self.status_index.get_changes(key, component, current_status, status, timestamp)
+        key_values.extend((index_key, value, None) for index_key, value in index_updates)
+        if self.history.is_enabled():
+            entry_key, entry_value = self.history.get_entry(key, event)
+            key_values.append((entry_key, entry_value, 0))
+        return key_values, delete_keys
+
+    def _write(self, writes: list, result: dict):
+        """
+        Write the entities in transactions of at most TXN_MAX_OPERATIONS
+        operations, writes of an entity are kept in one transaction.
+        """
+        key_values: list = []
+        delete_keys: list = []
+        for entity_key_values, entity_delete_keys in writes:
+            if len(key_values) + len(delete_keys) + len(entity_key_values) + len(entity_delete_keys) > \
+                ConsulKvStore.TXN_MAX_OPERATIONS:
+                self.healthmanager.set_keys(key_values, delete_keys)
+                result["transactions"] += 1
+                key_values, delete_keys = [], []
+            key_values.extend(entity_key_values)
+            delete_keys.extend(entity_delete_keys)
+        if key_values or delete_keys:
+            self.healthmanager.set_keys(key_values, delete_keys)
+            result["transactions"] += 1
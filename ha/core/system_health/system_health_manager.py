@@ -14,6 +14,8 @@
 # For any questions about this software or licensing,
 # please email opensource@seagate.com or cortx-questions@seagate.com.
 
+from ha.util.consul_kv_store import TXN_OPERATIONS, ConsulKvTxnError, ConsulKvCasError
+
 class SystemHealthManager:
     """
     System Health Manager. This class provides low level get/put methods
@@ -26,25 +28,65 @@ class SystemHealthManager:
         """
         self._store = store
 
-    def get_key(self, key: str, just_value=True):
+    def get_key(self, key: str, just_value=True, consistency: str=None):
         """
-        Get key method.
+        Get key method. If just_value is True only the exact key is read,
+        else all keys with the matching prefix are returned.
+        consistency is the store read consistency mode, store default if None.
         """
-        key_val = self._store.get(key)
+        key_val = self._store.get(key, recurse=not just_value, consistency=consistency)
         if just_value:
             if key_val is not None:
                 _, value = key_val.popitem()
                 return value
         return key_val
 
-    def set_key(self, key: str, value: str):
+    def get_keys(self, key: str, separator: str=None, consistency: str=None) -> list:
         """
-        Set key method.
+        List keys with the matching prefix without reading their values.
         """
-        if self._store.key_exists(key):
-            self._store.update(key=key, new_val=value)
-        else:
-            self._store.set(key=key, val=value)
+        return self._store.get_keys(key, separator=separator, consistency=consistency)
+
+    def get_key_with_index(self, key: str) -> tuple:
+        """
+        Get value and modify index of the key. Index is 0 if key is absent.
+        """
+        return self._store.get_with_index(key)
+
+    def set_key(self, key: str, value: str, index: int = None) -> int:
+        """
+        Set key method. If index is given, value is written only if the key
+        is not modified after index (0 for absent key).
+        Returns the new modify index of the key.
+        """
+        if index is None:
+            return self._store.update_with_index(key=key, new_val=value)
+        return self._store.cas(key=key, new_val=value, index=index)
+
+    def set_keys(self, key_values: list, delete_keys: list=None) -> int:
+        """
+        Set keys atomically, every value is written only if its key is not
+        modified after its index (0 for absent key), index None overwrites.
+        delete_keys are deleted in the same write.
+
+        Args:
+            key_values (list): [(key, value, index)]
+            delete_keys (list): [key]. All keys together at most TXN_MAX_OPERATIONS.
+
+        Return:
+            int: New modify index of the keys.
+        """
+        operations = [{"operation": TXN_OPERATIONS.UPDATE, "key": key, "val": value} if index is None else
+                      {"operation": TXN_OPERATIONS.CAS, "key": key, "val": value, "index": index}
+                      for key, value, index in key_values]
+        operations.extend({"operation": TXN_OPERATIONS.DELETE, "key": key} for key in delete_keys or [])
+        try:
+            modify_index = self._store.txn(operations)
+        except ConsulKvTxnError as e:
+            if not e.conflict:
+                raise
+            raise ConsulKvCasError(f"Keys modified concurrently. Error: {e}")
+        return max(modify_index.values())
 
     def key_exists(self, key: str) -> bool:
         """
@@ -14,10 +14,43 @@
 # For any questions about this software or licensing,
 # please email opensource@seagate.com or cortx-questions@seagate.com.
 
+import re
+
 from cortx.utils.log import Log
 from ha import const
 from ha.core.error import HaSystemHealthComponentsException, HaSystemHealthHierarchyException
 
+class KeyTemplate:
+    """
+    Component key template compiled once into literal segments and placeholder
+    names, e.g. "/cortx/ha/system/cluster/$cluster_id/health".
+    """
+    __slots__ = ("_head", "_placeholders", "_id_name")
+
+    def __init__(self, component: str, template: str):
+        parts = re.split(r"\$(\w+)", template)
+        self._head = parts[0]
+        # ((placeholder name, literal segment following it), ...)
+        self._placeholders = tuple(zip(parts[1::2], parts[2::2]))
+        # comp_id is the value of the id placeholder of the component itself.
+        self._id_name = f"{component}_id"
+
+    def format(self, **kwargs) -> str:
+        """
+        Substitute placeholders in order. Key is truncated before the first
+        placeholder without a value in kwargs.
+        """
+        key = [self._head]
+        for name, segment in self._placeholders:
+            if name == self._id_name and "comp_id" in kwargs:
+                key.append(kwargs["comp_id"])
+            elif name in kwargs:
+                key.append(kwargs[name])
+            else:
+                break
+            key.append(segment)
+        return "".join(key)
+
 class SystemHealthComponents:
     """
     System Health Components. This class provides a method for fetching component/key
@@ -49,6 +82,25 @@ class SystemHealthComponents:
                                                         const.KEY: "/cortx/ha/system/cluster/$cluster_id/service/$comp_type/$comp_id/aggregate"},
                    const.COMPONENTS.NODE_MAP.value: {const.RESOURCE_LIST: [],
                                                      const.KEY: "/cortx/ha/system/cluster/node_map/$node_id"}}
+    # Compiled key templates by component.
+    _key_templates: dict = {}
+
+    # Component of the resolved resource types, starts with the listed resource types.
+    _resolved_components: dict = None
+    # Bound on resolved resource types kept, resource types are not expected to exceed it.
+    _MAX_RESOLVED_COMPONENTS = 1024
+
+    @staticmethod
+    def _find_component(resource_type: str) -> str:
+        """
+        Scan the components in order, first component with a resource listed
+        in the resource type wins. None if not supported.
+        """
+        for key in SystemHealthComponents._components:
+            for item in SystemHealthComponents._components[key][const.RESOURCE_LIST]:
+                if item in resource_type:
+                    return key
+        return None
 
     @staticmethod
     def get_component(resource_type: str) -> str:
@@ -56,20 +108,23 @@ class SystemHealthComponents:
         This method returns a component associated with a resource type,
         received in the health event.
         """
-        try:
-            # Get system health component using the resource type
-            for key in SystemHealthComponents._components:
-                for item in SystemHealthComponents._components[key][const.RESOURCE_LIST]:
-                    if item in resource_type:
-                        return key
-
+        resolved = SystemHealthComponents._resolved_components
+        if resolved is None:
+            resolved = {item: SystemHealthComponents._find_component(item)
+                        for key in SystemHealthComponents._components
+                        for item in SystemHealthComponents._components[key][const.RESOURCE_LIST]}
+            SystemHealthComponents._resolved_components = resolved
+        component = resolved.get(resource_type)
+        if component is not None:
+            return component
+        component = SystemHealthComponents._find_component(resource_type)
+        if component is None:
             # System health does not support this component.
             Log.error(f"System health does not support health update for resource type: {resource_type}")
             raise HaSystemHealthComponentsException(f"Health update for an unsupported resource type: {resource_type}")
-
-        except Exception as e:
-            Log.error(f"Failed to get component with Error: {e}")
-            raise HaSystemHealthComponentsException("Failed to get component")
+        if len(resolved) < SystemHealthComponents._MAX_RESOLVED_COMPONENTS:
+            resolved[resource_type] = component
+        return component
 
     @staticmethod
     def get_key(component: str) -> str:
@@ -90,6 +145,25 @@ class SystemHealthComponents:
             Log.error(f"Failed to get {component} with Error: {e}")
             raise HaSystemHealthComponentsException("Failed to get component")
 
+    @staticmethod
+    def get_key_template(component: str) -> KeyTemplate:
+        """
+        This method returns the compiled key template of a component.
+        """
+        template = SystemHealthComponents._key_templates.get(component)
+        if template is None:
+            template = KeyTemplate(component, SystemHealthComponents.get_key(component))
+            SystemHealthComponents._key_templates[component] = template
+        return template
+
+    @staticmethod
+    def get_health_components() -> dict:
+        """
+        This method returns {component: key} of the components with an entity health key.
+        """
+        return {component: value[const.KEY] for component, value in SystemHealthComponents._components.items()
+                if value[const.KEY].endswith("/health")}
+
 class SystemHealthHierarchy:
     """
     System Health Hierarchy. This class provides system health component health update hierarchy.
@@ -102,23 +176,25 @@ class SystemHealthHierarchy:
     _server_hw = [const.COMPONENTS.SERVER_HARDWARE.value] + _server
     _storage = [const.COMPONENTS.STORAGE_COMPONENT.value,  const.COMPONENTS.STORAGE.value] + _common_hierarchy
 
+    # Update hierarchy by component, built once. Lists are shared and must not be modified.
+    _hierarchies: dict = None
+
     @staticmethod
-    def get_hierarchy(component: str) -> dict:
+    def get_hierarchy(component: str) -> list:
         """
         This method returns a component health update hierarchy.
         """
-
-        try:
-            if component in SystemHealthHierarchy._server_hw:
-                return SystemHealthHierarchy._server_hw[SystemHealthHierarchy._server_hw.index(component):]
-            elif component in SystemHealthHierarchy._server_service:
-                return SystemHealthHierarchy._server_service[SystemHealthHierarchy._server_service.index(component):]
-            elif component in SystemHealthHierarchy._storage:
-                return SystemHealthHierarchy._storage[SystemHealthHierarchy._storage.index(component) : ]
-            else:
-                Log.error(f"Health update hierarchy not present for component: {component}")
-                raise HaSystemHealthHierarchyException("Health update hierarchy not present for the component")
-
-        except Exception as e:
-            Log.error(f"Failed to get health update hierarchy for component with Error: {e}")
-            raise HaSystemHealthHierarchyException("Failed to get health update hierarchy")
\ No newline at end of file
+        hierarchies = SystemHealthHierarchy._hierarchies
+        if hierarchies is None:
+            hierarchies = {}
+            # Earlier hierarchy wins for the shared components.
+            for hierarchy in [SystemHealthHierarchy._server_hw, SystemHealthHierarchy._server_service,
+                              SystemHealthHierarchy._storage]:
+                for count, value in enumerate(hierarchy):
+                    hierarchies.setdefault(value, hierarchy[count:])
+            SystemHealthHierarchy._hierarchies = hierarchies
+        hierarchy = hierarchies.get(component)
+        if hierarchy is None:
+            Log.error(f"Health update hierarchy not present for component: {component}")
+            raise HaSystemHealthHierarchyException("Health update hierarchy not present for the component")
+        return hierarchy
@@ -25,6 +25,7 @@ from cortx.utils.log import Log
 from ha.core.config.config_manager import ConfigManager
 from ha.fault_tolerance.fault_monitor import NodeFaultMonitor
 from ha.fault_tolerance.cluster_stop_monitor import ClusterStopMonitor
+from ha.core.system_health.health_history import HealthHistory
 
 class FaultTolerance:
     """
@@ -40,6 +41,8 @@ class FaultTolerance:
         ConfigManager.init("fault_tolerance")
         self.node_fault_monitor = NodeFaultMonitor()
         self.cluster_stop_monitor = ClusterStopMonitor()
+        # System health history is written by the event analyzer of this process.
+        self.health_history = HealthHistory(ConfigManager.get_confstore())
 
     def set_sigterm(self, signum, frame):
         """
@@ -56,6 +59,8 @@ class FaultTolerance:
         """
         self.node_fault_monitor.start()
         self.cluster_stop_monitor.start()
+        if self.health_history.is_enabled():
+            self.health_history.start_compaction()
 
     def wait_for_exit(self):
         """
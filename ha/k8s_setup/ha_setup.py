@@ -36,6 +36,8 @@ from ha.k8s_setup.const import _DELIM
 from ha.core.event_manager.event_manager import EventManager
 from ha.core.event_manager.subscribe_event import SubscribeEvent
 from ha.util.conf_store import ConftStoreSearch
+from ha.core.system_health.health_value_migration import migrate_health_values
+from ha.core.system_health.health_status_index import HealthStatusIndex
 
 class Cmd:
     """
@@ -220,7 +222,9 @@ class ConfigCmd(Cmd):
                          'CLUSTER_STOP_MON' : {'message_type' : 'cluster_stop', 'consumer_group' : 'cluster_mon',
                                               'consumer_id' : '2'},
                          'NODE': {'resource_type': 'node'},
-                         'SYSTEM_HEALTH' : {'num_entity_health_events' : 2}
+                         'SYSTEM_HEALTH' : {'num_entity_health_events' : 2, 'coalescing_window' : 0,
+                                           'history' : {'bucket_interval' : 3600, 'retention' : 604800,
+                                                        'compaction_interval' : 600}}
                          }
 
             if not os.path.isdir(const.CONFIG_DIR):
@@ -308,6 +312,15 @@ class UpgradeCmd(Cmd):
         """
         Process upgrade command.
         """
+        try:
+            Log.info("Migrating system health values to the compact encoding")
+            migrate_health_values(ConfigManager.get_confstore())
+            Log.info("Building system health status index")
+            HealthStatusIndex(ConfigManager.get_confstore()).rebuild()
+        except Exception as e:
+            Log.error(f"upgrade command failed. Error: {e}")
+            sys.stderr.write(f"upgrade command failed. {traceback.format_exc()}, Error: {e}\n")
+            raise SetupError("upgrade failed")
         sys.stdout.write("HA has been upgraded successfully\n")
 
 class TestCmd(Cmd):
@@ -23,8 +23,6 @@ import os
 import shutil
 import json
 import grp, pwd
-import time
-import uuid
 
 from cortx.utils.conf_store import Conf
 from cortx.utils.log import Log
@@ -32,6 +30,7 @@ from cortx.utils.validator.v_pkg import PkgV
 from cortx.utils.security.cipher import Cipher
 from ha.core.system_health.const import NODE_MAP_ATTRIBUTES
 from ha.core.system_health.const import CONFSTORE_KEY_ATTRIBUTES
+from ha.core.system_health.const import HEALTH_UPDATE_MAX_ATTEMPTS
 
 from ha.execute import SimpleCommand
 from ha import const
@@ -52,9 +51,10 @@ from ha.core.error import HaResetException
 from ha.core.error import SetupError
 from ha.setup.cluster_validator.cluster_test import TestExecutor
 from ha.core.system_health.system_health import SystemHealth
-from ha.core.system_health.const import CLUSTER_ELEMENTS, HEALTH_EVENTS, EVENT_SEVERITIES
-from ha.core.system_health.model.health_event import HealthEvent
+from ha.core.system_health.system_health_initiator import SystemHealthInitiator
+from ha.core.system_health.const import CLUSTER_ELEMENTS
 from ha.const import _DELIM
+from ha.util.consul_kv_store import ConsulKvCasError
 from ha.util.ipmi_fencing_agent import IpmiFencingAgent
 
 
@@ -752,28 +752,21 @@ class ConfigCmd(Cmd):
             storageset_id = Conf.get(self._index, f"server_node{_DELIM}{machine_id}{_DELIM}{CONFSTORE_KEY_ATTRIBUTES.STORAGE_SET_ID.value}")
             host_id = Conf.get(self._index, f"server_node{_DELIM}{machine_id}{_DELIM}network{_DELIM}management{_DELIM}public_fqdn")
 
-            timestamp = str(int(time.time()))
-            event_id = timestamp + str(uuid.uuid4().hex)
-            initial_event = {
-                const.EVENT_ATTRIBUTES.EVENT_ID : event_id,
-                const.EVENT_ATTRIBUTES.EVENT_TYPE : HEALTH_EVENTS.INSERTION.value,
-                const.EVENT_ATTRIBUTES.SEVERITY : EVENT_SEVERITIES.INFORMATIONAL.value,
-                const.EVENT_ATTRIBUTES.SITE_ID : site_id,
-                const.EVENT_ATTRIBUTES.RACK_ID : rack_id,
-                const.EVENT_ATTRIBUTES.CLUSTER_ID : cluster_id,
-                const.EVENT_ATTRIBUTES.STORAGESET_ID : storageset_id,
-                const.EVENT_ATTRIBUTES.NODE_ID : node_id,
-                const.EVENT_ATTRIBUTES.HOST_ID : host_id,
-                const.EVENT_ATTRIBUTES.RESOURCE_TYPE : CLUSTER_ELEMENTS.NODE.value,
-                const.EVENT_ATTRIBUTES.TIMESTAMP : timestamp,
-                const.EVENT_ATTRIBUTES.RESOURCE_ID : node_id,
-                const.EVENT_ATTRIBUTES.SPECIFIC_INFO : None
-            }
-
-            Log.debug(f"Adding initial health {initial_event} for node {node_id}")
-            health_event = HealthEvent.dict_to_object(initial_event)
-            system_health = SystemHealth(self._confstore)
-            system_health.process_event(health_event)
+            # Node and its parents are evaluated and written in one batch, health already stored is kept.
+            # Initial health is not published as an event, consumers read it from the system health.
+            schema = {CLUSTER_ELEMENTS.CLUSTER.value: [{"id": cluster_id, CLUSTER_ELEMENTS.SITE.value: [{"id": site_id,
+                      CLUSTER_ELEMENTS.RACK.value: [{"id": rack_id, CLUSTER_ELEMENTS.NODE.value: [{"id": node_id}]}]}]}]}
+            Log.debug(f"Adding initial health {schema} for node {node_id}, storageset {storageset_id}, host {host_id}")
+            initiator = SystemHealthInitiator(self._confstore)
+            for attempt in range(1, HEALTH_UPDATE_MAX_ATTEMPTS + 1):
+                try:
+                    initiator.process(schema)
+                    break
+                except ConsulKvCasError as e:
+                    # Parents are shared with the nodes configured at the same time.
+                    Log.warn(f"Health modified concurrently, attempt {attempt} of {HEALTH_UPDATE_MAX_ATTEMPTS}. Error: {e}")
+                    if attempt == HEALTH_UPDATE_MAX_ATTEMPTS:
+                        raise
         except Exception as e:
             Log.error(f"Failed adding node health. Error: {e}")
             raise HaConfigException("Failed adding node health.")
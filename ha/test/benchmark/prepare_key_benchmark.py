@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2021 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+Key construction cost of a synthetic health event run, regex based
+prepare_key against the compiled key templates.
+
+Usage: python3 -m ha.test.benchmark.prepare_key_benchmark [events]
+"""
+
+import re
+import sys
+import time
+
+from ha import const
+from ha.core.system_health.system_health_metadata import SystemHealthComponents, SystemHealthHierarchy
+
+def legacy_prepare_key(component: str, **kwargs) -> str:
+    """
+    prepare_key before the key templates were compiled.
+    """
+    key = SystemHealthComponents.get_key(component)
+    if "comp_id" in kwargs:
+        key = key.replace(f"${component}_id", kwargs["comp_id"])
+    subs = re.findall("\$\w+", key)
+    for sub in subs:
+        argument = re.split("\$", sub)
+        if argument[1] in kwargs:
+            key = re.sub("\$\w+", kwargs[argument[1]], key, 1)
+        else:
+            key = re.split("\$", key)
+            key = key[0]
+            break
+    return key
+
+def compiled_prepare_key(component: str, **kwargs) -> str:
+    return SystemHealthComponents.get_key_template(component).format(**kwargs)
+
+def synthetic_calls(events: int) -> list:
+    """
+    Key constructions of the events: every event builds the key of each
+    component of its hierarchy, with and without comp_id, as _update does.
+    """
+    ids = {"cluster_id": "c1", "site_id": "1", "rack_id": "1", "server_id": "srv1", "storage_id": "st1"}
+    components = [const.COMPONENTS.SERVER_HARDWARE.value, const.COMPONENTS.SERVER_SERVICE.value,
+                  const.COMPONENTS.NODE.value, const.COMPONENTS.STORAGE_COMPONENT.value]
+    calls: list = []
+    for event in range(events):
+        component = components[event % len(components)]
+        node_id = f"node{event % 64}"
+        for hop in SystemHealthHierarchy.get_hierarchy(component):
+            calls.append((hop, dict(ids, node_id=node_id, comp_type="disk", comp_id=f"{hop}-{event % 16}")))
+            calls.append((hop, dict(ids, node_id=node_id)))
+    return calls
+
+def run(prepare_key, calls: list) -> float:
+    start = time.perf_counter()
+    for component, kwargs in calls:
+        prepare_key(component, **kwargs)
+    return time.perf_counter() - start
+
+def main(events: int):
+    calls = synthetic_calls(events)
+    for component, kwargs in calls[:1000]:
+        assert legacy_prepare_key(component, **kwargs) == compiled_prepare_key(component, **kwargs)
+    legacy = run(legacy_prepare_key, calls)
+    compiled = run(compiled_prepare_key, calls)
+    print(f"{events} events, {len(calls)} keys")
+    print(f"legacy:   {legacy * 1000:.1f} ms, {legacy * 1e6 / len(calls):.2f} us/key")
+    print(f"compiled: {compiled * 1000:.1f} ms, {compiled * 1e6 / len(calls):.2f} us/key")
+    print(f"speedup:  {legacy / compiled:.1f}x")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
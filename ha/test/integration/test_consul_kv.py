@@ -18,10 +18,13 @@
 import os
 import sys
 import pathlib
+import time
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 
 sys.path.append(os.path.join(os.path.dirname(pathlib.Path(__file__)), '..', '..', '..'))
-from ha.util.consul_kv_store import ConsulKvStore
+from ha.util.consul_kv_store import ConsulKvStore, ConsulKvStoreError, ConsulKvTxnError, ConsulKvCasError, TXN_OPERATIONS, CONSISTENCY_MODES
+from ha.util.consul_kv_cache import CachedConsulKvStore
 
 class TestConsulKvStore(unittest.TestCase):
     """
@@ -90,6 +93,112 @@ class TestConsulKvStore(unittest.TestCase):
         self._c2.delete(recurse=True)
         self.assertEqual(self._c2.get(), None)
 
+    def test_exact_get(self):
+        """
+        Test non recursive get and key_exists
+        """
+        self._c1.delete(recurse=True)
+        self._c1.set("cluster", "cortx_cluster")
+        self._c1.set("cluster/node", "node1")
+        _output: dict = {f'{self.test_ha_prefix}/cluster': 'cortx_cluster'}
+        self.assertEqual(self._c1.get("cluster", recurse=False), _output)
+        self.assertEqual(self._c1.get("clus", recurse=False), None)
+        self.assertTrue(self._c1.key_exists("clus"))
+        self.assertFalse(self._c1.key_exists("clus", recurse=False))
+
+    def test_get_keys(self):
+        """
+        Test keys only listing
+        """
+        self._c1.delete(recurse=True)
+        self._c1.set("cluster/1/site/1/health", "{}")
+        self._c1.set("cluster/1/site/1/rack/1/health", "{}")
+        self._c1.set("cluster/1/site/2/health", "{}")
+        _output: list = [f'{self.test_ha_prefix}/cluster/1/site/1/', f'{self.test_ha_prefix}/cluster/1/site/2/']
+        self.assertEqual(self._c1.get_keys("cluster/1/site/", separator="/"), _output)
+        self.assertEqual(len(self._c1.get_keys("cluster/1/site/")), 3)
+        self.assertEqual(self._c1.get_keys("cluster/2/", separator="/"), [])
+
+    def test_consistency(self):
+        """
+        Test stale and consistent reads
+        """
+        self._c1.delete(recurse=True)
+        self._c1.set("cluster_name", "cortx_cluster")
+        _output: dict = {f'{self.test_ha_prefix}/cluster_name': 'cortx_cluster'}
+        self.assertEqual(self._c1.get("cluster_name", consistency=CONSISTENCY_MODES.CONSISTENT.value), _output)
+        stale_store = ConsulKvStore(self.test_ha_prefix, consistency=CONSISTENCY_MODES.STALE.value)
+        self.assertEqual(stale_store.get("cluster_name"), _output)
+
+    def test_cas(self):
+        """
+        Test compare and swap write
+        """
+        self._c1.delete(recurse=True)
+        self.assertEqual(self._c1.get_with_index("cluster_name"), (None, 0))
+        index = self._c1.cas("cluster_name", "cortx_cluster", 0)
+        self.assertEqual(self._c1.get_with_index("cluster_name"), ("cortx_cluster", index))
+        with self.assertRaises(ConsulKvCasError):
+            self._c1.cas("cluster_name", "cortx_cluster1", 0)
+        new_index = self._c1.update_with_index("cluster_name", "cortx_cluster1")
+        with self.assertRaises(ConsulKvCasError):
+            self._c1.cas("cluster_name", "cortx_cluster2", index)
+        self._c1.cas("cluster_name", "cortx_cluster2", new_index)
+        self.assertEqual(self._c1.get_with_index("cluster_name")[0], "cortx_cluster2")
+
+    def test_txn(self):
+        """
+        Test transaction and multi key read
+        """
+        self._c1.delete(recurse=True)
+        self._c1.set("cluster_user", "hacluster")
+        self._c1.txn([{"operation": TXN_OPERATIONS.SET, "key": "cluster_name", "val": "cortx_cluster"},
+                      {"operation": TXN_OPERATIONS.UPDATE, "key": "cluster_user", "val": "hacluster1"}])
+        _output: dict = {"cluster_name": "cortx_cluster", "cluster_user": "hacluster1"}
+        self.assertEqual(self._c1.get_many(["cluster_name", "cluster_user", "missing"]), _output)
+        # Set of existing key rolls back complete transaction.
+        with self.assertRaises(ConsulKvTxnError):
+            self._c1.txn([{"operation": TXN_OPERATIONS.DELETE, "key": "cluster_user"},
+                          {"operation": TXN_OPERATIONS.SET, "key": "cluster_name", "val": "cortx"}])
+        self.assertEqual(self._c1.get_many(["cluster_name", "cluster_user"]), _output)
+        # Operations above consul limit are split in chunks only if allowed.
+        operations = [{"operation": TXN_OPERATIONS.UPDATE, "key": f"res/{i}", "val": str(i)} for i in range(100)]
+        self.assertRaises(ConsulKvStoreError, self._c1.txn, operations)
+        self._c1.txn(operations, split=True)
+        self.assertEqual(len(self._c1.get("res")), 100)
+        # Exact keys, not the keys sharing their prefix.
+        self.assertEqual(self._c1.get_many([f"res/{i}" for i in range(1, 100)] + ["res/missing"]),
+                         {f"res/{i}": str(i) for i in range(1, 100)})
+
+    def test_threads(self):
+        """
+        Test concurrent access from threads sharing the connection pool
+        """
+        self._c1.delete(recurse=True)
+        store = ConsulKvStore(self.test_ha_prefix, pool_size=2, timeout=10)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda i: store.update(f"res/{i}", str(i)), range(32)))
+        self.assertEqual(len(store.get("res")), 32)
+
+    def test_cache(self):
+        """
+        Test cached reads, write through and watch refresh
+        """
+        self._c1.delete(recurse=True)
+        self._c1.set("events/node/online", "hare")
+        cache = CachedConsulKvStore(self.test_ha_prefix, watch_prefixes=["events"], wait=1)
+        time.sleep(2)
+        _output: dict = {f'{self.test_ha_prefix}/events/node/online': 'hare'}
+        self.assertEqual(cache.get("events/node/online", recurse=False), _output)
+        cache.update("events/node/online", "hare1")
+        self.assertEqual(cache.get_many(["events/node/online"]), {"events/node/online": "hare1"})
+        self._c1.update("events/node/failed", "motr")
+        time.sleep(2)
+        self.assertEqual(cache.get_many(["events/node/failed"]), {"events/node/failed": "motr"})
+        cache.delete("events", recurse=True)
+        self.assertFalse(cache.key_exists("events"))
+        cache.stop()
+
     def tearDown(self):
         """
         Clear all consul key.
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2021 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+import json
+import unittest
+
+from ha.core.error import HaEntityHealthException
+from ha.core.system_health.model.entity_health import EntityHealth, EntityEvent, EntityAction
+
+class TestEntityHealth(unittest.TestCase):
+    """
+    Unit test EntityHealth
+    """
+
+    def setUp(self):
+        self._num_events = EntityHealth.NUM_EVENTS
+        EntityHealth.NUM_EVENTS = 2
+
+    def tearDown(self):
+        EntityHealth.NUM_EVENTS = self._num_events
+
+    def test_history(self):
+        """
+        Test the history keeps the latest events, latest first.
+        """
+        health = EntityHealth()
+        for count in range(3):
+            health.add_event(EntityEvent(str(count), str(count), f"status{count}", {"generation_id": count}))
+        health.set_action(EntityAction("2", "pending"))
+        self.assertEqual(health.get_latest_event().status, "status2")
+        self.assertEqual(EntityHealth.loads(EntityHealth.write(health)),
+                         {"events": [{"event_timestamp": "2", "created_timestamp": "2", "status": "status2",
+                                      "specific_info": {"generation_id": 2}},
+                                     {"event_timestamp": "1", "created_timestamp": "1", "status": "status1",
+                                      "specific_info": {"generation_id": 1}}],
+                          "action": {"modified_timestamp": "2", "status": "pending"},
+                          "attributes": {}})
+
+    def test_read(self):
+        """
+        Test read and write round trip, longer stored history is truncated to the latest events.
+        """
+        stored = {"events": [{"event_timestamp": str(count), "created_timestamp": str(count),
+                              "status": f"status{count}", "specific_info": None} for count in [3, 2, 1]],
+                  "action": {"modified_timestamp": "3", "status": "complete"},
+                  "attributes": {"name": "node1"}}
+        health = EntityHealth.read(json.dumps(stored))
+        self.assertEqual([event.status for event in health.events], ["status3", "status2"])
+        stored["events"] = stored["events"][:2]
+        self.assertEqual(EntityHealth.loads(EntityHealth.write(health)), stored)
+        self.assertEqual(json.loads(EntityHealth.write_legacy(health)), stored)
+        self.assertRaises(HaEntityHealthException, EntityHealth.read, {"unknown": {}})
+
+    def test_encoding(self):
+        """
+        Test compact encoding is smaller and legacy values are detected.
+        """
+        stored = {"events": [{"event_timestamp": "1", "created_timestamp": "2", "status": "online",
+                              "specific_info": {"generation_id": "g1"}}],
+                  "action": {}, "attributes": {}}
+        legacy = json.dumps(stored)
+        compact = EntityHealth.write(stored)
+        self.assertTrue(EntityHealth.is_legacy(legacy))
+        self.assertFalse(EntityHealth.is_legacy(compact))
+        self.assertLess(len(compact), len(legacy))
+        self.assertEqual(EntityHealth.loads(legacy), EntityHealth.loads(compact))
+        self.assertEqual(EntityHealth.loads('{"node": {"n1": "online"}}'), {"node": {"n1": "online"}})
+        self.assertRaises(HaEntityHealthException, EntityHealth.loads, '[1, [], null, {}]')
+
+if __name__ == "__main__":
+    unittest.main()
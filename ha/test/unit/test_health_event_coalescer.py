@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2021 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+import time
+import unittest
+from types import SimpleNamespace
+
+from ha.core.event_analyzer.subscriber import Subscriber
+from ha.core.system_health.health_event_coalescer import HealthEventCoalescer
+
+class RecordingSubscriber(Subscriber):
+    """
+    Keeps the processed events.
+    """
+    def __init__(self):
+        self.events = []
+
+    def process_event(self, event):
+        if event.event_type == "invalid":
+            raise ValueError(f"Invalid event {event.event_id}")
+        self.events.append(event)
+
+class BatchSubscriber(RecordingSubscriber):
+    """
+    Keeps the processed batches.
+    """
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    def process_events(self, events):
+        self.batches.append([event.event_id for event in events])
+        super().process_events(events)
+
+def _event(event_id, resource_id, event_type, generation_id=None):
+    specific_info = None if generation_id is None else {"generation_id": generation_id, "pod_restart": 0}
+    return SimpleNamespace(event_id=event_id, resource_type="node", resource_id=resource_id,
+                           event_type=event_type, specific_info=specific_info)
+
+class TestHealthEventCoalescer(unittest.TestCase):
+    """
+    Unit test HealthEventCoalescer
+    """
+
+    def setUp(self):
+        self._subscriber = RecordingSubscriber()
+        # Long window, events are processed by flush.
+        self._coalescer = HealthEventCoalescer(self._subscriber, 60)
+
+    def tearDown(self):
+        self._coalescer.stop()
+
+    def test_net_transition(self):
+        """
+        Test only the latest event of a resource and generation is processed.
+        """
+        self._coalescer.process_event(_event("1", "n1", "online", "g1"))
+        self._coalescer.process_event(_event("2", "n2", "online", "g1"))
+        self._coalescer.process_event(_event("3", "n1", "offline", "g1"))
+        self._coalescer.process_event(_event("4", "n1", "failed", "g1"))
+        self._coalescer.flush()
+        self.assertEqual([event.event_id for event in self._subscriber.events], ["4", "2"])
+        self.assertEqual(self._coalescer.get_stats(), {"received": 4, "processed": 2, "queued": 0})
+
+    def test_generation_order(self):
+        """
+        Test events of a new generation are processed after the previous generation.
+        """
+        self._coalescer.process_event(_event("1", "n1", "online", "g1"))
+        self._coalescer.process_event(_event("2", "n1", "failed", "g1"))
+        self._coalescer.process_event(_event("3", "n1", "online", "g2"))
+        self._coalescer.flush()
+        self.assertEqual([event.event_id for event in self._subscriber.events], ["2", "3"])
+
+    def test_window(self):
+        """
+        Test events are processed when the window is over.
+        """
+        coalescer = HealthEventCoalescer(self._subscriber, 0.05)
+        coalescer.process_event(_event("1", "n1", "online"))
+        coalescer.process_event(_event("2", "n1", "offline"))
+        for _ in range(100):
+            if coalescer.get_stats()["processed"]:
+                break
+            time.sleep(0.01)
+        coalescer.stop()
+        self.assertEqual([event.event_id for event in self._subscriber.events], ["2"])
+
+    def test_batch(self):
+        """
+        Test due events are passed as one batch and a failed event does not drop the rest.
+        """
+        subscriber = BatchSubscriber()
+        coalescer = HealthEventCoalescer(subscriber, 60)
+        coalescer.process_event(_event("1", "n1", "invalid"))
+        coalescer.process_event(_event("2", "n2", "online"))
+        coalescer.process_event(_event("3", "n3", "failed"))
+        coalescer.stop()
+        self.assertEqual(subscriber.batches, [["1", "2", "3"]])
+        self.assertEqual([event.event_id for event in subscriber.events], ["2", "3"])
+        self.assertEqual(coalescer.get_stats()["processed"], 3)
+
+if __name__ == "__main__":
+    unittest.main()
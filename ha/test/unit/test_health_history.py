@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2021 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+import unittest
+
+from ha.core.system_health.health_history import HealthHistory
+from ha.core.system_health.model.entity_health import EntityEvent
+from ha.util.memory_kv_store import MemoryKvStore
+
+class TestHealthHistory(unittest.TestCase):
+    """
+    Unit test HealthHistory
+    """
+
+    NODE_KEY = "/cortx/ha/system/cluster/c1/site/1/rack/1/node/n1/health"
+    RACK_KEY = "/cortx/ha/system/cluster/c1/site/1/rack/1/health"
+
+    def setUp(self):
+        self._store = MemoryKvStore("cortx/ha/v1")
+        self._history = HealthHistory(self._store, bucket_interval=60, retention=600)
+
+    def _append(self, health_key: str, created_timestamp: int, status: str):
+        key, value = self._history.get_entry(health_key, EntityEvent(str(created_timestamp), str(created_timestamp), status))
+        self._store.set(key, value)
+
+    def test_events(self):
+        """
+        Test events are read latest first, per component.
+        """
+        self._append(self.NODE_KEY, 1000, "online")
+        self._append(self.NODE_KEY, 1000, "failed")
+        self._append(self.NODE_KEY, 1070, "online")
+        self._append(self.RACK_KEY, 1000, "online")
+        self.assertEqual([event["status"] for event in self._history.get_events(self.NODE_KEY)],
+                         ["online", "failed", "online"])
+        self.assertEqual([event["created_timestamp"] for event in self._history.get_events(self.NODE_KEY, since=1050)],
+                         ["1070"])
+        self.assertEqual(len(self._history.get_events(self.RACK_KEY)), 1)
+
+    def test_compact(self):
+        """
+        Test closed buckets are compacted and old buckets are deleted.
+        """
+        self._append(self.NODE_KEY, 1000, "online")
+        self._append(self.NODE_KEY, 1010, "failed")
+        self._append(self.NODE_KEY, 1070, "online")
+        events = self._history.get_events(self.NODE_KEY)
+        # Bucket 960 is closed, bucket 1020 is open.
+        self.assertEqual(self._history.compact(now=1075), {"compacted": 1, "deleted": 0, "conflicts": 0})
+        self.assertEqual(self._history.get_events(self.NODE_KEY), events)
+        history_keys = [key for key in self._store.dump() if "/history/" in key]
+        self.assertEqual(len(history_keys), 2)
+        self.assertEqual(self._history.compact(now=1650), {"compacted": 1, "deleted": 1, "conflicts": 0})
+        self.assertEqual(self._history.get_events(self.NODE_KEY), events[:1])
+
+    def test_delete_bucket(self):
+        """
+        Test deleting an old bucket keeps the buckets starting with its digits.
+        """
+        self._append(self.NODE_KEY, 60, "online")
+        self._append(self.NODE_KEY, 600, "failed")
+        self.assertEqual(self._history.compact(now=660), {"compacted": 2, "deleted": 0, "conflicts": 0})
+        # Bucket 60 is older than the retention.
+        self.assertEqual(self._history.compact(now=720), {"compacted": 0, "deleted": 1, "conflicts": 0})
+        self.assertEqual([event["status"] for event in self._history.get_events(self.NODE_KEY)], ["failed"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2021 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+import unittest
+
+from ha.core.system_health.health_status_index import HealthStatusIndex
+from ha.core.system_health.model.entity_health import EntityEvent, EntityHealth
+from ha.util.consul_kv_store import TXN_OPERATIONS
+from ha.util.memory_kv_store import MemoryKvStore
+
+class TestHealthStatusIndex(unittest.TestCase):
+    """
+    Unit test HealthStatusIndex
+    """
+
+    NODE_KEY = "/cortx/ha/system/cluster/c1/site/1/rack/1/node/n1/health"
+    RACK_KEY = "/cortx/ha/system/cluster/c1/site/1/rack/1/health"
+
+    def setUp(self):
+        EntityHealth.NUM_EVENTS = 1
+        self._store = MemoryKvStore("cortx/ha/v1")
+        self._index = HealthStatusIndex(self._store)
+
+    def _apply(self, health_key: str, component: str, old_status: str, new_status: str, timestamp: str):
+        updates, deletes = self._index.get_changes(health_key, component, old_status, new_status, timestamp)
+        self._store.txn([{"operation": TXN_OPERATIONS.UPDATE, "key": key, "val": value} for key, value in updates] +
+                        [{"operation": TXN_OPERATIONS.DELETE, "key": key} for key in deletes])
+
+    def test_query(self):
+        """
+        Test component is listed only under its current status.
+        """
+        self._apply(self.NODE_KEY, "node", None, "online", "1000")
+        self._apply(self.RACK_KEY, "rack", None, "online", "1000")
+        self._apply(self.NODE_KEY, "node", "online", "failed", "1010")
+        self.assertEqual(self._index.query(status="failed"),
+                         [{"resource": "node", "id": "n1", "status": "failed", "last_updated_time": "1010"}])
+        self.assertEqual([item["resource"] for item in self._index.query(status="online")], ["rack"])
+        self.assertEqual([item["status"] for item in self._index.query(component="node")], ["failed"])
+        self.assertEqual(self._index.query(updated_since=1005)[0]["id"], "n1")
+        self.assertEqual(self._index.query(status="online", updated_since=1005), [])
+
+    def test_rebuild(self):
+        """
+        Test index is rebuilt from the health tree.
+        """
+        health = EntityHealth()
+        health.add_event(EntityEvent("1000", "1000", "failed"))
+        self._store.update(self.NODE_KEY, EntityHealth.write(health))
+        self._apply(self.NODE_KEY, "node", None, "online", "900")
+        self._apply(self.RACK_KEY, "rack", None, "online", "900")
+        self.assertEqual(self._index.rebuild(), {"scanned": 1, "indexed": 1, "removed": 2})
+        self.assertEqual(self._index.query(),
+                         [{"resource": "node", "id": "n1", "status": "failed", "last_updated_time": "1000"}])
+
+    def test_rebuild_many(self):
+        """
+        Test index of more components than one transaction is rebuilt.
+        """
+        health = EntityHealth()
+        health.add_event(EntityEvent("1000", "1000", "online"))
+        for node in range(100):
+            self._store.update(self.NODE_KEY.replace("/n1/", f"/n{node}/"), EntityHealth.write(health))
+        self.assertEqual(self._index.rebuild(), {"scanned": 100, "indexed": 100, "removed": 0})
+        self.assertEqual(len(self._index.query(component="node")), 100)
+
+if __name__ == "__main__":
+    unittest.main()
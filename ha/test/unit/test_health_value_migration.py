@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2021 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+import json
+import unittest
+
+from ha.core.system_health.health_value_migration import migrate_health_values
+from ha.core.system_health.model.entity_health import EntityHealth
+from ha.util.memory_kv_store import MemoryKvStore
+
+class TestHealthValueMigration(unittest.TestCase):
+    """
+    Unit test migration of the health values to the compact encoding
+    """
+
+    def test_migrate(self):
+        """
+        Test legacy health values are rewritten and other values are kept.
+        """
+        store = MemoryKvStore("cortx/ha/v1/")
+        health = {"events": [{"event_timestamp": "1", "created_timestamp": "2", "status": "online",
+                              "specific_info": {}}], "action": {}, "attributes": {}}
+        node_key = "/cortx/ha/system/cluster/c1/site/1/rack/1/node/n1/health"
+        rack_key = "/cortx/ha/system/cluster/c1/site/1/rack/1/health"
+        store.update(node_key, json.dumps(health))
+        store.update(rack_key, EntityHealth.write(health))
+        store.update("/cortx/ha/system/cluster/c1/site/1/rack/1/child_status", json.dumps({"node": {"n1": "online"}}))
+        store.update("/cortx/ha/system/cluster/node_map/n1", str({"cluster_id": "c1"}))
+        self.assertEqual(migrate_health_values(store, dry_run=True),
+                         {"scanned": 4, "legacy": 1, "migrated": 0, "conflicts": 0})
+        self.assertEqual(migrate_health_values(store), {"scanned": 4, "legacy": 1, "migrated": 1, "conflicts": 0})
+        value, _ = store.get_with_index(node_key)
+        self.assertFalse(EntityHealth.is_legacy(value))
+        self.assertEqual(EntityHealth.loads(value), health)
+        self.assertEqual(store.get_with_index("/cortx/ha/system/cluster/node_map/n1")[0], str({"cluster_id": "c1"}))
+
+if __name__ == "__main__":
+    unittest.main()
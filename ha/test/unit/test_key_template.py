@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2021 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+import unittest
+
+from ha import const
+from ha.core.error import HaSystemHealthComponentsException
+from ha.core.system_health.system_health_metadata import SystemHealthComponents
+from ha.test.benchmark.prepare_key_benchmark import legacy_prepare_key, synthetic_calls
+
+class TestKeyTemplate(unittest.TestCase):
+    """
+    Unit test compiled component key templates
+    """
+
+    def test_format(self):
+        """
+        Test substitution and truncation at the first missing placeholder.
+        """
+        template = SystemHealthComponents.get_key_template(const.COMPONENTS.NODE.value)
+        self.assertIs(template, SystemHealthComponents.get_key_template(const.COMPONENTS.NODE.value))
+        self.assertEqual(template.format(cluster_id="c1", site_id="1", rack_id="2", comp_id="n1"),
+                         "/cortx/ha/system/cluster/c1/site/1/rack/2/node/n1/health")
+        self.assertEqual(template.format(cluster_id="c1", rack_id="2"), "/cortx/ha/system/cluster/c1/site/")
+        self.assertEqual(SystemHealthComponents.get_key_template(const.COMPONENTS.NODE_MAP.value).format(),
+                         "/cortx/ha/system/cluster/node_map/")
+        self.assertRaises(HaSystemHealthComponentsException, SystemHealthComponents.get_key_template, "unknown")
+
+    def test_legacy_keys(self):
+        """
+        Test keys are the same as the regex based prepare_key.
+        """
+        for component, kwargs in synthetic_calls(64):
+            self.assertEqual(SystemHealthComponents.get_key_template(component).format(**kwargs),
+                             legacy_prepare_key(component, **kwargs))
+            del kwargs["site_id"]
+            self.assertEqual(SystemHealthComponents.get_key_template(component).format(**kwargs),
+                             legacy_prepare_key(component, **kwargs))
+
+if __name__ == "__main__":
+    unittest.main()
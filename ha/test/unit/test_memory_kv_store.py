@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2021 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+import threading
+import time
+import unittest
+
+from ha.util.consul_kv_store import ConsulKvStore, ConsulKvStoreError, ConsulKvTxnError, ConsulKvCasError, TXN_OPERATIONS
+from ha.util.memory_kv_store import MemoryKvStore
+
+class TestMemoryKvStore(unittest.TestCase):
+    """
+    Unit test MemoryKvStore
+    """
+
+    def setUp(self):
+        self.prefix = "cortx/ha/test1"
+        self._store = MemoryKvStore(self.prefix)
+        self._store.delete(recurse=True)
+
+    def test_get(self):
+        """
+        Test prefix and exact reads.
+        """
+        self._store.set("res")
+        self._store.set("cluster_name", "cortx_cluster")
+        self._store.set("cluster_user", "hacluster")
+        self.assertRaises(ConsulKvStoreError, self._store.set, "res")
+        self.assertEqual(self._store.get("cluster_name"), {f"{self.prefix}/cluster_name": "cortx_cluster"})
+        self.assertEqual(self._store.get(), {f"{self.prefix}/cluster_name": "cortx_cluster",
+                                             f"{self.prefix}/cluster_user": "hacluster",
+                                             f"{self.prefix}/res": None})
+        self.assertIsNone(self._store.get("cluster", recurse=False))
+        self.assertEqual(self._store.get_many(["cluster_name", "missing"]), {"cluster_name": "cortx_cluster"})
+        self._store.delete(recurse=True)
+        self.assertIsNone(self._store.get())
+
+    def test_get_keys(self):
+        """
+        Test folder listing.
+        """
+        self._store.update("site/1/rack/1", "r1")
+        self._store.update("site/1/rack/2", "r2")
+        self._store.update("site/2/rack/1", "r3")
+        self.assertEqual(self._store.get_keys("site/", separator="/"),
+                         [f"{self.prefix}/site/1/", f"{self.prefix}/site/2/"])
+
+    def test_cas(self):
+        """
+        Test compare and swap.
+        """
+        index = self._store.cas("health", "v1", 0)
+        self.assertEqual(self._store.get_with_index("health"), ("v1", index))
+        new_index = self._store.cas("health", "v2", index)
+        self.assertGreater(new_index, index)
+        self.assertRaises(ConsulKvCasError, self._store.cas, "health", "v3", index)
+        self.assertEqual(self._store.get_with_index("missing"), (None, 0))
+        self.assertEqual(self._store.update("health", "v4"), "v4")
+
+    def test_txn_conflict(self):
+        """
+        Test only modify index mismatches are reported as conflicts.
+        """
+        self._store.update("k1", "v1")
+        with self.assertRaises(ConsulKvTxnError) as context:
+            self._store.txn([{"operation": TXN_OPERATIONS.CAS, "key": "k1", "val": "v2", "index": 0}])
+        self.assertTrue(context.exception.conflict)
+        self.assertTrue(ConsulKvStore._is_index_conflict([{"OpIndex": 0, "What": "failed to set key \"k1\", index is stale"}]))
+        self.assertFalse(ConsulKvStore._is_index_conflict([{"OpIndex": 0, "What": "Value exceeds 524288 byte limit"}]))
+        self.assertFalse(ConsulKvStore._is_index_conflict(None))
+
+    def test_txn(self):
+        """
+        Test transaction is applied atomically.
+        """
+        index = self._store.update_with_index("k1", "v1")
+        self.assertRaises(ConsulKvTxnError, self._store.txn,
+                          [{"operation": TXN_OPERATIONS.UPDATE, "key": "k2", "val": "v2"},
+                           {"operation": TXN_OPERATIONS.CHECK_INDEX, "key": "k1", "index": index + 1}])
+        self.assertFalse(self._store.key_exists("k2"))
+        result = self._store.txn([{"operation": TXN_OPERATIONS.UPDATE, "key": "k2", "val": "v2"},
+                                  {"operation": TXN_OPERATIONS.DELETE, "key": "k1"}])
+        self.assertEqual(list(result.keys()), [f"{self.prefix}/k2"])
+        self.assertEqual(self._store.get(), {f"{self.prefix}/k2": "v2"})
+        operations = [{"operation": TXN_OPERATIONS.UPDATE, "key": f"res/{i}", "val": str(i)} for i in range(100)]
+        self.assertRaises(ConsulKvStoreError, self._store.txn, operations)
+        self.assertFalse(self._store.key_exists("res"))
+        self._store.txn(operations, split=True)
+        self.assertEqual(len(self._store.get("res")), 100)
+
+    def test_wait_for_changes(self):
+        """
+        Test keys modified after index are returned once a change is made.
+        """
+        self._store.update("index/a", "1")
+        index, changes = self._store.wait_for_changes("index", 0)
+        self.assertEqual(changes, {f"{self.prefix}/index/a": "1"})
+        self.assertEqual(self._store.wait_for_changes("index", index, wait=0.05), (index, {}))
+        timer = threading.Timer(0.05, self._store.update, ("index/b", "2"))
+        timer.start()
+        start = time.monotonic()
+        new_index, changes = self._store.wait_for_changes("index", index, wait=5)
+        timer.join()
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertGreater(new_index, index)
+        self.assertEqual(changes, {f"{self.prefix}/index/b": "2"})
+        # Delete moves the store index like in consul, deleted keys are not reported.
+        self._store.delete("index/a")
+        deleted_index, changes = self._store.wait_for_changes("index", new_index, wait=0.05)
+        self.assertGreater(deleted_index, new_index)
+        self.assertEqual(changes, {})
+
+    def test_metrics(self):
+        """
+        Test store calls are counted once per method and key family.
+        """
+        self._store.metrics.reset()
+        calls = self._store.metrics.get_thread_calls()
+        self._store.set("events/node/failed", "component")
+        self._store.get("/cortx/ha/system/cluster/1/health")
+        metrics = self._store.get_metrics()
+        self.assertEqual(self._store.metrics.get_thread_calls() - calls, 2)
+        self.assertEqual(list(metrics.keys()), ["get", "set"])
+        self.assertEqual(metrics["set"]["subscription"]["count"], 1)
+        self.assertEqual(metrics["set"]["subscription"]["bytes_sent"], len("component"))
+        self.assertEqual(metrics["get"]["health"]["count"], 1)
+        self.assertEqual(self._store.metrics.get_calls(), 2)
+        self._store.metrics.reset()
+        self.assertEqual(self._store.metrics.get_calls(), 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2021 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+import unittest
+
+from ha.core.system_health.model.health_status import StatusStream, HealthStatusTree
+
+class TestStatusStream(unittest.TestCase):
+    """
+    Unit test StatusStream
+    """
+
+    def test_read(self):
+        """
+        Test sized and full reads across chunks.
+        """
+        stream = StatusStream(iter(['{"output": ', '{"health": []}', ', "status": "Succeeded"}']))
+        self.assertEqual(stream.read(3), '{"o')
+        self.assertEqual(stream.read(12), 'utput": {"he')
+        self.assertEqual(stream.read(), 'alth": []}, "status": "Succeeded"}')
+        self.assertEqual(stream.read(5), "")
+
+    def test_iter(self):
+        """
+        Test iteration yields the unread part and the remaining chunks.
+        """
+        stream = StatusStream(iter(["abc", "def", "gh"]))
+        self.assertEqual(stream.read(2), "ab")
+        self.assertEqual(list(stream), ["c", "def", "gh"])
+
+class TestHealthStatusTree(unittest.TestCase):
+    """
+    Unit test HealthStatusTree
+    """
+
+    def test_same_id_under_different_parents(self):
+        """
+        Test entities with the same id under different parents are kept apart.
+        """
+        prefix = "cortx/ha/v1/cortx/ha/system/cluster/c1"
+        keys = [f"{prefix}/health", f"{prefix}/site/1/health", f"{prefix}/site/2/health",
+                f"{prefix}/site/1/rack/1/health", f"{prefix}/site/2/rack/1/health",
+                f"{prefix}/site/1/rack/1/node/n1/health", f"{prefix}/site/2/rack/1/node/n2/health"]
+        tree = HealthStatusTree({key: "" for key in keys}, ["cluster", "site", "rack", "node"])
+        self.assertEqual(len(tree.get_entities("rack")), 2)
+        sites = tree.get_entities("site", tree.get_entity("cluster", "c1")[0])
+        nodes = [[key for rack, _ in tree.get_entities("rack", site)
+                  for _, key in tree.get_entities("node", rack)] for site, _ in sites]
+        self.assertEqual(nodes, [[f"{prefix}/site/1/rack/1/node/n1/health"], [f"{prefix}/site/2/rack/1/node/n2/health"]])
+        self.assertEqual(tree.get_key("rack", "1"), f"{prefix}/site/1/rack/1/health")
+        self.assertIsNone(tree.get_key("rack", "3"))
+
+if __name__ == "__main__":
+    unittest.main()
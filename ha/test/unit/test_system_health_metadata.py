@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2021 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+import unittest
+
+from ha import const
+from ha.core.error import HaSystemHealthComponentsException, HaSystemHealthHierarchyException
+from ha.core.system_health.system_health_metadata import SystemHealthComponents, SystemHealthHierarchy
+from ha.core.system_health.system_health_hierarchy import HealthHierarchy
+
+class TestSystemHealthMetadata(unittest.TestCase):
+    """
+    Unit test component and hierarchy lookups
+    """
+
+    def test_get_component(self):
+        """
+        Test resource type resolution, including resource types with a listed prefix.
+        """
+        self.assertEqual(SystemHealthComponents.get_component("node"), const.COMPONENTS.NODE.value)
+        self.assertEqual(SystemHealthComponents.get_component("node:fru:disk"),
+                         const.COMPONENTS.SERVER_HARDWARE.value)
+        self.assertEqual(SystemHealthComponents.get_component("node:sw:os:service"),
+                         const.COMPONENTS.SERVER_SERVICE.value)
+        self.assertEqual(SystemHealthComponents.get_component("storageset"), const.COMPONENTS.STORAGESET.value)
+        self.assertEqual(SystemHealthComponents.get_component("enclosure:hw:disk"),
+                         const.COMPONENTS.STORAGE_COMPONENT.value)
+        self.assertRaises(HaSystemHealthComponentsException, SystemHealthComponents.get_component, "unknown")
+
+    def test_get_hierarchy(self):
+        """
+        Test update hierarchy of the components.
+        """
+        self.assertEqual(SystemHealthHierarchy.get_hierarchy(const.COMPONENTS.NODE.value), ["node", "rack", "site", "cluster"])
+        self.assertEqual(SystemHealthHierarchy.get_hierarchy(const.COMPONENTS.AGG_SERVICE.value),
+                         ["agg_service", "server", "node", "rack", "site", "cluster"])
+        self.assertEqual(SystemHealthHierarchy.get_hierarchy(const.COMPONENTS.STORAGE.value),
+                         ["storage", "node", "rack", "site", "cluster"])
+        self.assertRaises(HaSystemHealthHierarchyException, SystemHealthHierarchy.get_hierarchy, "storageset")
+
+    def test_health_hierarchy(self):
+        """
+        Test schema component levels and next components.
+        """
+        HealthHierarchy.SCHEMA = {"components": ["cluster", "site", "rack", "node"]}
+        HealthHierarchy.LEVELS = None
+        self.assertEqual(HealthHierarchy.get_component_level("rack"), 3)
+        self.assertEqual(HealthHierarchy.get_total_depth(), 4)
+        self.assertEqual(HealthHierarchy.get_next_components("site"), ["rack"])
+        self.assertEqual(HealthHierarchy.get_next_components("node"), [])
+        self.assertEqual(HealthHierarchy.get_next_components("disk"), [])
+        self.assertRaises(Exception, HealthHierarchy.get_component_level, "disk")
+
+if __name__ == "__main__":
+    unittest.main()
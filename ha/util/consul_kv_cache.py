@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2021 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+import os
+import json
+import time
+from threading import Thread, Event, Lock
+
+from cortx.utils.log import Log
+from ha.util.kv_store_metrics import instrumented
+from ha.util.consul_kv_store import ConsulKvStore, ConsulKvStoreError, ConsulKvTxnError, TXN_OPERATIONS, CONSISTENCY_MODES
+
+class CachedConsulKvStore(ConsulKvStore):
+    """
+    Consul kv store with a local read cache for slowly changing subtrees.
+    Every watched prefix is kept in memory and refreshed by a background
+    thread using consul blocking queries. Reads of watched keys are served
+    locally while the cache is fresh, other reads go to consul.
+    Any change under a watched prefix makes its watcher read the whole subtree
+    again, so only small or slowly changing subtrees should be watched.
+    Cache can be snapshotted to a local file. A restarted process loads it
+    and serves it once the index of the subtree in consul is found unchanged
+    with a keys-only read, else the subtree is read again.
+    """
+
+    SNAPSHOT_VERSION = 1
+
+    def __init__(self, prefix: str, host: str="localhost", port: int=8500,
+                 pool_size: int=10, timeout: float=None, consistency: str=CONSISTENCY_MODES.DEFAULT.value,
+                 watch_prefixes: list=None, wait: int=30, max_staleness: int=30,
+                 snapshot_path: str=None, snapshot_interval: int=60):
+        """
+        Cached Consul KV store.
+
+        Args:
+            prefix (str): Consul prefix
+            host (str): consul host
+            port (str): consul port
+            pool_size (int): Maximum connections kept open to consul for reads and writes.
+            timeout (float): Default consul request timeout in seconds, must be
+                more than wait.
+            consistency (str): Default read consistency mode for reads not served from cache.
+            watch_prefixes (list): Prefixes (relative to prefix) kept in cache.
+            wait (int): Blocking query wait time in seconds.
+            max_staleness (int): Seconds a subtree is served after the last
+                successful refresh beyond the blocking query wait time.
+            snapshot_path (str): Local file the cache is snapshotted to and
+                loaded from at start, no snapshot if None.
+            snapshot_interval (int): Seconds between two snapshots, only
+                written if the cache changed.
+
+        Example:
+            CachedConsulKvStore("cortx/ha", watch_prefixes=["events", "action"])
+        """
+        watch_prefixes = watch_prefixes or []
+        if timeout is not None and timeout <= wait:
+            raise ConsulKvStoreError(f"Timeout {timeout} must be more than blocking query wait {wait}.")
+        # Every watcher holds one connection for its blocking query.
+        super(CachedConsulKvStore, self).__init__(prefix, host=host, port=port,
+                                                  pool_size=pool_size + len(watch_prefixes), timeout=timeout,
+                                                  consistency=consistency)
+        self._wait = wait
+        self._max_staleness = max_staleness
+        self._lock = Lock()
+        self._stop_event = Event()
+        # {watched consul prefix: {"entries": {consul key: (value, ModifyIndex)}, "index": int, "synced_at": float}}
+        self._cache: dict = {}
+        self._watchers: list = []
+        for watch_prefix in watch_prefixes:
+            self._cache[self._prepare_key(watch_prefix)] = {"entries": {}, "index": 0, "synced_at": None}
+        self._snapshot_path = snapshot_path
+        self._snapshot_index = None
+        if snapshot_path is not None:
+            self._load_snapshot()
+        for watch_prefix in watch_prefixes:
+            prefix_key = self._prepare_key(watch_prefix)
+            watcher = Thread(target=self._watch, args=(prefix_key,), daemon=True,
+                             name=f"consul-watch-{watch_prefix}")
+            self._watchers.append(watcher)
+            watcher.start()
+        if snapshot_path is not None:
+            Thread(target=self._snapshot_periodically, args=(snapshot_interval,), daemon=True,
+                   name="consul-cache-snapshot").start()
+
+    def stop(self):
+        """
+        Stop watching the cached prefixes, the cache is snapshotted once more.
+        """
+        self._stop_event.set()
+        if self._snapshot_path is not None:
+            self.snapshot()
+
+    def _load_snapshot(self):
+        """
+        Load the watched subtrees from the snapshot file. Loaded subtrees are
+        stale, they are served only after the watch finds them current.
+        """
+        try:
+            with open(self._snapshot_path) as snapshot_file:
+                snapshot = json.load(snapshot_file)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            Log.warn(f"Ignoring unreadable consul cache snapshot {self._snapshot_path}. Error: {e}")
+            return
+        if snapshot.get("version") != CachedConsulKvStore.SNAPSHOT_VERSION:
+            Log.warn(f"Ignoring consul cache snapshot {self._snapshot_path} of version {snapshot.get('version')}.")
+            return
+        for prefix_key, subtree in snapshot.get("prefixes", {}).items():
+            if prefix_key in self._cache:
+                self._cache[prefix_key] = {"entries": {key: tuple(entry) for key, entry in subtree["entries"].items()},
+                                           "index": subtree["index"], "synced_at": None}
+        self._snapshot_index = self._get_snapshot_index()
+        Log.info(f"Loaded consul cache snapshot {self._snapshot_path} at index {self._snapshot_index}.")
+
+    def _get_snapshot_index(self) -> tuple:
+        """
+        Indexes of the cached subtrees, to tell if the cache changed after a snapshot.
+        """
+        return tuple((subtree["index"], len(subtree["entries"])) for subtree in self._cache.values())
+
+    def snapshot(self) -> bool:
+        """
+        Write the synced subtrees to the snapshot file if the cache changed
+        after the last snapshot. File is replaced atomically.
+
+        Return:
+            bool: True if the snapshot is written.
+        """
+        with self._lock:
+            snapshot_index = self._get_snapshot_index()
+            if snapshot_index == self._snapshot_index:
+                return False
+            # Stale subtrees loaded from the previous snapshot are written again as they are.
+            snapshot = {"version": CachedConsulKvStore.SNAPSHOT_VERSION,
+                        "prefixes": {prefix_key: {"index": subtree["index"], "entries": dict(subtree["entries"])}
+                                     for prefix_key, subtree in self._cache.items()
+                                     if subtree["index"]}}
+        temp_path = f"{self._snapshot_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self._snapshot_path)), exist_ok=True)
+            with open(temp_path, "w") as snapshot_file:
+                json.dump(snapshot, snapshot_file, separators=(",", ":"))
+            os.replace(temp_path, self._snapshot_path)
+        except OSError as e:
+            Log.warn(f"Failed writing consul cache snapshot {self._snapshot_path}. Error: {e}")
+            return False
+        self._snapshot_index = snapshot_index
+        return True
+
+    def _snapshot_periodically(self, interval: int):
+        """
+        Snapshot the cache every interval seconds till stopped.
+        """
+        while not self._stop_event.wait(interval):
+            self.snapshot()
+
+    def _watch(self, prefix_key: str):
+        """
+        Refresh the subtree of prefix_key with blocking queries till stopped.
+        Watch starts from the index of the snapshot if the subtree is loaded
+        from one and not modified after it.
+        """
+        index = self._cache[prefix_key]["index"] or None
+        if index is not None:
+            index = self._verify_snapshot(prefix_key, index)
+        while not self._stop_event.is_set():
+            try:
+                new_index, data = self._consul.kv.get(prefix_key, recurse=True, index=index, wait=f"{self._wait}s")
+                self._load(prefix_key, int(new_index), data)
+                # Consul index can go backward (e.g. snapshot restore), restart watch then.
+                index = new_index if index is None or int(new_index) >= int(index) else None
+            except Exception as e:
+                Log.warn(f"Failed watching {prefix_key}, retrying. Error: {e}")
+                index = None
+                self._stop_event.wait(1)
+
+    def _verify_snapshot(self, prefix_key: str, index: int) -> int:
+        """
+        Mark the subtree loaded from the snapshot at index synced if the index
+        of the subtree in consul is the same, listing keys only.
+
+        Return:
+            int: index to watch from, None if the subtree has to be read again.
+        """
+        try:
+            current_index, _ = self._consul.kv.get(prefix_key, keys=True)
+        except Exception as e:
+            Log.warn(f"Failed verifying snapshot of {prefix_key}. Error: {e}")
+            return None
+        if current_index is None or int(current_index) != index:
+            Log.info(f"Snapshot of {prefix_key} at index {index} is outdated by index {current_index}.")
+            return None
+        with self._lock:
+            self._cache[prefix_key]["synced_at"] = time.monotonic()
+        return index
+
+    def _load(self, prefix_key: str, index: int, data: list):
+        """
+        Replace cached subtree with the data read at index. Entries written
+        locally after index are kept till the watch catches up.
+        """
+        entries: dict = {}
+        for item in data or []:
+            val = item['Value'].decode("utf-8") if isinstance(item['Value'], bytes) else item['Value']
+            entries[item['Key']] = (val, item['ModifyIndex'])
+        with self._lock:
+            subtree = self._cache[prefix_key]
+            for key, (val, modify_index) in subtree["entries"].items():
+                if modify_index is not None and modify_index > index:
+                    entries[key] = (val, modify_index)
+            subtree["entries"] = entries
+            subtree["index"] = index
+            subtree["synced_at"] = time.monotonic()
+
+    def _get_subtree(self, consul_key: str) -> dict:
+        """
+        Get fresh cached subtree holding consul_key, None if not cached or stale.
+        """
+        for prefix_key, subtree in self._cache.items():
+            if consul_key.startswith(prefix_key):
+                synced_at = subtree["synced_at"]
+                if synced_at is not None and \
+                    time.monotonic() - synced_at <= self._wait + self._max_staleness:
+                    return subtree
+                return None
+        return None
+
+    def _cached_get(self, key: str, recurse: bool) -> tuple:
+        """
+        Read from cache.
+
+        Return:
+            tuple: (True, {consul key: (value, ModifyIndex)}) if served from cache
+                else (False, None).
+        """
+        consul_key = self._prepare_key(key)
+        with self._lock:
+            subtree = self._get_subtree(consul_key)
+            if subtree is None:
+                return False, None
+            entries = subtree["entries"]
+            if not recurse:
+                return True, {consul_key: entries[consul_key]} if consul_key in entries else {}
+            return True, {k: v for k, v in entries.items() if k.startswith(consul_key)}
+
+    @instrumented
+    def key_exists(self, key: str, recurse: bool = True):
+        cached, entries = self._cached_get(key, recurse)
+        if not cached:
+            return super(CachedConsulKvStore, self).key_exists(key, recurse=recurse)
+        return len(entries) != 0
+
+    @instrumented
+    def get(self, key: str = "", recurse: bool = True, consistency: str = None):
+        # Consistent read has to be served by the consul leader.
+        if self._get_consistency(consistency) == CONSISTENCY_MODES.CONSISTENT.value:
+            return super(CachedConsulKvStore, self).get(key, recurse=recurse, consistency=consistency)
+        cached, entries = self._cached_get(key, recurse)
+        if not cached:
+            return super(CachedConsulKvStore, self).get(key, recurse=recurse, consistency=consistency)
+        if len(entries) == 0:
+            return None
+        return {k: val for k, (val, _) in sorted(entries.items())}
+
+    @instrumented
+    def get_keys(self, key: str = "", separator: str = None, consistency: str = None) -> list:
+        if self._get_consistency(consistency) == CONSISTENCY_MODES.CONSISTENT.value:
+            return super(CachedConsulKvStore, self).get_keys(key, separator=separator, consistency=consistency)
+        cached, entries = self._cached_get(key, True)
+        if not cached:
+            return super(CachedConsulKvStore, self).get_keys(key, separator=separator, consistency=consistency)
+        prefix = self._prepare_key(key)
+        if key.endswith("/"):
+            prefix = f"{prefix}/"
+        keys: list = []
+        for consul_key in sorted(entries):
+            if not consul_key.startswith(prefix):
+                continue
+            if separator is not None:
+                pos = consul_key.find(separator, len(prefix))
+                consul_key = consul_key if pos == -1 else consul_key[:pos + len(separator)]
+            if consul_key not in keys:
+                keys.append(consul_key)
+        return keys
+
+    @instrumented
+    def get_with_index(self, key: str) -> tuple:
+        cached, entries = self._cached_get(key, False)
+        if not cached:
+            return super(CachedConsulKvStore, self).get_with_index(key)
+        if len(entries) == 0:
+            return None, 0
+        _, (val, modify_index) = entries.popitem()
+        return val, modify_index
+
+    @instrumented
+    def get_many(self, keys: list) -> dict:
+        key_val: dict = {}
+        for key in keys:
+            cached, entries = self._cached_get(key, False)
+            if not cached:
+                return super(CachedConsulKvStore, self).get_many(keys)
+            if len(entries) != 0:
+                _, (val, _) = entries.popitem()
+                key_val[key] = val
+        return key_val
+
+    def _invalidate(self, consul_key: str, recurse: bool):
+        """
+        Remove deleted key(s) from cache.
+        """
+        with self._lock:
+            for subtree in self._cache.values():
+                entries = subtree["entries"]
+                for key in [k for k in entries if k == consul_key or (recurse and k.startswith(consul_key))]:
+                    del entries[key]
+
+    def _refresh(self, operations: list):
+        """
+        Re-read the cached keys of the operations from consul, e.g. after a
+        failed cas on a cached index older than the one in consul.
+        """
+        for operation in operations:
+            consul_key = self._prepare_key(operation["key"])
+            if not any(consul_key.startswith(prefix_key) for prefix_key in self._cache):
+                continue
+            val, modify_index = super(CachedConsulKvStore, self).get_with_index(operation["key"])
+            with self._lock:
+                for prefix_key, subtree in self._cache.items():
+                    if consul_key.startswith(prefix_key):
+                        if modify_index == 0:
+                            subtree["entries"].pop(consul_key, None)
+                        else:
+                            subtree["entries"][consul_key] = (val, modify_index)
+
+    @instrumented
+    def txn(self, operations: list, split: bool = False) -> dict:
+        try:
+            modify_index = super(CachedConsulKvStore, self).txn(operations, split=split)
+        except ConsulKvTxnError:
+            # Failed operation may be based on a stale cached index, retry has to see the current one.
+            self._refresh(operations)
+            raise
+        # Apply successful writes to cache immediately.
+        for operation in operations:
+            op = operation["operation"]
+            op = op.value if isinstance(op, TXN_OPERATIONS) else op
+            consul_key = self._prepare_key(operation["key"])
+            if op == TXN_OPERATIONS.DELETE.value:
+                self._invalidate(consul_key, operation.get("recurse", False))
+            elif op != TXN_OPERATIONS.CHECK_INDEX.value:
+                with self._lock:
+                    for prefix_key, subtree in self._cache.items():
+                        if consul_key.startswith(prefix_key):
+                            subtree["entries"][consul_key] = (operation.get("val"), modify_index.get(consul_key))
+        return modify_index
+
+    @instrumented
+    def delete(self, key: str = "", recurse: bool = False):
+        data = super(CachedConsulKvStore, self).delete(key, recurse=recurse)
+        self._invalidate(self._prepare_key(key), recurse)
+        return data
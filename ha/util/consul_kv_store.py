@@ -15,21 +15,106 @@
 # about this software or licensing, please email opensource@seagate.com or
 # cortx-questions@seagate.com.
 
+import base64
 import consul
+import math
 import socket
+import threading
+import time
+from enum import Enum
+from requests.adapters import HTTPAdapter
+
+from ha.util.kv_store_metrics import KvStoreMetrics, instrumented
+
+class TXN_OPERATIONS(Enum):
+    """
+    Operations supported by ConsulKvStore.txn.
+    """
+    SET = "set"
+    UPDATE = "update"
+    CAS = "cas"
+    DELETE = "delete"
+    CHECK_INDEX = "check-index"
+
+class CONSISTENCY_MODES(Enum):
+    """
+    Consul read consistency modes.
+    default: read from leader, may be stale for a short window after leader change.
+    consistent: leader verifies its leadership with a quorum before read.
+    stale: any consul server can answer the read.
+    """
+    DEFAULT = "default"
+    CONSISTENT = "consistent"
+    STALE = "stale"
+
+class ConsulKvStoreError(Exception):
+    """
+    Exception to indicate that a consul kv store operation failed.
+    """
+    pass
+
+class ConsulKvTxnError(ConsulKvStoreError):
+    """
+    Exception to indicate that a consul transaction was rolled back.
+    conflict is True if every failed operation failed on its modify index
+    check, i.e. keys were modified after the index used for cas/check-index.
+    """
+    def __init__(self, message: str, conflict: bool = False):
+        super().__init__(message)
+        self.conflict = conflict
+
+class ConsulKvCasError(ConsulKvStoreError):
+    """
+    Exception to indicate that a key was modified after the index used for cas.
+    """
+    pass
+
+class ConsulHTTPAdapter(HTTPAdapter):
+    """
+    Keep-alive connection pool shared by the consul clients of all threads.
+    Applies the default timeout to requests sent without one.
+    """
+
+    def __init__(self, pool_size: int=10, timeout: float=None):
+        """
+        Args:
+            pool_size (int): Maximum connections kept open to consul.
+                Threads wait for a free connection when all are in use.
+            timeout (float): Default request timeout in seconds, None to wait forever.
+        """
+        self._timeout = timeout
+        super(ConsulHTTPAdapter, self).__init__(pool_connections=1, pool_maxsize=pool_size, pool_block=True)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self._timeout
+        return super(ConsulHTTPAdapter, self).send(request, **kwargs)
 
 #TODO: Update set/get/update function to provide blocking and non blocking function
 class ConsulKvStore:
     """ Represents a Consul kv Store """
 
-    def __init__(self, prefix: str, host: str="localhost", port: int=8500):
+    # Maximum number of operations consul accepts in one transaction.
+    TXN_MAX_OPERATIONS = 64
+    # Seconds kept between the wait of a blocking query and the request timeout.
+    BLOCKING_WAIT_MARGIN = 2
+    # Consul transaction errors of cas and check-index operations failed on the modify index.
+    TXN_INDEX_ERRORS = ["index is stale", "current modify index", "doesn't exist"]
+
+    def __init__(self, prefix: str, host: str="localhost", port: int=8500,
+                 pool_size: int=10, timeout: float=None,
+                 consistency: str=CONSISTENCY_MODES.DEFAULT.value):
         """
-        Consul KV store.
+        Consul KV store. Every thread gets its own consul client, all clients
+        share one pooled keep-alive transport.
 
         Args:
             prefix (str): Consul prefix
             host (str): consul host
             port (str): consul port
+            pool_size (int): Maximum connections kept open to consul.
+            timeout (float): Default consul request timeout in seconds.
+            consistency (str): Default read consistency mode (CONSISTENCY_MODES).
 
         Example:
             ConsulKvStore("cortx/ha", host="consul.srv", port=3000)
@@ -38,9 +123,26 @@ class ConsulKvStore:
         """
         self._prefix: str = prefix
         self._verify(prefix, host, port)
-        self._consul = self._get_connection(prefix, host, port)
+        self._host = host
+        self._port = port
+        self._timeout = timeout
+        self._consistency = consistency
+        self._adapter = ConsulHTTPAdapter(pool_size=pool_size, timeout=timeout)
+        self._local = threading.local()
+        self.metrics = KvStoreMetrics()
         self._consul.kv.put(self._prepare_key(""), None)
 
+    @property
+    def _consul(self):
+        """
+        Consul client of the calling thread.
+        """
+        client = getattr(self._local, "consul", None)
+        if client is None:
+            client = self._get_connection(self._prefix, self._host, self._port)
+            self._local.consul = client
+        return client
+
     def _verify(self, prefix: str, host: str, port: int):
         """
         Verify connection detail.
@@ -66,8 +168,13 @@ class ConsulKvStore:
             Object: Consul object.
         """
         if host=="localhost" and port==8500:
-            return consul.Consul()
-        return consul.Consul(host=host, port=port)
+            client = consul.Consul()
+        else:
+            client = consul.Consul(host=host, port=port)
+        # Use the shared keep-alive connection pool.
+        client.http.session.mount("http://", self._adapter)
+        client.http.session.mount("https://", self._adapter)
+        return client
 
     def _verify_data(self, *args):
         """
@@ -90,21 +197,49 @@ class ConsulKvStore:
     def get_prefix(self):
         return self._prefix
 
-    def key_exists(self, key: str):
+    def get_metrics(self) -> dict:
+        """
+        Get call count, latency and payload bytes of the store calls
+        per method and key family. Refer KvStoreMetrics.snapshot.
+        """
+        return self.metrics.snapshot()
+
+    @instrumented
+    def key_exists(self, key: str, recurse: bool = True):
         """
         Check if key exists.
 
         Args:
             key (str): Consul Key.
+            recurse (bool): If False only the exact key is checked,
+                else any key with the matching prefix is considered.
 
         Return:
             bool: True if key exists else False.
         """
-        _, data = self._consul.kv.get(self._prepare_key(key), recurse=True)
+        _, data = self._consul.kv.get(self._prepare_key(key), recurse=recurse,
+                                      consistency=self._get_consistency())
         if data is None:
             return False
         return True
 
+    def _put(self, operation: TXN_OPERATIONS, key: str, val: str=None, index: int=None) -> int:
+        """
+        Write key-val pair with a single consul transaction request.
+
+        Args:
+            operation (TXN_OPERATIONS): SET, UPDATE or CAS.
+            key (str): Key.
+            val (str): Value.
+            index (int): ModifyIndex for CAS.
+
+        Return:
+            int: New ModifyIndex of the key.
+        """
+        modify_index = self.txn([{"operation": operation, "key": key, "val": val, "index": index}])
+        return modify_index.get(self._prepare_key(key))
+
+    @instrumented
     def set(self, key: str, val: str=None):
         """
         Set key-val pair in consul. If key already exists return exception.
@@ -116,12 +251,15 @@ class ConsulKvStore:
         Return:
             str: Return value.
         """
-        self._verify_data(key)
-        if self.key_exists(key):
-            raise Exception(f"Key {key} already exists in kv store.")
-        self._consul.kv.put(self._prepare_key(key), val)
+        try:
+            self._put(TXN_OPERATIONS.SET, key, val)
+        except ConsulKvTxnError as e:
+            if not e.conflict:
+                raise
+            raise ConsulKvStoreError(f"Key {key} already exists in kv store.")
         return val
 
+    @instrumented
     def update(self, key: str, new_val: str):
         """
         Set key-val pair in consul. Write key-value.
@@ -134,31 +272,128 @@ class ConsulKvStore:
         Return:
             str: Return value.
         """
-        self._verify_data(key)
-        self._consul.kv.put(self._prepare_key(key), new_val)
+        self._put(TXN_OPERATIONS.UPDATE, key, new_val)
         return new_val
 
-    # TODO : Currently all keys with the matching prefix "key" are returned
-    # add additional parameter so that only the exact matching key is returned when required
-    def get(self, key: str = ""):
+    @instrumented
+    def update_with_index(self, key: str, new_val: str) -> int:
+        """
+        Write key-value like update, if key already exists override it.
+
+        Args:
+            key (str): Key.
+            new_val (str): Value.
+
+        Return:
+            int: New ModifyIndex of the key.
+        """
+        return self._put(TXN_OPERATIONS.UPDATE, key, new_val)
+
+    @instrumented
+    def cas(self, key: str, new_val: str, index: int) -> int:
+        """
+        Compare and swap. Write key-value only if the ModifyIndex of the key
+        still matches index. Index 0 writes only if the key is absent.
+
+        Args:
+            key (str): Key.
+            new_val (str): Value.
+            index (int): ModifyIndex returned by get_with_index, update_with_index or cas.
+
+        Return:
+            int: New ModifyIndex of the key.
+
+        Raise:
+            ConsulKvCasError: key was modified after index.
+        """
+        try:
+            return self._put(TXN_OPERATIONS.CAS, key, new_val, index)
+        except ConsulKvTxnError as e:
+            if not e.conflict:
+                raise
+            raise ConsulKvCasError(f"Key {key} is modified after index {index}. {e}")
+
+    @instrumented
+    def get_with_index(self, key: str) -> tuple:
+        """
+        Get value and ModifyIndex of the exact key.
+
+        Args:
+            key (str): Key.
+
+        Return:
+            tuple: (value, ModifyIndex). (None, 0) if key is absent.
+        """
+        _, data = self._consul.kv.get(self._prepare_key(key), consistency=self._get_consistency())
+        if data is None:
+            return None, 0
+        val = data['Value'].decode("utf-8") if isinstance(data['Value'], bytes) else data['Value']
+        return val, data['ModifyIndex']
+
+    @instrumented
+    def get(self, key: str = "", recurse: bool = True, consistency: str = None):
         """
         Get values. Default it will return all keys. It is block call,
         will take some time if consul leader is not elected.
 
         Args:
             key (str): Key.
+            recurse (bool): If False only the exact matching key is returned,
+                else all keys with the matching prefix are returned.
+            consistency (str): Read consistency mode (CONSISTENCY_MODES),
+                store default if None.
 
         Return:
             str: Return dictionary of all key val pair.
         """
-        _, data = self._consul.kv.get(self._prepare_key(key), recurse=True)
+        _, data = self._consul.kv.get(self._prepare_key(key), recurse=recurse,
+                                      consistency=self._get_consistency(consistency))
         if data is None:
             return data
+        if not recurse:
+            data = [data]
         key_val: dict = {}
         for key in data:
             key_val[key['Key']] = key['Value'].decode("utf-8") if isinstance(key['Value'], bytes) else key['Value']
         return key_val
 
+    @instrumented
+    def get_keys(self, key: str = "", separator: str = None, consistency: str = None) -> list:
+        """
+        List keys with the matching prefix without reading their values.
+        If separator is given, keys are listed only up to the first separator
+        after the prefix, e.g. get_keys("cluster/1/site/", separator="/")
+        returns ["<prefix>/cluster/1/site/1/", "<prefix>/cluster/1/site/2/"].
+
+        Args:
+            key (str): Key prefix, keep the trailing "/" to list a folder.
+            separator (str): Separator to group the keys.
+            consistency (str): Read consistency mode (CONSISTENCY_MODES),
+                store default if None.
+
+        Return:
+            list: Consul keys.
+        """
+        prefix = self._prepare_key(key)
+        if key.endswith("/"):
+            prefix = f"{prefix}/"
+        _, keys = self._consul.kv.get(prefix, keys=True, separator=separator,
+                                      consistency=self._get_consistency(consistency))
+        return keys if keys is not None else []
+
+    def _get_consistency(self, consistency: str = None) -> str:
+        """
+        Get consistency mode for consul read, None for consul default.
+        """
+        consistency = self._consistency if consistency is None else consistency
+        consistency = consistency.value if isinstance(consistency, CONSISTENCY_MODES) else consistency
+        if consistency == CONSISTENCY_MODES.DEFAULT.value:
+            return None
+        if consistency not in [mode.value for mode in CONSISTENCY_MODES]:
+            raise ConsulKvStoreError(f"Invalid consistency mode {consistency}.")
+        return consistency
+
+    @instrumented
     def delete(self, key: str = "", recurse: bool = False):
         """
         Delete values.
@@ -175,3 +410,201 @@ class ConsulKvStore:
         data = self.get(key)
         self._consul.kv.delete(self._prepare_key(key), recurse=recurse)
         return data
+
+    @instrumented
+    def get_many(self, keys: list) -> dict:
+        """
+        Get values for a list of exact keys. Keys are read with transaction get
+        operations, TXN_MAX_OPERATIONS keys per consul round-trip.
+
+        Args:
+            keys (list): Keys.
+
+        Return:
+            dict: {key: value} for the keys present in the store.
+        """
+        if not keys:
+            return {}
+        if len(set(keys)) == 1:
+            key_val = self.get(keys[0], recurse=False)
+            return {} if key_val is None else {keys[0]: key_val.popitem()[1]}
+        prepared_keys: dict = {self._prepare_key(key): key for key in keys}
+        consul_keys: list = list(prepared_keys)
+        key_val: dict = {}
+        for start in range(0, len(consul_keys), ConsulKvStore.TXN_MAX_OPERATIONS):
+            for consul_key, val in self._txn_get(consul_keys[start:start + ConsulKvStore.TXN_MAX_OPERATIONS]).items():
+                key_val[prepared_keys[consul_key]] = val
+        return key_val
+
+    def _txn_get(self, consul_keys: list) -> dict:
+        """
+        Read exact consul keys in one transaction. Get of a missing key fails
+        the transaction, it is read again without the keys reported missing.
+
+        Return:
+            dict: {consul key: value} for the keys present in the store.
+        """
+        while consul_keys:
+            result = self._consul.txn.put([{"KV": {"Verb": "get", "Key": consul_key}} for consul_key in consul_keys])
+            if result is None:
+                raise ConsulKvTxnError(f"Failed reading keys {consul_keys}.")
+            errors = result.get("Errors")
+            if not errors:
+                key_val: dict = {}
+                for op_result in result.get("Results") or []:
+                    kv = op_result.get("KV", {})
+                    val = kv.get("Value")
+                    key_val[kv.get("Key")] = None if val is None else base64.b64decode(val).decode("utf-8")
+                return key_val
+            missing = {error.get("OpIndex") for error in errors}
+            if None in missing:
+                raise ConsulKvTxnError(f"Failed reading keys {consul_keys}. Errors: {errors}")
+            consul_keys = [consul_key for op_index, consul_key in enumerate(consul_keys) if op_index not in missing]
+        return {}
+
+    @instrumented
+    def wait_for_changes(self, key: str = "", index: int = 0, wait: float = None) -> tuple:
+        """
+        Get the keys with the prefix modified after index, blocking with consul
+        blocking queries till a key is modified or wait seconds are over.
+        Deleted keys are not reported. wait can be longer than the store timeout,
+        every blocking query waits at most get_max_wait() seconds.
+
+        Args:
+            key (str): Key prefix.
+            index (int): Store index returned by the previous call, 0 for all the keys.
+            wait (float): Seconds to wait for a change, no wait if None or 0.
+
+        Return:
+            tuple: (store index to pass to the next call, {consul key: value}).
+                All the keys are returned if the store index went backward
+                (e.g. consul snapshot restore).
+        """
+        consul_key = self._prepare_key(key)
+        deadline = time.monotonic() + wait if wait else None
+        block_index = index or None
+        max_wait = self.get_max_wait()
+        while True:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            blocking = block_index is not None and remaining is not None and remaining > 0
+            block_wait = None
+            if blocking:
+                block_wait = math.ceil(remaining) if max_wait is None else min(math.ceil(remaining), max_wait)
+            new_index, data = self._consul.kv.get(consul_key, recurse=True, index=block_index if blocking else None,
+                                                  wait=f"{block_wait}s" if blocking else None,
+                                                  consistency=self._get_consistency())
+            new_index = int(new_index)
+            since = index if new_index >= index else 0
+            changes = {item['Key']: item['Value'].decode("utf-8") if isinstance(item['Value'], bytes) else item['Value']
+                       for item in data or [] if item['ModifyIndex'] > since}
+            # Blocking query can return without a change under the prefix, e.g. a key was deleted.
+            if changes or not blocking or deadline - time.monotonic() <= 0:
+                return new_index, changes
+            block_index = new_index
+
+    @staticmethod
+    def _check_txn_size(operations: list, split: bool):
+        """
+        Raise if the operations do not fit in one transaction and split is not allowed.
+        """
+        if not split and len(operations) > ConsulKvStore.TXN_MAX_OPERATIONS:
+            raise ConsulKvStoreError(f"{len(operations)} operations do not fit in one transaction of "
+                                     f"{ConsulKvStore.TXN_MAX_OPERATIONS}, split them or pass split=True.")
+
+    @staticmethod
+    def _is_index_conflict(errors: list) -> bool:
+        """
+        Check if every error of a failed transaction is a modify index mismatch.
+
+        Args:
+            errors (list): Transaction errors [{"OpIndex": int, "What": str}].
+        """
+        if not errors:
+            return False
+        return all(isinstance(error, dict) and
+                   any(index_error in str(error.get("What", "")) for index_error in ConsulKvStore.TXN_INDEX_ERRORS)
+                   for error in errors)
+
+    def get_max_wait(self) -> int:
+        """
+        Longest wait in seconds of a blocking query that is answered within the
+        request timeout, None if requests do not time out. Consul adds up to
+        wait/16 to the wait of a blocking query.
+        """
+        if self._timeout is None:
+            return None
+        return max(int((self._timeout - ConsulKvStore.BLOCKING_WAIT_MARGIN) * 16 / 17), 1)
+
+    def _prepare_txn_op(self, operation: dict) -> dict:
+        """
+        Convert operation into consul transaction KV operation.
+
+        Args:
+            operation (dict): {"operation": TXN_OPERATIONS, "key": key, "val": value, "index": index}
+
+        Return:
+            dict: consul KV operation.
+        """
+        op = operation["operation"]
+        op = op.value if isinstance(op, TXN_OPERATIONS) else op
+        self._verify_data(operation.get("key"))
+        kv_op: dict = {"Key": self._prepare_key(operation["key"])}
+        if op == TXN_OPERATIONS.SET.value:
+            # Create only if key is absent, same as set().
+            kv_op.update({"Verb": "cas", "Index": 0})
+        elif op == TXN_OPERATIONS.UPDATE.value:
+            kv_op["Verb"] = "set"
+        elif op == TXN_OPERATIONS.CAS.value:
+            kv_op.update({"Verb": "cas", "Index": operation["index"]})
+        elif op == TXN_OPERATIONS.DELETE.value:
+            kv_op["Verb"] = "delete-tree" if operation.get("recurse", False) else "delete"
+            # Keep the trailing "/" to delete only a folder, e.g. "b/1/" and not "b/10".
+            if kv_op["Verb"] == "delete-tree" and operation["key"].endswith("/"):
+                kv_op["Key"] = f"{kv_op['Key']}/"
+        elif op == TXN_OPERATIONS.CHECK_INDEX.value:
+            kv_op.update({"Verb": "check-index", "Index": operation["index"]})
+        else:
+            raise ConsulKvStoreError(f"Invalid transaction operation {op}.")
+        val = operation.get("val")
+        if kv_op["Verb"] in ["cas", "set"] and val is not None:
+            kv_op["Value"] = base64.b64encode(val.encode("utf-8") if isinstance(val, str) else val).decode("utf-8")
+        return {"KV": kv_op}
+
+    @instrumented
+    def txn(self, operations: list, split: bool = False) -> dict:
+        """
+        Apply set/update/cas/delete/check-index operations atomically in a consul
+        transaction of at most TXN_MAX_OPERATIONS operations. With split, more
+        operations are applied in chunks of TXN_MAX_OPERATIONS, each chunk is
+        atomic but not the whole. Keep check-index with the operations it guards
+        within one chunk.
+
+        Args:
+            operations (list): List of operation dict.
+                {"operation": TXN_OPERATIONS, "key": key, "val": value, "index": index, "recurse": bool}
+                index is used by CAS and CHECK_INDEX.
+            split (bool): Allow more than TXN_MAX_OPERATIONS operations in separate transactions.
+
+        Return:
+            dict: {consul key: ModifyIndex} for keys written by the transaction.
+
+        Example:
+            txn([{"operation": TXN_OPERATIONS.SET, "key": "k1", "val": "v1"},
+                 {"operation": TXN_OPERATIONS.UPDATE, "key": "k2", "val": "v2"},
+                 {"operation": TXN_OPERATIONS.DELETE, "key": "k3"}])
+        """
+        self._check_txn_size(operations, split)
+        txn_ops: list = [self._prepare_txn_op(operation) for operation in operations]
+        modify_index: dict = {}
+        for start in range(0, len(txn_ops), ConsulKvStore.TXN_MAX_OPERATIONS):
+            chunk = txn_ops[start:start + ConsulKvStore.TXN_MAX_OPERATIONS]
+            result = self._consul.txn.put(chunk)
+            if result is None or result.get("Errors"):
+                errors = None if result is None else result.get("Errors")
+                raise ConsulKvTxnError(f"Transaction failed after applying {start} of "
+                                       f"{len(txn_ops)} operations. Errors: {errors}",
+                                       conflict=self._is_index_conflict(errors))
+            for op_result in result.get("Results") or []:
+                kv = op_result.get("KV", {})
+                modify_index[kv.get("Key")] = kv.get("ModifyIndex")
+        return modify_index
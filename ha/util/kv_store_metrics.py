@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2021 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+import functools
+import inspect
+import json
+import time
+import threading
+from enum import Enum
+
+class KV_KEY_FAMILIES(Enum):
+    """
+    Key families the kv store calls are tagged with.
+    """
+    HEALTH = "health"
+    SUBSCRIPTION = "subscription"
+    RULES = "rules"
+    NODE_MAP = "node_map"
+    OTHER = "other"
+
+class KvStoreMetrics:
+    """
+    Call count, latency histogram and payload bytes of kv store calls
+    per method and key family. Values are sizes of the keys and values
+    sent and received, not the HTTP traffic.
+    """
+
+    # Upper bounds of the latency histogram buckets in milliseconds.
+    LATENCY_BUCKETS_MS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+    # Key prefixes (relative to the store prefix) of the families, first match wins.
+    KEY_FAMILIES = [("cortx/ha/system/cluster/node_map", KV_KEY_FAMILIES.NODE_MAP),
+                    ("pvtfqdn_to_nodeid", KV_KEY_FAMILIES.NODE_MAP),
+                    ("cortx/ha/system", KV_KEY_FAMILIES.HEALTH),
+                    ("events", KV_KEY_FAMILIES.SUBSCRIPTION),
+                    ("message_type", KV_KEY_FAMILIES.SUBSCRIPTION),
+                    ("action", KV_KEY_FAMILIES.RULES)]
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # {(method, family): {"count", "errors", "total_ms", "max_ms", "bytes_sent", "bytes_received", "histogram"}}
+        self._stats: dict = {}
+        self._calls = 0
+        self._dump_stop = None
+
+    @staticmethod
+    def get_family(key: str) -> str:
+        """
+        Get key family of the key.
+        """
+        key = key.lstrip("/")
+        for prefix, family in KvStoreMetrics.KEY_FAMILIES:
+            if key.startswith(prefix):
+                return family.value
+        return KV_KEY_FAMILIES.OTHER.value
+
+    @staticmethod
+    def _payload_size(data) -> int:
+        """
+        Size of the keys and values in data.
+        """
+        if isinstance(data, (str, bytes)):
+            return len(data)
+        if isinstance(data, dict):
+            return sum(KvStoreMetrics._payload_size(k) + KvStoreMetrics._payload_size(v) for k, v in data.items())
+        if isinstance(data, (list, tuple)):
+            return sum(KvStoreMetrics._payload_size(item) for item in data)
+        return 0
+
+    def record(self, method: str, call_args: dict, seconds: float, result=None, error: bool=False):
+        """
+        Record one kv store call.
+
+        Args:
+            method (str): Store method name.
+            call_args (dict): Arguments of the call by name.
+            seconds (float): Call latency.
+            result: Value returned by the call.
+            error (bool): True if the call raised.
+        """
+        if "key" in call_args:
+            key = call_args["key"]
+        elif call_args.get("keys"):
+            key = call_args["keys"][0]
+        elif call_args.get("operations"):
+            # Transaction is tagged with the family of its first operation.
+            key = call_args["operations"][0].get("key", "")
+        else:
+            key = ""
+        sent = self._payload_size(call_args.get("val")) + self._payload_size(call_args.get("new_val")) + \
+            sum(self._payload_size(operation.get("val")) for operation in call_args.get("operations", []))
+        received = self._payload_size(result)
+        latency_ms = seconds * 1000
+        family = self.get_family(key)
+        self._local.calls = getattr(self._local, "calls", 0) + 1
+        with self._lock:
+            self._calls += 1
+            stat = self._stats.get((method, family))
+            if stat is None:
+                stat = {"count": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0,
+                        "bytes_sent": 0, "bytes_received": 0,
+                        "histogram": [0] * (len(KvStoreMetrics.LATENCY_BUCKETS_MS) + 1)}
+                self._stats[(method, family)] = stat
+            stat["count"] += 1
+            stat["errors"] += 1 if error else 0
+            stat["total_ms"] += latency_ms
+            stat["max_ms"] = max(stat["max_ms"], latency_ms)
+            stat["bytes_sent"] += sent
+            stat["bytes_received"] += received
+            for bucket, upper_bound in enumerate(KvStoreMetrics.LATENCY_BUCKETS_MS):
+                if latency_ms <= upper_bound:
+                    stat["histogram"][bucket] += 1
+                    break
+            else:
+                stat["histogram"][-1] += 1
+
+    def get_calls(self) -> int:
+        """
+        Number of store calls made by all the threads.
+        """
+        return self._calls
+
+    def get_thread_calls(self) -> int:
+        """
+        Number of store calls made by the calling thread. Difference of two
+        readings gives the store calls of the work done in between.
+        """
+        return getattr(self._local, "calls", 0)
+
+    def snapshot(self) -> dict:
+        """
+        Get metrics.
+
+        Return:
+            dict: {method: {family: {"count", "errors", "avg_ms", "max_ms",
+                "bytes_sent", "bytes_received", "histogram": {"<=1ms": count, ..., ">5000ms": count}}}}
+        """
+        buckets = [f"<={upper_bound}ms" for upper_bound in KvStoreMetrics.LATENCY_BUCKETS_MS] + \
+            [f">{KvStoreMetrics.LATENCY_BUCKETS_MS[-1]}ms"]
+        metrics: dict = {}
+        with self._lock:
+            for (method, family), stat in sorted(self._stats.items()):
+                metrics.setdefault(method, {})[family] = {
+                    "count": stat["count"], "errors": stat["errors"],
+                    "avg_ms": round(stat["total_ms"] / stat["count"], 3), "max_ms": round(stat["max_ms"], 3),
+                    "bytes_sent": stat["bytes_sent"], "bytes_received": stat["bytes_received"],
+                    "histogram": {bucket: count for bucket, count in zip(buckets, stat["histogram"]) if count}}
+        return metrics
+
+    def reset(self):
+        """
+        Clear metrics, including the call count of get_calls. Per-thread counts
+        are only compared between two readings, so they are kept.
+        """
+        with self._lock:
+            self._stats = {}
+            self._calls = 0
+
+    def start_dump(self, interval: int, logger):
+        """
+        Log metrics every interval seconds from a daemon thread.
+
+        Args:
+            interval (int): Seconds between two dumps.
+            logger: Log function, e.g. Log.info.
+        """
+        if self._dump_stop is not None:
+            return
+        self._dump_stop = threading.Event()
+        stop = self._dump_stop
+
+        def _dump():
+            while not stop.wait(interval):
+                logger(f"kv store metrics: {json.dumps(self.snapshot())}")
+        threading.Thread(target=_dump, daemon=True, name="kv-store-metrics").start()
+
+    def stop_dump(self):
+        """
+        Stop periodic dump.
+        """
+        if self._dump_stop is not None:
+            self._dump_stop.set()
+            self._dump_stop = None
+
+_instrumented_local = threading.local()
+
+def instrumented(func):
+    """
+    Record calls of the kv store method in the metrics of the store.
+    Only the outermost store call of a thread is recorded, so calls made
+    internally (e.g. set through txn, cache miss through super) count once.
+    """
+    params = list(inspect.signature(func).parameters)[1:]
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        metrics = getattr(self, "metrics", None)
+        if metrics is None or getattr(_instrumented_local, "active", False):
+            return func(self, *args, **kwargs)
+        _instrumented_local.active = True
+        start = time.perf_counter()
+        result = None
+        error = False
+        try:
+            result = func(self, *args, **kwargs)
+            return result
+        except Exception:
+            error = True
+            raise
+        finally:
+            _instrumented_local.active = False
+            call_args = dict(zip(params, args))
+            call_args.update(kwargs)
+            metrics.record(func.__name__, call_args, time.perf_counter() - start, result, error)
+    return wrapper
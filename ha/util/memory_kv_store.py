@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2021 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+import time
+import threading
+
+from ha.util.kv_store_metrics import KvStoreMetrics, instrumented
+from ha.util.consul_kv_store import ConsulKvStore, ConsulKvStoreError, ConsulKvTxnError, CONSISTENCY_MODES
+
+class MemoryKvStore(ConsulKvStore):
+    """
+    In-process kv store with the ConsulKvStore contract. Used to run and
+    benchmark the health pipeline without consul. Keys follow consul
+    semantics: recurse reads match by string prefix, every write gets a
+    new ModifyIndex and each txn chunk is applied atomically.
+    """
+
+    def __init__(self, prefix: str, latency: float=0,
+                 consistency: str=CONSISTENCY_MODES.DEFAULT.value):
+        """
+        Memory KV store.
+
+        Args:
+            prefix (str): Key prefix.
+            latency (float): Seconds added to every call to simulate consul round-trip.
+            consistency (str): Default read consistency mode, only validated.
+
+        Example:
+            MemoryKvStore("cortx/ha", latency=0.002)
+        """
+        self._prefix: str = prefix
+        self._verify(prefix, None, None)
+        self._consistency = consistency
+        self._latency = latency
+        self._lock = threading.Lock()
+        # Notified on every committed txn, for wait_for_changes.
+        self._changed = threading.Condition(self._lock)
+        self.metrics = KvStoreMetrics()
+        # {key: (value, ModifyIndex)}
+        self._index = 1
+        self._data: dict = {self._prepare_key(""): (None, self._index)}
+
+    def _delay(self):
+        """
+        Simulate consul round-trip.
+        """
+        if self._latency:
+            time.sleep(self._latency)
+
+    def _read(self, consul_key: str, recurse: bool) -> list:
+        """
+        Read sorted [(key, value, ModifyIndex)] of the exact key or of all the keys with prefix.
+        """
+        self._delay()
+        with self._lock:
+            if not recurse:
+                if consul_key not in self._data:
+                    return []
+                val, modify_index = self._data[consul_key]
+                return [(consul_key, val, modify_index)]
+            return [(key, val, modify_index) for key, (val, modify_index) in sorted(self._data.items())
+                    if key.startswith(consul_key)]
+
+    @instrumented
+    def key_exists(self, key: str, recurse: bool = True):
+        self._get_consistency()
+        return len(self._read(self._prepare_key(key), recurse)) != 0
+
+    @instrumented
+    def get_with_index(self, key: str) -> tuple:
+        self._get_consistency()
+        data = self._read(self._prepare_key(key), False)
+        if not data:
+            return None, 0
+        _, val, modify_index = data[0]
+        return val, modify_index
+
+    @instrumented
+    def get(self, key: str = "", recurse: bool = True, consistency: str = None):
+        self._get_consistency(consistency)
+        data = self._read(self._prepare_key(key), recurse)
+        if not data:
+            return None
+        return {consul_key: val for consul_key, val, _ in data}
+
+    @instrumented
+    def get_keys(self, key: str = "", separator: str = None, consistency: str = None) -> list:
+        self._get_consistency(consistency)
+        prefix = self._prepare_key(key)
+        if key.endswith("/"):
+            prefix = f"{prefix}/"
+        keys: list = []
+        for consul_key, _, _ in self._read(prefix, True):
+            if separator is not None:
+                pos = consul_key.find(separator, len(prefix))
+                consul_key = consul_key if pos == -1 else consul_key[:pos + len(separator)]
+            if not keys or keys[-1] != consul_key:
+                keys.append(consul_key)
+        return keys
+
+    @instrumented
+    def delete(self, key: str = "", recurse: bool = False):
+        data = self.get(key)
+        consul_key = self._prepare_key(key)
+        self._delay()
+        with self._lock:
+            deleted_keys = [k for k in self._data if k == consul_key or (recurse and k.startswith(consul_key))]
+            for deleted in deleted_keys:
+                del self._data[deleted]
+            # Delete is a write in consul too, blocking reads wake up on it.
+            if deleted_keys:
+                self._index += 1
+                self._changed.notify_all()
+        return data
+
+    @instrumented
+    def get_many(self, keys: list) -> dict:
+        self._get_consistency()
+        key_val: dict = {}
+        for key in keys:
+            data = self._read(self._prepare_key(key), False)
+            if data:
+                key_val[key] = data[0][1]
+        return key_val
+
+    @instrumented
+    def wait_for_changes(self, key: str = "", index: int = 0, wait: float = None) -> tuple:
+        consul_key = self._prepare_key(key)
+        deadline = time.monotonic() + wait if wait else None
+        self._delay()
+        with self._lock:
+            while True:
+                since = index if self._index >= index else 0
+                changes = {k: val for k, (val, modify_index) in sorted(self._data.items())
+                           if k.startswith(consul_key) and modify_index > since}
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if changes or index == 0 or remaining is None or remaining <= 0:
+                    return self._index, changes
+                self._changed.wait(remaining)
+
+    def _apply_txn_op(self, staged: dict, kv_op: dict, val: str, index: int) -> tuple:
+        """
+        Stage consul KV operation. staged maps key to (value, ModifyIndex),
+        or to None for a deleted key, on top of the committed data.
+
+        Return:
+            tuple: (error, {key: ModifyIndex}) error is None on success.
+        """
+        verb, key = kv_op["Verb"], kv_op["Key"]
+        current = staged[key] if key in staged else self._data.get(key)
+        if verb in ["cas", "check-index"]:
+            current_index = 0 if current is None else current[1]
+            if current_index != kv_op["Index"] or (current is None and verb == "check-index"):
+                return f"current modify index {current_index} != {kv_op['Index']} for {key}", {}
+        if verb == "check-index":
+            return None, {key: current[1]}
+        if verb in ["cas", "set"]:
+            staged[key] = (val, index)
+            return None, {key: index}
+        if verb == "delete-tree":
+            for deleted in [k for k in list(self._data) + list(staged) if k.startswith(key)]:
+                staged[deleted] = None
+        staged[key] = None
+        return None, {}
+
+    @instrumented
+    def txn(self, operations: list, split: bool = False) -> dict:
+        self._check_txn_size(operations, split)
+        modify_index: dict = {}
+        for start in range(0, len(operations), ConsulKvStore.TXN_MAX_OPERATIONS):
+            chunk = operations[start:start + ConsulKvStore.TXN_MAX_OPERATIONS]
+            kv_ops: list = [(self._prepare_txn_op(operation)["KV"], operation.get("val")) for operation in chunk]
+            self._delay()
+            with self._lock:
+                # Stage the chunk to apply it atomically, all its writes get one index as in consul.
+                staged: dict = {}
+                index = self._index + 1
+                results: dict = {}
+                errors: list = []
+                for op_index, (kv_op, val) in enumerate(kv_ops):
+                    error, result = self._apply_txn_op(staged, kv_op, val, index)
+                    if error is not None:
+                        errors.append({"OpIndex": op_index, "What": error})
+                    results.update(result)
+                if errors:
+                    raise ConsulKvTxnError(f"Transaction failed after applying {start} of "
+                                           f"{len(operations)} operations. Errors: {errors}",
+                                           conflict=self._is_index_conflict(errors))
+                for key, entry in staged.items():
+                    if entry is None:
+                        self._data.pop(key, None)
+                    else:
+                        self._data[key] = entry
+                self._index = index
+                self._changed.notify_all()
+            modify_index.update(results)
+        return modify_index
+
+    def reset(self):
+        """
+        Remove all the keys.
+        """
+        with self._lock:
+            self._data = {}
+
+    def dump(self) -> dict:
+        """
+        Get copy of all the keys as {key: (value, ModifyIndex)}.
+        """
+        with self._lock:
+            return dict(self._data)
+
+    def _get_connection(self, prefix: str, host: str, port: int):
+        raise ConsulKvStoreError("MemoryKvStore has no consul connection.")